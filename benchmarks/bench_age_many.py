@@ -0,0 +1,88 @@
+"""Compares edc_base.age_many.age_many against calling
+edc_base.utils.age once per row.
+
+    $ python benchmarks/bench_age_many.py --rows 50000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'edc_base.settings')
+
+import numpy as np  # noqa
+import pytz  # noqa
+
+from edc_base.age_many import age_many  # noqa
+from edc_base.exceptions import AgeValueError  # noqa
+from edc_base.utils import age  # noqa
+
+
+def make_rows(rows, seed=None):
+    rng = random.Random(seed)
+    born_seq, reference_seq = [], []
+    for _ in range(rows):
+        born = date(1940, 1, 1) + timedelta(days=rng.randint(0, 28000))
+        reference_dt = pytz.utc.localize(
+            datetime(2018, 1, 1) + timedelta(seconds=rng.randint(0, 365 * 86400)))
+        born_seq.append(born)
+        reference_seq.append(reference_dt)
+    return born_seq, reference_seq
+
+
+def scalar(born_seq, reference_seq, timezone):
+    results = []
+    for born, reference_dt in zip(born_seq, reference_seq):
+        try:
+            rdelta = age(born, reference_dt, timezone)
+        except AgeValueError:
+            results.append(None)
+        else:
+            results.append((rdelta.years, rdelta.months, rdelta.days))
+    return results
+
+
+def vectorized(born_seq, reference_seq, timezone):
+    ages = age_many(born_seq, reference_seq, timezone=timezone)
+    return [None if ages.mask[i] else
+            (int(ages.years[i]), int(ages.months[i]), int(ages.days[i]))
+            for i in range(len(born_seq))]
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=20000)
+    parser.add_argument('--timezone', default='Africa/Gaborone')
+    parser.add_argument('--seed', type=int, default=1)
+    options = parser.parse_args()
+    born_seq, reference_seq = make_rows(options.rows, options.seed)
+    scalar_time, expected = timed(scalar, born_seq, reference_seq, options.timezone)
+    vector_time, _ = timed(age_many, born_seq, reference_seq, options.timezone)
+    born_array = np.array(born_seq, dtype='datetime64[D]')
+    reference_array = np.array(
+        [dt.replace(tzinfo=None) for dt in reference_seq], dtype='datetime64[us]')
+    array_time, _ = timed(age_many, born_array, reference_array, options.timezone)
+    result = vectorized(born_seq, reference_seq, options.timezone)
+    if result != expected:
+        sys.exit('age_many does not match age!')
+    sys.stdout.write(
+        f'rows: {options.rows}\n'
+        f'age (per row):         {scalar_time:.3f}s ({scalar_time / options.rows * 1e6:.1f}us/row)\n'
+        f'age_many:              {vector_time:.3f}s ({vector_time / options.rows * 1e6:.1f}us/row)\n'
+        f'age_many (datetime64): {array_time:.3f}s ({array_time / options.rows * 1e6:.1f}us/row)\n'
+        f'speedup:               {scalar_time / vector_time:.1f}x, '
+        f'{scalar_time / array_time:.1f}x with datetime64 arrays\n')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,130 @@
+"""Throughput of edc_base.utils.Convert.to_value compared with the
+previous chain of exception driven parsers, per value and for
+Convert.iter_values (row and column mode).
+
+    $ python benchmarks/bench_convert.py --rows 100000
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'edc_base.settings')
+
+from edc_base.utils import Convert, ConvertError  # noqa
+
+
+class LegacyConvert:
+
+    """The previous `to_value`. `to_datetime` did not exist, here
+    it raises ConvertError so that plain strings are returned.
+    """
+
+    def __init__(self, value):
+        self.value = value
+
+    def to_value(self):
+        string_value = self.value.strip(' "')
+        for method in [self.to_time, self.to_boolean, self.to_decimal,
+                       self.to_int, self.to_datetime]:
+            try:
+                return method(string_value)
+            except ConvertError:
+                pass
+        return string_value
+
+    def to_time(self, string_value):
+        if re.match('^[0-9]{1,2}\\:[0-9]{2}$', string_value):
+            return string_value
+        raise ConvertError()
+
+    def to_boolean(self, string_value):
+        if string_value.lower() in ['true', 'false', 'none']:
+            return eval(string_value)
+        raise ConvertError()
+
+    def to_decimal(self, string_value):
+        if '.' in string_value:
+            try:
+                value = Decimal(string_value)
+                if str(value) == string_value:
+                    return value
+            except (ValueError, InvalidOperation):
+                pass
+        raise ConvertError()
+
+    def to_int(self, string_value):
+        try:
+            value = int(string_value)
+            if str(value) == string_value:
+                return value
+        except ValueError:
+            pass
+        raise ConvertError()
+
+    def to_datetime(self, string_value):
+        raise ConvertError()
+
+
+def make_columns(rows):
+    return {
+        'int': [str(random.randint(-10000, 10000)) for _ in range(rows)],
+        'decimal': [f'{random.uniform(0, 100):.2f}' for _ in range(rows)],
+        'boolean': [random.choice(['True', 'False', 'None']) for _ in range(rows)],
+        'time': [f'{random.randint(0, 23)}:{random.randint(0, 59):02d}' for _ in range(rows)],
+        'string': [random.choice(['Yes', 'No', 'not applicable', 'N/A', '"quoted"'])
+                   for _ in range(rows)]}
+
+
+def fuzz(number):
+    """Asserts new and legacy to_value agree on random strings
+    (dates are excluded as the legacy code could not parse them).
+    """
+    alphabet = '0123456789-.:E+ "TrueFalsNonx'
+    for _ in range(number):
+        string_value = ''.join(
+            random.choice(alphabet) for _ in range(random.randint(0, 8)))
+        try:
+            expected = LegacyConvert(string_value).to_value()
+        except NameError:  # eval of 'true', 'none', ...
+            continue
+        value = Convert(string_value).to_value()
+        if isinstance(value, datetime):
+            continue
+        assert (value, type(value)) == (expected, type(expected)), string_value
+
+
+def timed(func):
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=100000)
+    options = parser.parse_args()
+    fuzz(100000)
+    columns = make_columns(options.rows)
+    sys.stdout.write(
+        f'{"":10}{"legacy":>12}{"to_value":>12}{"iter":>12}{"column":>12}  (values/s)\n')
+    for name, column in columns.items():
+        expected = [LegacyConvert(value).to_value() for value in column]
+        assert list(Convert.iter_values(column, column=True)) == expected
+        timings = [
+            timed(lambda: [LegacyConvert(value).to_value() for value in column]),
+            timed(lambda: [Convert(value).to_value() for value in column]),
+            timed(lambda: list(Convert.iter_values(column))),
+            timed(lambda: list(Convert.iter_values(column, column=True)))]
+        sys.stdout.write(f'{name:10}' + ''.join(
+            f'{options.rows / seconds:12,.0f}' for seconds in timings) + '\n')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+"""Throughput of Convert.iter_strings/write_strings compared with
+calling Convert.to_string per value, one column at a time.
+
+    $ python benchmarks/bench_convert_to_string.py --rows 100000
+"""
+import argparse
+import io
+import os
+import random
+import sys
+import time
+
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'edc_base.settings')
+
+import pytz  # noqa
+
+from edc_base.utils import Convert  # noqa
+
+
+def make_columns(rows):
+    start = pytz.utc.localize(datetime(2017, 1, 1))
+    return {
+        'datetime': [start + timedelta(minutes=random.randint(0, 500000))
+                     for _ in range(rows)],
+        'date': [date(2017, 1, 1) + timedelta(days=random.randint(0, 1000))
+                 for _ in range(rows)],
+        'decimal': [Decimal(f'{random.uniform(0, 100):.2f}') for _ in range(rows)],
+        'int': [random.randint(-10000, 10000) for _ in range(rows)],
+        'string': [random.choice(['Yes', 'No', 'N/A', None]) for _ in range(rows)]}
+
+
+def per_value(column):
+    fp = io.StringIO()
+    for value in column:
+        fp.write(Convert(value).to_string() + '\n')
+    return fp.getvalue()
+
+
+def bulk(column):
+    fp = io.StringIO()
+    Convert.write_strings(column, fp)
+    return fp.getvalue()
+
+
+def timed(func, column):
+    start = time.perf_counter()
+    func(column)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=100000)
+    options = parser.parse_args()
+    columns = make_columns(options.rows)
+    sys.stdout.write(f'{"":10}{"to_string":>12}{"write_strings":>15}  (values/s)\n')
+    for name, column in columns.items():
+        assert per_value(column) == bulk(column)
+        before = min(timed(per_value, column) for _ in range(3))
+        after = min(timed(bulk, column) for _ in range(3))
+        sys.stdout.write(
+            f'{name:10}{options.rows / before:12,.0f}{options.rows / after:15,.0f}\n')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,40 @@
+"""Identifiers per second from RandomIdentifierGenerator.generate
+compared with calling get_safe_random_string per identifier (no
+uniqueness check in either).
+
+    $ python benchmarks/bench_random_identifier.py --count 100000
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'edc_base.settings')
+
+from edc_base.random_identifier import RandomIdentifierGenerator  # noqa
+from edc_base.utils import get_safe_random_string  # noqa
+
+
+def timed(func):
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--count', type=int, default=100000)
+    parser.add_argument('--length', type=int, default=12)
+    options = parser.parse_args()
+    count, length = options.count, options.length
+    generator = RandomIdentifierGenerator(length=length)
+    before = timed(lambda: [get_safe_random_string(length) for _ in range(count)])
+    after = timed(lambda: generator.generate(count))
+    sys.stdout.write(
+        f'get_safe_random_string {count / before:12,.0f}/s\n'
+        f'generate               {count / after:12,.0f}/s\n')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+"""Per-save cost of stamping BaseModel.revision with the revision
+resolved once per process (edc_base.revision) from the git checkout,
+a manifest file or settings.REVISION, compared with resolving it from
+the repository on each save.
+
+    $ python benchmarks/bench_revision.py --number 100000
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'edc_base.settings')
+
+from unittest.mock import patch  # noqa
+
+from django.conf import settings  # noqa
+from django_revision import Revision  # noqa
+
+settings.USE_I18N = False  # field modules translate at import
+
+from edc_base.model_fields import RevisionField  # noqa
+from edc_base.revision import clear_revision_cache, get_revision_source  # noqa
+
+
+class Instance:
+    pass
+
+
+def time_pre_save(field, number):
+    instance = Instance()
+    field.pre_save(instance, False)
+    return min(timeit.repeat(
+        lambda: field.pre_save(instance, False), number=number, repeat=3)) / number
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--number', type=int, default=100000)
+    options = parser.parse_args()
+    field = RevisionField()
+    field.set_attributes_from_name('revision')
+    manifest = os.path.join(tempfile.mkdtemp(), 'revision.json')
+    with open(manifest, 'w') as f:
+        json.dump({'revision': 'v1.0.0:master:abc'}, f)
+    settings.REVISION_MANIFEST = manifest
+    results = []
+    clear_revision_cache()
+    results.append(('git checkout', time_pre_save(field, options.number)))
+    with patch('edc_base.revision.get_git_revision', return_value=None):
+        clear_revision_cache()
+        results.append(('manifest', time_pre_save(field, options.number)))
+    settings.REVISION = 'v1.0.0:frozen'
+    clear_revision_cache()
+    results.append(('settings.REVISION', time_pre_save(field, options.number)))
+    number = max(options.number // 1000, 10)
+    results.append((
+        'git per save',
+        min(timeit.repeat(lambda: Revision().revision, number=number, repeat=3)) / number))
+    for name, seconds in results:
+        sys.stdout.write(f'{name:20}{seconds * 1e6:12.3f}us\n')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+"""Cost of SiteModels.site_models() with the per-app_label index and
+cached sorted model lists, compared with walking every app config
+and model on each call, for 80 apps and 1,000 models.
+
+    $ python benchmarks/bench_site_models.py --apps 80 --models 1000
+"""
+import argparse
+import os
+import sys
+import timeit
+
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from edc_base.site_models import SiteModels  # noqa
+
+
+class Meta:
+
+    def __init__(self, app_label, model_name):
+        self.label_lower = f'{app_label}.{model_name}'
+        self.verbose_name = model_name.replace('_', ' ')
+
+
+class Model:
+
+    def __init__(self, app_label, model_name):
+        self._meta = Meta(app_label, model_name)
+
+
+class AppConfig:
+
+    def __init__(self, label, models):
+        self.label = label
+        self.name = f'project.{label}'
+        self.models = models
+
+    def get_models(self):
+        return iter(self.models)
+
+
+class Apps:
+
+    def __init__(self, app_count, model_count):
+        self.app_configs = {}
+        for index in range(app_count):
+            label = f'app{index}'
+            models = [Model(label, f'model_{n}') for n in range(
+                index, model_count, app_count)]
+            self.app_configs[label] = AppConfig(label, models)
+
+    def get_app_configs(self):
+        return self.app_configs.values()
+
+    def get_app_config(self, app_label):
+        return self.app_configs[app_label]
+
+
+def legacy_site_models(site_models, apps, app_label=None):
+    result = {}
+    app_configs = (apps.get_app_configs()
+                   if app_label is None else [apps.get_app_config(app_label)])
+    for app_config in app_configs:
+        model_list = [model for model in app_config.get_models()
+                      if model._meta.label_lower in site_models.registry]
+        if model_list:
+            model_list.sort(key=lambda m: m._meta.verbose_name)
+            result.update({app_config.name: model_list})
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--apps', type=int, default=80)
+    parser.add_argument('--models', type=int, default=1000)
+    parser.add_argument('--number', type=int, default=200)
+    options = parser.parse_args()
+    apps = Apps(options.apps, options.models)
+    with patch('edc_base.site_models.django_apps', apps):
+        site_models = SiteModels()
+        for app_config in apps.get_app_configs():
+            site_models.register(
+                [model._meta.label_lower for model in app_config.models[::2]])
+        assert site_models.site_models() == legacy_site_models(site_models, apps)
+        assert (site_models.site_models('app1')
+                == legacy_site_models(site_models, apps, 'app1'))
+        for name, stmt in [
+                ('legacy, all apps', lambda: legacy_site_models(site_models, apps)),
+                ('indexed, all apps', lambda: site_models.site_models()),
+                ('legacy, one app', lambda: legacy_site_models(site_models, apps, 'app1')),
+                ('indexed, one app', lambda: site_models.site_models('app1'))]:
+            seconds = min(timeit.repeat(stmt, number=options.number, repeat=3))
+            print(f'{name:<20} {seconds / options.number * 1e6:10.1f} us/call')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+"""Per-call cost of edc_base.utils.age, to_arrow_utc and formatted_age
+compared with the previous arrow based implementation.
+
+    $ python benchmarks/bench_utils_age.py --number 20000
+"""
+import argparse
+import arrow
+import os
+import sys
+import timeit
+
+from datetime import date, datetime
+from dateutil import tz
+from dateutil.relativedelta import relativedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'edc_base.settings')
+
+import pytz  # noqa
+
+from django.conf import settings  # noqa
+
+from edc_base.utils import age, formatted_age, to_arrow_utc  # noqa
+
+
+def legacy_to_arrow_utc(dt, timezone=None):
+    try:
+        dt.date()
+    except AttributeError:
+        tzinfo = tz.gettz(timezone or settings.TIME_ZONE)
+        r_utc = arrow.Arrow.fromdate(dt, tzinfo=tzinfo).to('utc')
+    else:
+        r_utc = arrow.Arrow.fromdatetime(dt, tzinfo=dt.tzinfo).to('utc')
+    return r_utc
+
+
+def legacy_age(born, reference_dt, timezone=None):
+    born_utc = legacy_to_arrow_utc(born, timezone)
+    reference_dt_utc = legacy_to_arrow_utc(reference_dt, timezone)
+    return relativedelta(reference_dt_utc.datetime, born_utc.datetime)
+
+
+def legacy_formatted_age(born, reference_dt=None, timezone=None):
+    tzinfo = tz.gettz(timezone or settings.TIME_ZONE)
+    born = arrow.Arrow.fromdate(born, tzinfo=tzinfo).datetime
+    reference_dt = reference_dt or arrow.utcnow().datetime
+    age_delta = legacy_age(born, reference_dt)
+    if born > reference_dt:
+        return '?'
+    elif age_delta.years == 0 and age_delta.months <= 0:
+        return '%sd' % (age_delta.days)
+    elif age_delta.years == 0 and age_delta.months > 0 and age_delta.months <= 2:
+        return '%sm%sd' % (age_delta.months, age_delta.days)
+    elif age_delta.years == 0 and age_delta.months > 2:
+        return '%sm' % (age_delta.months)
+    elif age_delta.years == 1:
+        return '%sm' % (age_delta.months + 12)
+    return '%sy' % (age_delta.years)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--number', type=int, default=20000)
+    parser.add_argument('--timezone', default='Africa/Gaborone')
+    options = parser.parse_args()
+    born = date(1990, 12, 12)
+    reference_dt = pytz.utc.localize(datetime(2016, 12, 12, 10, 30))
+    timezone = options.timezone
+    assert legacy_age(born, reference_dt, timezone) == age(born, reference_dt, timezone)
+    assert legacy_formatted_age(born, reference_dt, timezone) == formatted_age(
+        born, reference_dt, timezone)
+    assert (legacy_to_arrow_utc(born, timezone).datetime
+            == to_arrow_utc(born, timezone).datetime)
+    pairs = [
+        ('to_arrow_utc', lambda: legacy_to_arrow_utc(born, timezone),
+         lambda: to_arrow_utc(born, timezone)),
+        ('age', lambda: legacy_age(born, reference_dt, timezone),
+         lambda: age(born, reference_dt, timezone)),
+        ('formatted_age', lambda: legacy_formatted_age(born, reference_dt, timezone),
+         lambda: formatted_age(born, reference_dt, timezone))]
+    sys.stdout.write(f'{"":15}{"before":>12}{"after":>12}\n')
+    for name, before, after in pairs:
+        before_us = min(timeit.repeat(before, number=options.number, repeat=3))
+        after_us = min(timeit.repeat(after, number=options.number, repeat=3))
+        sys.stdout.write(
+            f'{name:15}{before_us / options.number * 1e6:10.2f}us'
+            f'{after_us / options.number * 1e6:10.2f}us\n')
+
+
+if __name__ == '__main__':
+    main()
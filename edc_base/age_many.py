@@ -0,0 +1,220 @@
+from collections import namedtuple
+from datetime import date, datetime, timedelta
+
+from .exceptions import AgeValueError
+from .utils import age, get_tzinfo
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+DATE_UNITS = ('Y', 'M', 'W', 'D')
+
+US_PER_DAY = 24 * 60 * 60 * 1000000
+
+EPOCH = datetime(1970, 1, 1)
+
+EPOCH_ORDINAL = EPOCH.toordinal()
+
+
+class AgeManyError(Exception):
+    pass
+
+
+Ages = namedtuple('Ages', 'years months days mask errors')
+
+
+def _datetime_to_us(dt):
+    """Returns microseconds since the epoch (UTC) for a datetime
+    using the same rules as `to_utc`.
+
+    Naive datetimes are assumed to be UTC.
+    """
+    offset = dt.utcoffset()
+    us = (((dt.toordinal() - EPOCH_ORDINAL) * 86400
+           + dt.hour * 3600 + dt.minute * 60 + dt.second) * 1000000
+          + dt.microsecond)
+    if offset:
+        us -= offset // timedelta(microseconds=1)
+    return us
+
+
+def _dates_to_us(days, tzinfo):
+    """Returns an array of microseconds since the epoch (UTC) for
+    midnight in `tzinfo` of each date, given as days since the epoch.
+
+    Each distinct date is localized once.
+    """
+    unique_days, inverse = np.unique(days, return_inverse=True)
+    midnights = []
+    for day in unique_days:
+        midnight = EPOCH + timedelta(days=int(day))
+        if tzinfo is not None:
+            midnight = midnight.replace(tzinfo=tzinfo)
+        midnights.append(_datetime_to_us(midnight))
+    return np.array(midnights, dtype=np.int64)[inverse.reshape(-1)]
+
+
+def _is_scalar(value):
+    return (value is None or isinstance(value, (date, str))
+            or (np is not None and isinstance(value, np.datetime64)))
+
+
+def _to_us_array(values, tzinfo, size=None):
+    """Returns a tuple of (int64 array of UTC microseconds, missing mask).
+
+    `values` is a sequence of dates/datetimes (None for missing) or a
+    NumPy datetime64 array. datetime64 values with a unit of a day or
+    coarser are treated as dates, finer units as naive UTC datetimes.
+    """
+    if _is_scalar(values):
+        values = [values] * (size or 0)
+    if isinstance(values, np.ndarray) and values.dtype.kind == 'M':
+        return _datetime64_to_us_array(values, tzinfo)
+    values = list(values)
+    us = np.zeros(len(values), dtype=np.int64)
+    missing = np.zeros(len(values), dtype=bool)
+    date_indexes, date_days = [], []
+    for index, value in enumerate(values):
+        if isinstance(value, np.datetime64):
+            value = _from_datetime64(value)
+        if not value:
+            missing[index] = True
+        elif isinstance(value, datetime):
+            us[index] = _datetime_to_us(value)
+        elif isinstance(value, date):
+            date_indexes.append(index)
+            date_days.append(value.toordinal() - EPOCH_ORDINAL)
+        else:
+            raise AgeManyError(
+                f'Expected a date or datetime. Got {repr(value)} at index {index}.')
+    if date_indexes:
+        us[date_indexes] = _dates_to_us(
+            np.array(date_days, dtype=np.int64), tzinfo)
+    return us, missing
+
+
+def _from_datetime64(value):
+    """Returns a date, naive datetime or None for a datetime64 scalar.
+    """
+    if np.isnat(value):
+        return None
+    unit, _ = np.datetime_data(value.dtype)
+    if unit in DATE_UNITS:
+        return value.astype('datetime64[D]').item()
+    return value.astype('datetime64[us]').item()
+
+
+def _datetime64_to_us_array(values, tzinfo):
+    missing = np.isnat(values)
+    unit, _ = np.datetime_data(values.dtype)
+    if unit in DATE_UNITS:
+        days = values.astype('datetime64[D]').astype(np.int64)
+        days[missing] = 0
+        us = _dates_to_us(days, tzinfo)
+    else:
+        us = values.astype('datetime64[us]').astype(np.int64)
+    us[missing] = 0
+    return us, missing
+
+
+def _add_months(born_month_index, born_day, born_time, months):
+    """Returns `born` plus `months` in UTC microseconds clipping
+    the day to the end of the month, as `relativedelta` does.
+    """
+    month_index = born_month_index + months
+    month_start = month_index.astype('datetime64[M]').astype(
+        'datetime64[D]').astype(np.int64)
+    next_month_start = (month_index + 1).astype('datetime64[M]').astype(
+        'datetime64[D]').astype(np.int64)
+    day = np.minimum(born_day, next_month_start - month_start)
+    return (month_start + day - 1) * US_PER_DAY + born_time
+
+
+def _relativedelta_many(born_us, reference_us):
+    """Returns years, months, days arrays matching
+    relativedelta(reference, born) for reference >= born.
+    """
+    born_days = born_us // US_PER_DAY
+    born_time = born_us - born_days * US_PER_DAY
+    born_date = born_days.astype('datetime64[D]')
+    born_month = born_date.astype('datetime64[M]')
+    born_month_index = born_month.astype(np.int64)
+    born_day = (born_date - born_month).astype(np.int64) + 1
+    reference_month_index = (reference_us // US_PER_DAY).astype(
+        'datetime64[D]').astype('datetime64[M]').astype(np.int64)
+    months = reference_month_index - born_month_index
+    candidate = _add_months(born_month_index, born_day, born_time, months)
+    overshoot = candidate > reference_us
+    if overshoot.any():
+        months = np.where(overshoot, months - 1, months)
+        candidate = np.where(
+            overshoot,
+            _add_months(born_month_index, born_day, born_time, months),
+            candidate)
+    days = (reference_us - candidate) // US_PER_DAY
+    return months // 12, months % 12, days
+
+
+def age_many(born_seq, reference_seq, timezone=None):
+    """Returns an `Ages` namedtuple of years, months and days as
+    NumPy masked arrays, one element per born/reference pair.
+
+    Each element matches `age(born, reference_dt, timezone)`. Where
+    `age` would raise an AgeValueError the element is masked and
+    the error message is in `errors`, a dict keyed by index.
+
+    `born_seq` and `reference_seq` may be sequences of dates or
+    datetimes or NumPy datetime64 arrays. Either may also be a single
+    date/datetime to compare against every element of the other.
+    """
+    if np is None:
+        raise AgeManyError('age_many requires numpy. Try pip install numpy.')
+    tzinfo = get_tzinfo(timezone)
+    if _is_scalar(born_seq) and _is_scalar(reference_seq):
+        raise AgeManyError(
+            'Expected a sequence for born_seq or reference_seq. Got two scalars.')
+    size = None if _is_scalar(born_seq) else len(born_seq)
+    size = size if size is not None else len(reference_seq)
+    born_us, born_missing = _to_us_array(born_seq, tzinfo, size)
+    reference_us, reference_missing = _to_us_array(
+        reference_seq, tzinfo, size)
+    if len(born_us) != len(reference_us):
+        raise AgeManyError(
+            f'Expected sequences of equal length. Got {len(born_us)} '
+            f'and {len(reference_us)}.')
+    mask = born_missing | reference_missing | (born_us > reference_us)
+    valid_born = np.where(mask, 0, born_us)
+    valid_reference = np.where(mask, 0, reference_us)
+    years, months, days = _relativedelta_many(valid_born, valid_reference)
+    errors = {}
+    for index in np.flatnonzero(mask):
+        errors[int(index)] = _get_error_message(
+            born_seq, reference_seq, int(index), timezone)
+    return Ages(
+        years=np.ma.masked_array(years, mask=mask),
+        months=np.ma.masked_array(months, mask=mask),
+        days=np.ma.masked_array(days, mask=mask),
+        mask=mask,
+        errors=errors)
+
+
+def _get_error_message(born_seq, reference_seq, index, timezone):
+    """Returns the message of the AgeValueError raised by `age`
+    for the element at `index`.
+    """
+    born = _python_value(born_seq, index)
+    reference_dt = _python_value(reference_seq, index)
+    try:
+        age(born, reference_dt, timezone)
+    except AgeValueError as e:
+        return str(e)
+    return None
+
+
+def _python_value(values, index):
+    value = values if _is_scalar(values) else values[index]
+    if np is not None and isinstance(value, np.datetime64):
+        value = _from_datetime64(value)
+    return value
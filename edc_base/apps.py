@@ -2,13 +2,17 @@ import sys
 
 from django.apps import AppConfig as DjangoAppConfig
 from django.conf import settings
+from django.core.checks import Tags
 from django.core.checks.registry import register
 from django.db.backends.signals import connection_created
 from django.core.management.color import color_style
 from django.core.exceptions import ImproperlyConfigured
 
 from .address import Address
-from .system_checks import edc_base_check
+from .model_functions import register_sqlite_functions
+from .revision import get_revision, get_revision_source
+from .system_checks import edc_base_check, ordering_index_check
+from .system_checks import ordering_index_database_check, site_database_relation_check
 from .utils import get_utcnow
 
 
@@ -38,10 +42,17 @@ class AppConfig(DjangoAppConfig):
     def ready(self):
         from .signals import update_user_profile_on_post_save
         register(edc_base_check)
+        register(ordering_index_check)
+        register(ordering_index_database_check, Tags.database)
+        register(site_database_relation_check)
         sys.stdout.write(f'Loading {self.verbose_name} ...\n')
         connection_created.connect(activate_foreign_keys)
+        connection_created.connect(register_sqlite_functions)
         sys.stdout.write(
             f' * default TIME_ZONE {settings.TIME_ZONE}.\n')
+        sys.stdout.write(
+            f' * revision {get_revision() or "unknown"} '
+            f'(from {get_revision_source()}).\n')
         if not settings.USE_TZ:
             raise ImproperlyConfigured('EDC requires settings.USE_TZ = True')
         sys.stdout.write(f' Done loading {self.verbose_name}.\n')
@@ -0,0 +1,100 @@
+import os
+import pwd
+import socket
+
+from collections import namedtuple
+from contextlib import contextmanager
+from contextvars import ContextVar
+from django.apps import apps as django_apps
+from django.core.exceptions import ImproperlyConfigured
+
+from .revision import get_revision
+
+
+class AuditContextError(Exception):
+    pass
+
+
+AuditContext = namedtuple(
+    'AuditContext', 'hostname os_username user device_id revision')
+
+_audit_context = ContextVar('edc_base_audit_context', default=None)
+
+_process_audit_context = None
+
+
+def get_process_audit_context():
+    """Returns the AuditContext of this process, looking up the
+    hostname, OS user, device id and revision on first use only.
+    """
+    global _process_audit_context
+    if _process_audit_context is None:
+        try:
+            device_id = django_apps.get_app_config('edc_device').device_id
+        except (LookupError, ImproperlyConfigured):
+            device_id = None
+        _process_audit_context = AuditContext(
+            hostname=socket.gethostname(),
+            os_username=pwd.getpwuid(os.getuid()).pw_name,
+            user=None,
+            device_id=device_id,
+            revision=get_revision())
+    return _process_audit_context
+
+
+def get_audit_context():
+    """Returns the current AuditContext, that is, the one set for
+    this request or task, if any, or the one of this process.
+    """
+    return _audit_context.get() or get_process_audit_context()
+
+
+def set_audit_context(**values):
+    """Sets values of the current AuditContext and returns a
+    token for `reset_audit_context`.
+
+    For example, in a management command:
+
+        token = set_audit_context(user='erikvw')
+    """
+    try:
+        context = get_audit_context()._replace(**values)
+    except ValueError as e:
+        raise AuditContextError(
+            f'Invalid audit context value. Expected one of '
+            f'{AuditContext._fields}. Got {list(values)}. {e}')
+    return _audit_context.set(context)
+
+
+def reset_audit_context(token):
+    _audit_context.reset(token)
+
+
+@contextmanager
+def audit_context(**values):
+    """A context manager that sets values of the audit context
+    for the duration of the block.
+
+        with audit_context(user='erikvw'):
+            obj.save()
+    """
+    token = set_audit_context(**values)
+    try:
+        yield get_audit_context()
+    finally:
+        reset_audit_context(token)
+
+
+def get_audit_username():
+    """Returns the username of the user in the audit context,
+    if any.
+
+    `user` may be a username or a (lazy) user object, as set
+    by the middleware.
+    """
+    user = get_audit_context().user
+    if user is None or isinstance(user, str):
+        return user
+    if getattr(user, 'is_authenticated', False):
+        return user.get_username()
+    return None
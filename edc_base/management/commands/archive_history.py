@@ -0,0 +1,73 @@
+from datetime import timedelta
+from django.apps import apps as django_apps
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_datetime, parse_date
+
+from ...model_managers.history_archive import HistoryArchiver
+from ...utils import get_utcnow, to_utc
+
+
+class Command(BaseCommand):
+
+    help = ('Moves historical records older than a cutoff to gzip JSON Lines '
+            'archive files, one per historical model.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'models', nargs='*', metavar='app_label.model_name',
+            help='Models with HistoricalRecords (default all)')
+        parser.add_argument(
+            '--before', dest='before', default=None,
+            help='Archive records before this ISO date or datetime (UTC)')
+        parser.add_argument(
+            '--days', dest='days', type=int, default=None,
+            help='Archive records older than DAYS days')
+        parser.add_argument(
+            '--archive-dir', dest='archive_dir', default=None,
+            help='Archive folder (default settings.EDC_BASE_HISTORY_ARCHIVE_DIR)')
+        parser.add_argument(
+            '--chunk-size', dest='chunk_size', type=int, default=1000)
+        parser.add_argument(
+            '--keep', dest='keep', action='store_true', default=False,
+            help='Archive without deleting from the database')
+
+    def handle(self, *args, **options):
+        cutoff = self.get_cutoff(options.get('before'), options.get('days'))
+        for model in self.get_models(options.get('models')):
+            archiver = HistoryArchiver(
+                model, cutoff,
+                archive_dir=options.get('archive_dir'),
+                chunk_size=options.get('chunk_size'),
+                delete=not options.get('keep'))
+            count = archiver.archive()
+            self.stdout.write(
+                f'Archived {count} historical records of '
+                f'{model._meta.label_lower} to {archiver.path}.')
+        self.stdout.write(self.style.SUCCESS('Done.'))
+
+    @staticmethod
+    def get_cutoff(before, days):
+        if (before is None) == (days is None):
+            raise CommandError('Specify one of --before or --days.')
+        if days is not None:
+            return get_utcnow() - timedelta(days=days)
+        cutoff = parse_datetime(before) or parse_date(before)
+        if cutoff is None:
+            raise CommandError(f'Invalid date. Got {before}.')
+        return to_utc(cutoff, 'UTC')
+
+    @staticmethod
+    def get_models(labels):
+        if not labels:
+            return [model for model in django_apps.get_models()
+                    if hasattr(model._meta, 'historical_records')]
+        models = []
+        for label in labels:
+            try:
+                model = django_apps.get_model(label)
+            except (LookupError, ValueError) as e:
+                raise CommandError(e)
+            if not hasattr(model._meta, 'historical_records'):
+                raise CommandError(f'Model has no HistoricalRecords. Got {label}.')
+            models.append(model)
+        return models
@@ -0,0 +1,151 @@
+from django.apps import apps as django_apps
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models.deletion import Collector, ProtectedError
+
+from ...sites.shards import get_site_databases, is_site_model
+
+
+class Command(BaseCommand):
+
+    help = ('Copies the rows of site models from a database to the database of '
+            'their site (settings.EDC_BASE_SITE_DATABASES), with the Site rows '
+            'they refer to, and optionally deletes them from the source. Run '
+            '`migrate --database=<alias>` for each site database first.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'models', nargs='*', metavar='app_label.model_name',
+            help='Site models (default all)')
+        parser.add_argument(
+            '--source', dest='source', default='default',
+            help='Database to copy from (default "default")')
+        parser.add_argument(
+            '--batch-size', dest='batch_size', type=int, default=1000)
+        parser.add_argument(
+            '--delete', dest='delete', action='store_true', default=False,
+            help='Delete the rows found in the site database from the source database')
+
+    def handle(self, *args, **options):
+        site_databases = get_site_databases()
+        if not site_databases:
+            raise CommandError(
+                'No site databases. See settings.EDC_BASE_SITE_DATABASES.')
+        models = self.get_models(options.get('models'))
+        source = options.get('source')
+        Site = django_apps.get_model('sites.site')
+        for site_id, alias in site_databases.items():
+            if alias == source:
+                continue
+            Site.objects.using(alias).bulk_create(
+                Site.objects.using(source).filter(pk=site_id), ignore_conflicts=True)
+            for model in models:
+                count = self.copy(model, site_id, source, alias, options)
+                self.stdout.write(
+                    f'Copied {count} {model._meta.label_lower} for site {site_id} to {alias}.')
+        if options.get('delete'):
+            for model in reversed(models):
+                for site_id, alias in site_databases.items():
+                    if alias == source:
+                        continue
+                    deleted, kept = self.delete(model, site_id, source, alias, options)
+                    self.stdout.write(
+                        f'Deleted {deleted} {model._meta.label_lower} for site {site_id} '
+                        f'from {source}. Kept {kept} not found in {alias}.')
+        self.stdout.write(self.style.SUCCESS('Done.'))
+
+    @staticmethod
+    def copy(model, site_id, source, alias, options):
+        """Copies the rows of `model` for `site_id` in primary key
+        chunks, skipping rows that exist in `alias`.
+        """
+        queryset = model._base_manager.using(source).filter(
+            site_id=site_id).order_by('pk')
+        batch_size = options.get('batch_size')
+        count = 0
+        last_pk = None
+        while True:
+            chunk_queryset = queryset if last_pk is None else queryset.filter(pk__gt=last_pk)
+            chunk = list(chunk_queryset[:batch_size])
+            if not chunk:
+                return count
+            with transaction.atomic(using=alias):
+                model._base_manager.using(alias).bulk_create(chunk, ignore_conflicts=True)
+            count += len(chunk)
+            last_pk = chunk[-1].pk
+
+    @staticmethod
+    def delete(model, site_id, source, alias, options):
+        """Deletes the rows of `model` for `site_id` from `source`
+        that are in `alias`, in primary key chunks. Returns the counts
+        of rows deleted and kept.
+
+        Rows not in `alias` (e.g. added since the copy or skipped on
+        a unique conflict) are kept. Raises if a delete would cascade
+        to rows of another model.
+        """
+        queryset = model._base_manager.using(source).filter(
+            site_id=site_id).order_by('pk')
+        batch_size = options.get('batch_size')
+        deleted = kept = 0
+        last_pk = None
+        while True:
+            chunk_queryset = queryset if last_pk is None else queryset.filter(pk__gt=last_pk)
+            pks = list(chunk_queryset.values_list('pk', flat=True)[:batch_size])
+            if not pks:
+                return deleted, kept
+            last_pk = pks[-1]
+            copied = list(model._base_manager.using(alias).filter(
+                pk__in=pks).values_list('pk', flat=True))
+            kept += len(pks) - len(copied)
+            if not copied:
+                continue
+            collector = Collector(using=source)
+            try:
+                collector.collect(model._base_manager.using(source).filter(pk__in=copied))
+            except ProtectedError as e:
+                raise CommandError(
+                    f'Unable to delete {model._meta.label_lower} for site {site_id}. '
+                    f'Rows of other models refer to them. Got {e}')
+            cascades = sorted(set(
+                [m._meta.label_lower for m, objs in collector.data.items()
+                 if m is not model and objs]
+                + [qs.model._meta.label_lower for qs in collector.fast_deletes
+                   if qs.model is not model and qs.exists()]))
+            if cascades:
+                raise CommandError(
+                    f'Unable to delete {model._meta.label_lower} for site {site_id}. '
+                    f'Deleting would also delete rows of {cascades}.')
+            with transaction.atomic(using=source):
+                collector.delete()
+            deleted += len(copied)
+
+    def get_models(self, labels):
+        """Returns site models ordered so that models come after
+        the site models they refer to.
+        """
+        if labels:
+            try:
+                models = [django_apps.get_model(label) for label in labels]
+            except (LookupError, ValueError) as e:
+                raise CommandError(e)
+            for model in models:
+                if not is_site_model(model):
+                    raise CommandError(f'Not a site model. Got {model._meta.label_lower}.')
+        else:
+            models = [model for model in django_apps.get_models() if is_site_model(model)]
+        ordered = []
+        pending = list(models)
+        while pending:
+            for model in pending:
+                related = [
+                    field.related_model for field in model._meta.concrete_fields
+                    if field.many_to_one and field.related_model in pending
+                    and field.related_model is not model]
+                if not related:
+                    break
+            else:
+                model = pending[0]  # a cycle; copy in the given order
+            pending.remove(model)
+            ordered.append(model)
+        return ordered
@@ -0,0 +1,74 @@
+import os
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from ...model_managers.async_history_writer import SPOOL_SUFFIX, fcntl, lock_spool_file
+from ...model_managers.async_history_writer import write_history_lines
+
+
+class Command(BaseCommand):
+
+    help = ('Writes the historical records left in the spool files of the '
+            'asynchronous history writer and deletes the files. Files locked '
+            'by a running writer are skipped.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--spool-dir', dest='spool_dir', default=None,
+            help='Spool folder (default settings.EDC_BASE_HISTORY_SPOOL_DIR)')
+        parser.add_argument(
+            '--min-age', dest='min_age', type=int, default=None,
+            help='Skip files modified in the last MIN_AGE seconds (default 0, '
+                 'or 60 where file locks are not supported)')
+        parser.add_argument(
+            '--batch-size', dest='batch_size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        spool_dir = options.get('spool_dir') or getattr(
+            settings, 'EDC_BASE_HISTORY_SPOOL_DIR', None)
+        if not spool_dir or not os.path.isdir(spool_dir):
+            raise CommandError(f'Invalid spool folder. Got {spool_dir}.')
+        min_age = options.get('min_age')
+        if min_age is None:
+            min_age = 0 if fcntl else 60
+        now = time.time()
+        for filename in sorted(os.listdir(spool_dir)):
+            if not filename.endswith(SPOOL_SUFFIX):
+                continue
+            path = os.path.join(spool_dir, filename)
+            try:
+                f = open(path)
+            except FileNotFoundError:
+                continue
+            with f:
+                if now - os.path.getmtime(path) < min_age:
+                    continue
+                elif not lock_spool_file(f):
+                    self.stdout.write(f'Skipped {filename}. In use.')
+                    continue
+                count = self.replay(f, options.get('batch_size'))
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+            self.stdout.write(f'Replayed {count} historical records from {filename}.')
+        self.stdout.write(self.style.SUCCESS('Done.'))
+
+    def replay(self, f, batch_size):
+        count = 0
+        lines = []
+        for line in f:
+            if not line.strip():
+                continue
+            elif not line.endswith('\n'):
+                self.stderr.write(f'Skipped incomplete last record in {f.name}.')
+                continue
+            lines.append(line)
+            if len(lines) == batch_size:
+                count += write_history_lines(lines, skip_existing=True)
+                lines = []
+        if lines:
+            count += write_history_lines(lines, skip_existing=True)
+        return count
@@ -0,0 +1,43 @@
+from django.apps import apps as django_apps
+from django.core.management.base import BaseCommand, CommandError
+
+from ...natural_key_stream import NaturalKeyStreamError, export_natural_keys
+
+
+class Command(BaseCommand):
+
+    help = ('Writes the rows of models keyed by natural key (e.g. historical '
+            'and list models) as JSON Lines, in chunks, unlike dumpdata.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'models', nargs='+', metavar='app_label.model_name')
+        parser.add_argument(
+            '--output', '-o', dest='output', default=None,
+            help='File to write to (default stdout)')
+        parser.add_argument(
+            '--chunk-size', dest='chunk_size', type=int, default=2000)
+        parser.add_argument(
+            '--database', dest='database', default=None)
+
+    def handle(self, *args, **options):
+        models = []
+        for label in options.get('models'):
+            try:
+                models.append(django_apps.get_model(label))
+            except (LookupError, ValueError) as e:
+                raise CommandError(e)
+        output = options.get('output')
+        fp = open(output, 'w') if output else self.stdout
+        try:
+            for model in models:
+                count = export_natural_keys(
+                    model, fp, chunk_size=options.get('chunk_size'),
+                    using=options.get('database'))
+                if output:
+                    self.stdout.write(f'Exported {count} {model._meta.label_lower}.')
+        except NaturalKeyStreamError as e:
+            raise CommandError(e)
+        finally:
+            if output:
+                fp.close()
@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from ...natural_key_stream import NaturalKeyImporter, NaturalKeyStreamError
+
+
+class Command(BaseCommand):
+
+    help = ('Loads JSON Lines written by stream_dumpdata in batches, '
+            'skipping rows whose natural key exists.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('filenames', nargs='+', metavar='filename')
+        parser.add_argument(
+            '--batch-size', dest='batch_size', type=int, default=1000)
+        parser.add_argument(
+            '--database', dest='database', default=None)
+
+    def handle(self, *args, **options):
+        importer = NaturalKeyImporter(
+            batch_size=options.get('batch_size'), using=options.get('database'))
+        for filename in options.get('filenames'):
+            try:
+                with open(filename) as f:
+                    importer.load(f)
+            except (OSError, NaturalKeyStreamError) as e:
+                raise CommandError(e)
+        self.stdout.write(
+            f'Inserted {importer.inserted} rows. Skipped {importer.skipped} existing.')
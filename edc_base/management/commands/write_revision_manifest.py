@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from ...revision import write_revision_manifest, RevisionError
+
+
+class Command(BaseCommand):
+
+    help = ('Writes the revision of the git checkout to a manifest file '
+            'for deployments without a git checkout.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--path', dest='path', default=None,
+            help='Path of the manifest (default settings.REVISION_MANIFEST '
+                 'or revision.json in settings.GIT_DIR)')
+
+    def handle(self, *args, **options):
+        try:
+            path = write_revision_manifest(path=options.get('path'))
+        except RevisionError as e:
+            raise CommandError(e)
+        self.stdout.write(self.style.SUCCESS(f'Wrote revision manifest {path}.'))
@@ -0,0 +1,47 @@
+from django.utils.deprecation import MiddlewareMixin
+
+from .audit_context import set_audit_context, reset_audit_context
+
+
+class AuditContextMiddleware(MiddlewareMixin):
+
+    """Sets the request user on the audit context for the
+    duration of each request.
+
+    Place after AuthenticationMiddleware.
+    """
+
+    def process_request(self, request):
+        request._audit_context_token = set_audit_context(
+            user=getattr(request, 'user', None))
+
+    def process_response(self, request, response):
+        token = getattr(request, '_audit_context_token', None)
+        if token is not None:
+            reset_audit_context(token)
+            del request._audit_context_token
+        return response
+
+
+class SiteContextMiddleware(MiddlewareMixin):
+
+    """Sets the site context to `request.site` for the duration
+    of each request so that the current site and reviewer mode
+    are resolved once per request.
+
+    Place after django.contrib.sites.middleware.CurrentSiteMiddleware.
+    """
+
+    def process_request(self, request):
+        from .sites.site_context import set_site_context
+        site = getattr(request, 'site', None)
+        if site is not None and getattr(site, 'id', None) is not None:
+            request._site_context_token = set_site_context(site)
+
+    def process_response(self, request, response):
+        from .sites.site_context import reset_site_context
+        token = getattr(request, '_site_context_token', None)
+        if token is not None:
+            reset_site_context(token)
+            del request._site_context_token
+        return response
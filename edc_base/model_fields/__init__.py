@@ -2,6 +2,7 @@ from django import get_version
 
 from .custom_fields import IdentityTypeField, InitialsField, DobField, OtherCharField
 from .date_estimated import IsDateEstimatedField, IsDateEstimatedFieldNa
-from .hostname_modification_field import HostnameModificationField
+from .hostname_modification_field import HostnameModificationField, HostnameCreationField
+from .revision_field import RevisionField
 from .userfield import UserField
 from .uuid_auto_field import UUIDAutoField
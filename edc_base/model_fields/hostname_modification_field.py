@@ -1,8 +1,8 @@
-import socket
-
 from django.db.models import CharField
 from django.utils.translation import ugettext as _
 
+from ..audit_context import get_audit_context
+
 
 class HostnameModificationField (CharField):
 
@@ -13,7 +13,24 @@ class HostnameModificationField (CharField):
         CharField.__init__(self, *args, **kwargs)
 
     def pre_save(self, model_instance, add):
-        """Updates socket.gethostname() on each save."""
-        value = socket.gethostname()
+        """Updates to the hostname of the audit context on each save."""
+        value = get_audit_context().hostname
         setattr(model_instance, self.attname, value)
         return value
+
+
+class HostnameCreationField(CharField):
+
+    """A CharField whose default is the hostname of the audit
+    context.
+
+    Deconstructs as `CharField(default=socket.gethostname)` as
+    the field it replaces so that no migrations are needed.
+    """
+
+    def get_default(self):
+        return get_audit_context().hostname
+
+    def deconstruct(self):
+        name, _, args, kwargs = super().deconstruct()
+        return name, 'django.db.models.CharField', args, kwargs
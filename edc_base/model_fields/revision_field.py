@@ -0,0 +1,22 @@
+from django_revision import RevisionField as DjangoRevisionField
+
+from ..revision import get_revision
+
+
+class RevisionField(DjangoRevisionField):
+
+    """A RevisionField that sets the revision resolved once per
+    process by `edc_base.revision.get_revision`.
+
+    Deconstructs as `django_revision.RevisionField` so that no
+    migrations are needed.
+    """
+
+    def pre_save(self, model_instance, add):
+        value = get_revision()
+        setattr(model_instance, self.attname, value)
+        return value
+
+    def deconstruct(self):
+        name, _, args, kwargs = super().deconstruct()
+        return name, 'django_revision.revision_field.RevisionField', args, kwargs
@@ -1,9 +1,8 @@
-import os
-import pwd
-
 from django.db.models import CharField
 from django.utils.translation import ugettext as _
 
+from ..audit_context import get_audit_context, get_audit_username
+
 
 class UserField(CharField):
 
@@ -14,12 +13,17 @@ class UserField(CharField):
         CharField.__init__(self, *args, **kwargs)
 
     def get_os_username(self):
-        return pwd.getpwuid(os.getuid()).pw_name
+        return get_audit_context().os_username
 
     def pre_save(self, model_instance, add):
         """Updates username created on ADD only."""
         value = super(UserField, self).pre_save(model_instance, add)
-        if not value and not add:
+        if not value and get_audit_username():
+            # user of the request or management command
+            value = get_audit_username()[:self.max_length]
+            setattr(model_instance, self.attname, value)
+            return value
+        elif not value and not add:
             # fall back to OS user if not accessing through browser
             # better than nothing ...
             value = self.get_os_username()
@@ -0,0 +1 @@
+from .age import AgeInYears, AgeInMonths, AgeInDays, register_sqlite_functions
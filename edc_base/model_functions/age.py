@@ -0,0 +1,186 @@
+from django.conf import settings
+from django.db import NotSupportedError
+from django.db.models import DateField, DateTimeField, F, Func, IntegerField, Value
+from django.db.models.expressions import Combinable
+from django.utils.dateparse import parse_date, parse_datetime
+from django.utils.timezone import utc
+
+from ..exceptions import AgeValueError
+from ..utils import age, get_utcnow
+
+YEARS = 'years'
+MONTHS = 'months'
+DAYS = 'days'
+
+
+def _sqlite_age(born, reference_dt, timezone, part):
+    """SQLite user function that returns a part of
+    `edc_base.utils.age` or NULL where `age` would raise.
+
+    Dates are stored as 'YYYY-MM-DD', datetimes as naive UTC.
+    """
+    if born is None or reference_dt is None:
+        return None
+    born, reference_dt = _sqlite_parse(born), _sqlite_parse(reference_dt)
+    try:
+        rdelta = age(born, reference_dt, timezone)
+    except AgeValueError:
+        return None
+    if part == YEARS:
+        return rdelta.years
+    elif part == MONTHS:
+        return rdelta.years * 12 + rdelta.months
+    return rdelta.days
+
+
+def _sqlite_parse(value):
+    if len(value) == 10:
+        return parse_date(value)
+    return parse_datetime(value).replace(tzinfo=utc)
+
+
+def register_sqlite_functions(sender, connection, **kwargs):
+    """Registers the user functions used by the age expressions
+    on each new SQLite connection.
+    """
+    if connection.vendor == 'sqlite':
+        connection.connection.create_function('edc_age', 4, _sqlite_age)
+
+
+class AgeFunc(Func):
+
+    """Base class for expressions that calculate the same age
+    as `edc_base.utils.age` in the database.
+
+    `born` and `reference` are field names or expressions of a
+    DateField or DateTimeField. `reference` may also be a date or
+    datetime and defaults to now. Dates are taken as midnight in
+    `timezone` (default settings.TIME_ZONE), as in `age`.
+
+    Evaluates to NULL where `age` would raise an AgeValueError.
+
+    Supported on SQLite and PostgreSQL.
+    """
+
+    part = None
+    output_field = IntegerField()
+
+    def __init__(self, born, reference=None, timezone=None, **extra):
+        self.timezone = timezone
+        super().__init__(
+            self._get_expression(born), self._get_expression(reference), **extra)
+
+    def __repr__(self):
+        born, reference = self.source_expressions
+        return f'{self.__class__.__name__}({born}, reference={reference})'
+
+    @staticmethod
+    def _get_expression(value):
+        if value is None:
+            return Value(get_utcnow(), output_field=DateTimeField())
+        elif isinstance(value, str):
+            return F(value)
+        elif isinstance(value, Combinable) or hasattr(value, 'resolve_expression'):
+            return value
+        elif hasattr(value, 'date'):
+            return Value(value, output_field=DateTimeField())
+        return Value(value, output_field=DateField())
+
+    def get_timezone(self):
+        return self.timezone or settings.TIME_ZONE
+
+    def as_sql(self, compiler, connection, **extra_context):
+        raise NotSupportedError(
+            f'{self.__class__.__name__} is not supported on {connection.vendor}. '
+            f'Expected sqlite or postgresql.')
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        sql, params = [], []
+        for expression in self.source_expressions:
+            expression_sql, expression_params = compiler.compile(expression)
+            sql.append(expression_sql)
+            params.extend(expression_params)
+        return (f'edc_age({sql[0]}, {sql[1]}, %s, %s)',
+                tuple(params) + (self.get_timezone(), self.part))
+
+    def as_postgresql(self, compiler, connection, **extra_context):
+        """Returns SQL that repeats the `relativedelta` arithmetic:
+        the number of whole months that can be added to born
+        without passing the reference (adding months clips to the
+        end of the month) then the days that remain.
+        """
+        born = self._utc_timestamp_sql(compiler, self.source_expressions[0])
+        reference = self._utc_timestamp_sql(compiler, self.source_expressions[1])
+        months = _join(
+            '((EXTRACT(YEAR FROM ', reference, ') - EXTRACT(YEAR FROM ', born,
+            ')) * 12 + EXTRACT(MONTH FROM ', reference, ') - EXTRACT(MONTH FROM ',
+            born, '))::integer')
+        months = _join(
+            '(', months, ' - CASE WHEN ', born, ' + make_interval(months => ',
+            months, ') > ', reference, ' THEN 1 ELSE 0 END)')
+        if self.part == YEARS:
+            value = _join('(', months, ' / 12)')
+        elif self.part == MONTHS:
+            value = months
+        else:
+            value = _join(
+                'EXTRACT(DAY FROM ', reference, ' - (', born,
+                ' + make_interval(months => ', months, ')))::integer')
+        return _join(
+            'CASE WHEN ', born, ' > ', reference, ' THEN NULL ELSE ', value, ' END')
+
+    def _utc_timestamp_sql(self, compiler, expression):
+        """Returns SQL for the expression as a UTC timestamp
+        without time zone.
+        """
+        sql, params = compiler.compile(expression)
+        if isinstance(expression.output_field, DateTimeField):
+            return f'(({sql}) AT TIME ZONE \'UTC\')', tuple(params)
+        return (f'(({sql})::timestamp AT TIME ZONE %s AT TIME ZONE \'UTC\')',
+                tuple(params) + (self.get_timezone(), ))
+
+
+def _join(*pieces):
+    """Returns (sql, params) joining literal SQL strings and
+    (sql, params) tuples in order.
+    """
+    sql, params = [], ()
+    for piece in pieces:
+        if isinstance(piece, str):
+            sql.append(piece)
+        else:
+            sql.append(piece[0])
+            params += tuple(piece[1])
+    return ''.join(sql), params
+
+
+class AgeInYears(AgeFunc):
+
+    """Age in completed years, i.e. `age(born, reference).years`.
+
+    For example:
+
+        SubjectConsent.objects.annotate(
+            age_in_years=AgeInYears('dob', reference='consent_datetime')
+        ).filter(age_in_years__range=(18, 24))
+    """
+
+    part = YEARS
+
+
+class AgeInMonths(AgeFunc):
+
+    """Age in completed months, i.e. `years * 12 + months`
+    of `age(born, reference)`.
+    """
+
+    part = MONTHS
+
+
+class AgeInDays(AgeFunc):
+
+    """Days in the incomplete month of the age, i.e.
+    `age(born, reference).days` (see `get_age_in_days`).
+    """
+
+    part = DAYS
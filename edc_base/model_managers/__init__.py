@@ -1,3 +1,8 @@
-from .historical_records import HistoricalRecords
+from .audited_queryset import AuditedQuerySet, AuditedManager, AuditedQuerySetError
+from .async_history_writer import get_async_history_writer, history_writer_metrics
+from .historical_records import HistoricalRecords, changed_field_q
+from .history_archive import HistoryArchive, HistoryArchiver
+from .history_buffer import flush_history, get_history_buffer
 from .history_manager_mixin import HistoryManagerMixin
+from .history_queryset import HistoryQuerySet, AuditedHistoryManager
 from .list_model_manager import ListModelManager
@@ -0,0 +1,349 @@
+import atexit
+import json
+import logging
+import os
+import queue
+import socket
+import threading
+import time
+
+from datetime import datetime, time as time_type
+from django.conf import settings
+from django.core import serializers
+from django.core.exceptions import ImproperlyConfigured
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import close_old_connections
+
+try:
+    import fcntl
+except ImportError:  # e.g. Windows
+    fcntl = None
+
+logger = logging.getLogger('edc_base')
+
+SPOOL_SUFFIX = '.jsonl'
+
+
+def lock_spool_file(file):
+    """Takes an exclusive lock on an open spool file without
+    blocking. Returns False if another open file holds the lock.
+
+    The lock is released when the file is closed, also if the
+    process dies. Always returns True where file locks are not
+    supported.
+    """
+    if fcntl is None:
+        return True
+    try:
+        fcntl.flock(file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        return False
+    return True
+
+
+class HistoryJSONEncoder(DjangoJSONEncoder):
+
+    """Keeps microseconds, which DjangoJSONEncoder truncates.
+    """
+
+    def default(self, o):
+        if isinstance(o, (datetime, time_type)):
+            return o.isoformat()
+        return super().default(o)
+
+
+class SpoolSegment:
+
+    """A spool file of serialized historical records.
+
+    The file is locked while the segment is in use, so that
+    `replay_history_spool` skips it, and deleted once all of its
+    records are written.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        # lock before the file gets a name replay_history_spool reads
+        self.file = open(f'{path}.new', 'a')
+        lock_spool_file(self.file)
+        os.rename(f'{path}.new', path)
+        self.appended = 0
+        self.written = 0
+        self.skipped = 0
+        self.closed = False
+
+    def append(self, line, fsync=None):
+        self.file.write(line + '\n')
+        self.file.flush()
+        if fsync:
+            os.fsync(self.file.fileno())
+        self.appended += 1
+
+    def close(self):
+        """Closes the segment for appending. The file stays locked
+        until released.
+        """
+        self.closed = True
+
+    def release(self):
+        """Closes and unlocks the file.
+        """
+        if not self.file.closed:
+            self.file.close()
+
+    @property
+    def finished(self):
+        """True if closed and each record was written or skipped
+        (not queued or failed).
+        """
+        return self.closed and self.written + self.skipped >= self.appended
+
+    @property
+    def done(self):
+        return self.finished and not self.skipped
+
+
+class AsyncHistoryWriter:
+
+    """Writes historical records from a background thread.
+
+    Each record is appended to a local spool file (one JSON line), then put on a
+    bounded queue. The thread drains the queue in batches with one
+    bulk_create per history model. A spool file (segment) is locked
+    while in use and deleted once all of its records are written.
+    Records that could not be queued (the queue was full) or written
+    remain in the spool for `manage.py replay_history_spool`, which
+    reads the segment once the writer has released it.
+
+    Settings:
+        EDC_BASE_HISTORY_SPOOL_DIR: folder for spool files (required)
+        EDC_BASE_HISTORY_QUEUE_SIZE: default 10000
+        EDC_BASE_HISTORY_BATCH_SIZE: default 500
+        EDC_BASE_HISTORY_SEGMENT_SIZE: records per spool file, default 10000
+        EDC_BASE_HISTORY_FSYNC: fsync each record, default True. If
+            False, records not yet written to the database may be
+            lost if the host (not only the process) crashes.
+    """
+
+    def __init__(self, spool_dir=None, maxsize=None, batch_size=None,
+                 segment_size=None, fsync=None):
+        self.spool_dir = spool_dir or getattr(settings, 'EDC_BASE_HISTORY_SPOOL_DIR', None)
+        if not self.spool_dir:
+            raise ImproperlyConfigured(
+                'Asynchronous history requires settings.EDC_BASE_HISTORY_SPOOL_DIR.')
+        os.makedirs(self.spool_dir, exist_ok=True)
+        self.maxsize = maxsize or getattr(settings, 'EDC_BASE_HISTORY_QUEUE_SIZE', 10000)
+        self.batch_size = batch_size or getattr(settings, 'EDC_BASE_HISTORY_BATCH_SIZE', 500)
+        self.segment_size = segment_size or getattr(
+            settings, 'EDC_BASE_HISTORY_SEGMENT_SIZE', 10000)
+        self.fsync = getattr(settings, 'EDC_BASE_HISTORY_FSYNC', True) if fsync is None else fsync
+        self.queue = queue.Queue(maxsize=self.maxsize)
+        self.lock = threading.Lock()
+        self.segment = None
+        self.segment_count = 0
+        self.thread = None
+        self.stopping = False
+        self.enqueued = 0
+        self.written = 0
+        self.spooled_only = 0
+        self.failed = 0
+        self.last_batch_lag = 0.0
+
+    @staticmethod
+    def serialize(history_instance, using=None):
+        """Returns a JSON line for an unsaved historical record.
+        """
+        data = serializers.serialize('python', [history_instance])[0]
+        data.update(using=using)
+        return json.dumps(data, cls=HistoryJSONEncoder)
+
+    def put(self, history_instance, using=None):
+        """Spools and queues a historical record.
+        """
+        line = self.serialize(history_instance, using=using)
+        with self.lock:
+            segment = self.get_segment()
+            segment.append(line, fsync=self.fsync)
+        self.start()
+        try:
+            self.queue.put_nowait((segment, line, time.monotonic()))
+        except queue.Full:
+            self.spooled_only += 1
+            with self.lock:
+                segment.skipped += 1
+                self.release_if_finished(segment)
+            logger.warning(
+                f'History queue is full. Record left in spool {segment.path}.')
+        else:
+            self.enqueued += 1
+
+    def get_segment(self):
+        if self.segment is None or self.segment.appended >= self.segment_size:
+            if self.segment is not None:
+                self.segment.close()
+                self.release_if_finished(self.segment)
+            self.segment_count += 1
+            name = (f'{socket.gethostname()}-{os.getpid()}-{int(time.time())}-'
+                    f'{self.segment_count}{SPOOL_SUFFIX}')
+            self.segment = SpoolSegment(os.path.join(self.spool_dir, name))
+        return self.segment
+
+    def release_if_finished(self, segment):
+        """Deletes the file of a segment whose records are all
+        written and releases a finished segment, leaving any records
+        not written for replay.
+        """
+        if segment.finished:
+            if segment.done:
+                try:
+                    os.remove(segment.path)
+                except FileNotFoundError:
+                    pass
+            segment.release()
+
+    def start(self):
+        if self.thread is None or not self.thread.is_alive():
+            with self.lock:
+                if self.thread is None or not self.thread.is_alive():
+                    self.stopping = False
+                    self.thread = threading.Thread(
+                        target=self.run, name='edc-history-writer', daemon=True)
+                    self.thread.start()
+
+    def run(self):
+        while True:
+            try:
+                items = [self.queue.get(timeout=1.0)]
+            except queue.Empty:
+                if self.stopping:
+                    break
+                continue
+            while len(items) < self.batch_size:
+                try:
+                    items.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                self.write(items)
+            finally:
+                for _ in items:
+                    self.queue.task_done()
+
+    def write(self, items):
+        """Writes a batch of queued records. On failure the records
+        remain in the spool.
+        """
+        try:
+            write_history_lines([line for _, line, _ in items])
+        except Exception as e:
+            self.failed += len(items)
+            logger.exception(f'Failed to write {len(items)} historical records. Got {e}')
+            close_old_connections()
+            with self.lock:
+                for segment, _, _ in items:
+                    segment.skipped += 1
+                for segment in {segment for segment, _, _ in items}:
+                    self.release_if_finished(segment)
+            return
+        now = time.monotonic()
+        self.last_batch_lag = now - min(enqueued for _, _, enqueued in items)
+        self.written += len(items)
+        with self.lock:
+            for segment, _, _ in items:
+                segment.written += 1
+            for segment in {segment for segment, _, _ in items}:
+                self.release_if_finished(segment)
+
+    def flush(self):
+        """Blocks until the queue is drained.
+        """
+        self.queue.join()
+
+    def stop(self):
+        """Drains the queue, stops the thread and closes the spool.
+        """
+        if self.thread is not None and self.thread.is_alive():
+            self.flush()
+            self.stopping = True
+            self.thread.join()
+        with self.lock:
+            if self.segment is not None:
+                self.segment.close()
+                self.release_if_finished(self.segment)
+                self.segment = None
+
+    def metrics(self):
+        """Returns a dict of queue depth, lag (seconds) and counts.
+        """
+        with self.queue.mutex:
+            oldest = self.queue.queue[0][2] if self.queue.queue else None
+        return dict(
+            queue_depth=self.queue.qsize(),
+            queue_maxsize=self.maxsize,
+            lag=(time.monotonic() - oldest) if oldest is not None else 0.0,
+            last_batch_lag=self.last_batch_lag,
+            enqueued=self.enqueued,
+            written=self.written,
+            spooled_only=self.spooled_only,
+            failed=self.failed)
+
+
+def write_history_lines(lines, skip_existing=None):
+    """Writes serialized historical records with one bulk_create per
+    history model. Returns the number of records written.
+
+    If `skip_existing`, records whose history_id exists are skipped
+    (e.g. when replaying a spool).
+    """
+    by_model = {}
+    for line in lines:
+        data = json.loads(line)
+        using = data.pop('using', None)
+        by_model.setdefault((data['model'], using), []).append(data)
+    count = 0
+    for (_, using), data in by_model.items():
+        history_instances = [
+            obj.object for obj in serializers.deserialize('python', data)]
+        model = history_instances[0].__class__
+        if skip_existing:
+            existing = set(model.objects.using(using).filter(
+                pk__in=[obj.pk for obj in history_instances]).values_list('pk', flat=True))
+            history_instances = [
+                obj for obj in history_instances if obj.pk not in existing]
+        model.objects.using(using).bulk_create(history_instances)
+        count += len(history_instances)
+    return count
+
+
+_writer = None
+_writer_lock = threading.Lock()
+
+
+def get_async_history_writer():
+    """Returns the AsyncHistoryWriter of this process.
+    """
+    global _writer
+    if _writer is None:
+        with _writer_lock:
+            if _writer is None:
+                _writer = AsyncHistoryWriter()
+                atexit.register(_writer.stop)
+    return _writer
+
+
+def history_writer_metrics():
+    """Returns the metrics of the AsyncHistoryWriter of this process
+    or None if it has not been started.
+    """
+    return _writer.metrics() if _writer is not None else None
+
+
+def stop_async_history_writer():
+    """Drains and stops the AsyncHistoryWriter of this process, if any.
+    """
+    global _writer
+    with _writer_lock:
+        if _writer is not None:
+            _writer.stop()
+            atexit.unregister(_writer.stop)
+            _writer = None
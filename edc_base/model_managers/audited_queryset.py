@@ -0,0 +1,167 @@
+import uuid
+
+from django.apps import apps as django_apps
+from django.db import models
+from django_revision import RevisionField
+
+from ..audit_context import get_audit_context, get_audit_username
+from ..constants import BASE_MODEL_UPDATE_FIELDS, BASE_UUID_MODEL_UPDATE_FIELDS
+from ..model_fields import HostnameModificationField, UserField, UUIDAutoField
+from ..utils import get_utcnow
+
+
+class AuditedQuerySetError(Exception):
+    pass
+
+
+class AuditedQuerySet(models.QuerySet):
+
+    """A QuerySet whose bulk_create and bulk_update apply the
+    audit field rules of `BaseModel.save` (and the pre_save of
+    the audit fields) and, for a SiteModelMixin model, the site
+    rules of its `save` to every object before the batched query.
+
+    Set `history=True` to also write HistoricalRecords rows in
+    bulk. Note that, as with any bulk operation, save() is not
+    called and no signals are sent.
+
+    Unless the queryset has an explicit database (`using`), the
+    objects of a SiteModelMixin model are written to the database
+    of their site, as `save` does. See `SiteShardRouter`.
+
+    `bulk_create`, `bulk_update` and `update` are refused for
+    reviewers, as `save` is. See `ReviewerReplicaRouter`.
+    """
+
+    audit_update_fields = (
+        ['modified'] + BASE_MODEL_UPDATE_FIELDS + BASE_UUID_MODEL_UPDATE_FIELDS
+        + ['device_modified'])
+
+    def bulk_create(self, objs, *args, history=None, **kwargs):
+        self.check_write()
+        objs = list(objs)
+        self.update_audit_fields(objs, add=True)
+        for queryset, group in self.split_by_database(objs):
+            super(AuditedQuerySet, queryset).bulk_create(group, *args, **kwargs)
+            if history:
+                queryset.bulk_create_history(group, '+')
+        return objs
+
+    def bulk_update(self, objs, fields, *args, history=None, **kwargs):
+        self.check_write()
+        objs = list(objs)
+        self.update_audit_fields(objs, add=False)
+        changed_fields = [self.model._meta.get_field(name).name for name in fields]
+        field_names = list(changed_fields)
+        concrete_field_names = [f.name for f in self.model._meta.concrete_fields]
+        for name in self.audit_update_fields:
+            if name in concrete_field_names and name not in field_names:
+                field_names.append(name)
+        rows = []
+        for queryset, group in self.split_by_database(objs):
+            rows.append(super(AuditedQuerySet, queryset).bulk_update(
+                group, field_names, *args, **kwargs))
+            if history:
+                queryset.bulk_create_history(group, '~', changed_fields=changed_fields)
+        # Django < 4.0 returns None
+        return None if None in rows else sum(rows)
+
+    def update(self, **kwargs):
+        self.check_write()
+        return super().update(**kwargs)
+
+    def check_write(self):
+        """Raises ReviewerReplicaWriteError if writes to the
+        model are refused for reviewers.
+        """
+        from ..sites.routers import check_reviewer_write
+        check_reviewer_write(self.model)
+
+    def split_by_database(self, objs):
+        """Returns a list of (queryset, objects) with a queryset
+        for each site database of the objects, if the model has
+        per-site databases, otherwise [(self, objs)].
+        """
+        group_by_site_database = getattr(self.model, 'group_by_site_database', None)
+        groups = None if self._db or not group_by_site_database else group_by_site_database(objs)
+        if not groups or list(groups) == [None]:
+            return [(self, objs)]
+        return [(self if alias is None else self.using(alias), group)
+                for alias, group in groups.items()]
+
+    def update_audit_fields(self, objs, add=None):
+        """Sets the audit fields of each object as `save` would,
+        taking the hostname, user and device from the audit
+        context.
+        """
+        update_site = getattr(self.model, 'update_site_for_bulk_save', None)
+        if update_site:
+            update_site(objs)
+        field_names = [f.name for f in self.model._meta.concrete_fields]
+        device = 'device_created' in field_names and 'device_modified' in field_names
+        context = get_audit_context()
+        now = get_utcnow()
+        for obj in objs:
+            if device:
+                self._update_device_fields(obj, context.device_id)
+            if 'created' in field_names and not obj.pk:
+                obj.created = now
+            if 'modified' in field_names:
+                obj.modified = now
+            if 'hostname_created' in field_names:
+                obj.hostname_created = obj.hostname_created[:60]
+        self._update_pre_save_fields(objs, add, context)
+
+    def _update_pre_save_fields(self, objs, add, context):
+        """Sets the values the audit fields set in pre_save.
+        """
+        fields = self.model._meta.concrete_fields
+        username = get_audit_username() or (None if add else context.os_username)
+        for field in fields:
+            if isinstance(field, HostnameModificationField):
+                for obj in objs:
+                    setattr(obj, field.attname, context.hostname[:field.max_length])
+            elif isinstance(field, UserField) and username:
+                for obj in objs:
+                    if not getattr(obj, field.attname):
+                        setattr(obj, field.attname, username[:field.max_length])
+            elif isinstance(field, UUIDAutoField):
+                for obj in objs:
+                    if not getattr(obj, field.attname):
+                        setattr(obj, field.attname, uuid.uuid4())
+            elif isinstance(field, RevisionField):
+                for obj in objs:
+                    setattr(obj, field.attname, context.revision)
+
+    def _update_device_fields(self, obj, device_id):
+        """Sets device_created/modified and checks device
+        permissions as `DeviceModelMixin.save` does.
+        """
+        if not obj.pk:
+            obj.device_created = device_id
+        obj.device_modified = device_id
+        if getattr(obj, 'check_device_permissions', False):
+            try:
+                obj._meta.device_permissions.check(obj)
+            except AttributeError:
+                pass
+            django_apps.get_app_config('edc_device').device_permissions.check(obj)
+
+    def bulk_create_history(self, objs, history_type, changed_fields=None):
+        """Writes a historical record for each object in bulk.
+        """
+        try:
+            historical_records = self.model._meta.historical_records
+        except AttributeError:
+            raise AuditedQuerySetError(
+                f'Model has no HistoricalRecords. Got {self.model._meta.label_lower}.')
+        if any(obj.pk is None for obj in objs):
+            raise AuditedQuerySetError(
+                'Unable to write history for objects without a primary key. '
+                'bulk_create only sets an AutoField primary key on PostgreSQL.')
+        return historical_records.bulk_create_historical_records(
+            objs, history_type, using=self.db, changed_fields=changed_fields)
+
+
+class AuditedManager(models.Manager.from_queryset(AuditedQuerySet)):
+    pass
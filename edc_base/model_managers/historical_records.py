@@ -1,23 +1,116 @@
-from django.db import models
+import importlib
+import logging
+
+from django.conf import settings
+from django.db import models, router, transaction
+from django.db.models import OuterRef, Q, Subquery
 from django.db.models.fields import AutoField
 from simple_history.models import HistoricalRecords as SimpleHistoricalRecords
 
+from ..constants import DEFAULT_BASE_FIELDS
 from ..utils import get_utcnow
+from .async_history_writer import get_async_history_writer
+from .history_buffer import get_history_buffer
+
+logger = logging.getLogger('edc_base')
+
+
+def changed_field_q(field_name, indexed=None):
+    """Returns a Q for historical records of updates that changed
+    `field_name`. Requires HistoricalRecords(skip_unchanged=True).
+
+    If `indexed`, joins the changed field table of the historical
+    model, which requires HistoricalRecords(index_changed_fields=True),
+    otherwise filters column `history_changed_fields` with a LIKE.
+    """
+    if indexed:
+        return Q(history_changed_field_set__field_name=field_name)
+    return Q(history_changed_fields__contains=f',{field_name},')
+
+
+def create_changed_field_records(history_instances, using=None):
+    """Writes a row to the changed field table of the historical
+    model for each changed field of each historical record, if the
+    historical model has one.
+    """
+    objs = []
+    for history_instance in history_instances:
+        changed_field_model = getattr(history_instance, 'changed_field_model', None)
+        if changed_field_model is None:
+            continue
+        elif history_instance.pk is None:
+            logger.warning(
+                f'Unable to index the changed fields of a historical record without '
+                f'a primary key. Got {history_instance._meta.label_lower}.')
+            continue
+        objs.extend(
+            changed_field_model(history_id=history_instance.pk, field_name=field_name)
+            for field_name in history_instance.changed_field_names or [])
+    if objs:
+        objs[0].__class__.objects.using(using).bulk_create(objs)
+
 
+class SerializableQuerySet(models.QuerySet):
 
-class SerializableModelManager(models.Manager):
+    def bulk_create(self, objs, *args, **kwargs):
+        """Overridden to also write the changed field rows.
+        """
+        objs = super().bulk_create(objs, *args, **kwargs)
+        create_changed_field_records(objs, using=self.db)
+        return objs
+
+
+class SerializableModelManager(models.Manager.from_queryset(SerializableQuerySet)):
+
+    natural_key_fields = ('history_id', )
 
     def get_by_natural_key(self, history_id):
         return self.get(history_id=history_id)
 
+    def as_of_bulk(self, date, queryset=None, include_deleted=None):
+        """Returns a queryset of the latest historical record per
+        original instance at or before `date` in one query.
+
+        Limit to the instances in `queryset`, a queryset of the
+        original model, if given. Use `.iterator()` to stream and
+        `.instance` for the original model instance as of `date`.
+        """
+        pk_attname = self.model.instance_type._meta.pk.attname
+        latest = self.filter(
+            **{pk_attname: OuterRef(pk_attname)},
+            history_date__lte=date).order_by('-history_date').values('history_id')[:1]
+        history = self.filter(
+            history_date__lte=date, history_id=Subquery(latest))
+        if queryset is not None:
+            history = history.filter(**{f'{pk_attname}__in': queryset.values('pk')})
+        if not include_deleted:
+            history = history.exclude(history_type='-')
+        return history
+
 
 class SerializableModel(models.Model):
 
     objects = SerializableModelManager()
 
+    changed_field_model = None
+
+    def save(self, *args, **kwargs):
+        adding = self._state.adding
+        super().save(*args, **kwargs)
+        if adding:
+            create_changed_field_records([self], using=self._state.db)
+
     def natural_key(self):
         return (self.history_id, )
 
+    @property
+    def changed_field_names(self):
+        """Returns the list of names of the fields changed by
+        this update or None if not recorded.
+        """
+        value = getattr(self, 'history_changed_fields', None)
+        return None if value is None else [f for f in value.split(',') if f]
+
     class Meta:
         abstract = True
 
@@ -26,14 +119,89 @@ class HistoricalRecords(SimpleHistoricalRecords):
 
     """HistoricalRecords that uses a UUID primary key
     and has a natural key method.
+
+    If `buffered` (default settings.EDC_BASE_BUFFERED_HISTORY),
+    historical records created in a transaction are written in
+    bulk when it commits. See `history_buffer`.
+
+    If `asynchronous` (default settings.EDC_BASE_ASYNC_HISTORY),
+    historical records are handed to a background writer after
+    the transaction commits. See `async_history_writer`.
+
+    If `skip_unchanged`, an update that changed only audit fields
+    (`modified`, `hostname_modified`, `revision`, ...) does not
+    create a historical record and the names of the changed fields
+    are kept in column `history_changed_fields` (see `changed_field_q`).
+    If also `index_changed_fields`, they are kept in an indexed changed
+    field model per historical model as well, which needs its own
+    migration (see README). Changes are taken
+    from the instance's `changed_fields`, if tracked, otherwise from
+    comparing with the last historical record. Since that record may
+    not be written yet if buffered or asynchronous, an update of an
+    instance that does not track changes is then always recorded.
     """
 
     model_cls = SerializableModel
 
-    def __init__(self, **kwargs):
+    ignore_changed_fields = DEFAULT_BASE_FIELDS
+
+    def __init__(self, buffered=None, asynchronous=None, skip_unchanged=None,
+                 index_changed_fields=None, **kwargs):
+        self.buffered = buffered
+        self.asynchronous = asynchronous
+        self.skip_unchanged = skip_unchanged or index_changed_fields
+        self.index_changed_fields = index_changed_fields
         kwargs.update(bases=(self.model_cls, ))
         super().__init__(**kwargs)
 
+    def is_buffered(self):
+        if self.buffered is None:
+            return getattr(settings, 'EDC_BASE_BUFFERED_HISTORY', False)
+        return self.buffered
+
+    def is_asynchronous(self):
+        if self.asynchronous is None:
+            return getattr(settings, 'EDC_BASE_ASYNC_HISTORY', False)
+        return self.asynchronous
+
+    def finalize(self, sender, **kwargs):
+        """Overridden to keep a reference to this instance on
+        the model's _meta for bulk writes.
+        """
+        registered = hasattr(sender._meta, 'simple_history_manager_attribute')
+        super().finalize(sender, **kwargs)
+        if not registered and hasattr(sender._meta, 'simple_history_manager_attribute'):
+            sender._meta.historical_records = self
+
+    def create_history_model(self, model, inherited):
+        """Overridden to add the changed field model if
+        `index_changed_fields`.
+        """
+        history_model = super().create_history_model(model, inherited)
+        if self.index_changed_fields:
+            changed_field_model = self.create_changed_field_model(history_model)
+            history_model.changed_field_model = changed_field_model
+            module = importlib.import_module(changed_field_model.__module__)
+            setattr(module, changed_field_model.__name__, changed_field_model)
+        return history_model
+
+    @staticmethod
+    def create_changed_field_model(history_model):
+        """Returns a model with a row for each field changed by
+        an update, indexed on (field_name, history).
+        """
+        meta = type('Meta', (), dict(
+            app_label=history_model._meta.app_label,
+            unique_together=(('field_name', 'history'), ),
+            verbose_name=f'{history_model._meta.verbose_name} changed field'))
+        return type(f'{history_model.__name__}ChangedField', (models.Model, ), {
+            '__module__': history_model.__module__,
+            'history': models.ForeignKey(
+                history_model, on_delete=models.CASCADE,
+                related_name='history_changed_field_set'),
+            'field_name': models.CharField(max_length=100),
+            'Meta': meta})
+
     def get_history_id_field(self, model):
         """Return a field instance without initially assuming
         it should be AutoField.
@@ -55,8 +223,37 @@ class HistoricalRecords(SimpleHistoricalRecords):
         extra_fields = super().get_extra_fields(model, fields)
         extra_fields.update({'history_id': self.get_history_id_field(model)})
         extra_fields.update({'natural_key': lambda x: (x.history_id, )})
+        if self.skip_unchanged:
+            extra_fields.update({
+                'history_changed_fields': models.TextField(null=True, editable=False)})
         return extra_fields
 
+    def get_changed_fields(self, instance, attrs, using=None):
+        """Returns the set of names of the non-audit fields changed
+        by an update of `instance`, or None if unknown.
+        """
+        changed_fields = getattr(instance, 'changed_fields', None)
+        if changed_fields is None:
+            if self.is_asynchronous() or self.is_buffered():
+                # the last historical record may not be written yet
+                return None
+            manager = getattr(instance, self.manager_name)
+            last = manager.using(using).filter(
+                **{instance._meta.pk.attname: instance.pk}).order_by(
+                    '-history_date').only(*attrs).first()
+            if last is None:
+                return None
+            changed_fields = set(
+                field.name for field in instance._meta.fields
+                if getattr(last, field.attname) != attrs[field.attname])
+        return set(f for f in changed_fields if f not in self.ignore_changed_fields)
+
+    @staticmethod
+    def format_changed_fields(changed_fields):
+        if changed_fields is None:
+            return None
+        return ',{},'.format(','.join(sorted(changed_fields)))
+
     def post_save(self, instance, created, **kwargs):
         """Overridden to include \'using\'.
         """
@@ -80,7 +277,56 @@ class HistoricalRecords(SimpleHistoricalRecords):
         attrs = {}
         for field in instance._meta.fields:
             attrs[field.attname] = getattr(instance, field.attname)
-        manager.using(kwargs.get('using')).create(
-            history_date=history_date,
-            history_type=history_type,
-            history_user=history_user, **attrs)
+        if self.skip_unchanged and history_type == '~':
+            changed_fields = self.get_changed_fields(
+                instance, attrs, using=kwargs.get('using'))
+            if changed_fields == set():
+                return
+            attrs.update(history_changed_fields=self.format_changed_fields(changed_fields))
+        if self.is_asynchronous() or self.is_buffered():
+            history_instance = manager.model(
+                history_date=history_date,
+                history_type=history_type,
+                history_user=history_user, **attrs)
+            using = kwargs.get('using') or router.db_for_write(
+                manager.model, instance=instance)
+            if self.is_asynchronous():
+                transaction.on_commit(
+                    lambda: get_async_history_writer().put(history_instance, using),
+                    using=using)
+            elif not get_history_buffer(using).add(history_instance):
+                history_instance.save(force_insert=True, using=using)
+        else:
+            manager.using(kwargs.get('using')).create(
+                history_date=history_date,
+                history_type=history_type,
+                history_user=history_user, **attrs)
+
+    def bulk_create_historical_records(self, instances, history_type,
+                                       using=None, batch_size=None, changed_fields=None):
+        """Creates a historical record for each instance with
+        one bulk_create.
+
+        If `skip_unchanged`, `changed_fields` (e.g. the fields of a
+        bulk_update) are recorded for each update.
+        """
+        history_date = get_utcnow()
+        historical_records = []
+        history_model = None
+        for instance in instances:
+            manager = getattr(instance, self.manager_name)
+            history_model = manager.model
+            attrs = {}
+            for field in instance._meta.fields:
+                attrs[field.attname] = getattr(instance, field.attname)
+            if self.skip_unchanged and history_type == '~' and changed_fields:
+                attrs.update(history_changed_fields=self.format_changed_fields(
+                    f for f in changed_fields if f not in self.ignore_changed_fields))
+            historical_records.append(history_model(
+                history_date=getattr(instance, '_history_date', history_date),
+                history_type=history_type,
+                history_user=self.get_history_user(instance), **attrs))
+        if not historical_records:
+            return []
+        return history_model.objects.using(using).bulk_create(
+            historical_records, batch_size=batch_size)
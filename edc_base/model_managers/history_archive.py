@@ -0,0 +1,278 @@
+import gzip
+import json
+import logging
+import os
+import zlib
+
+from itertools import chain
+
+from django.conf import settings
+from django.core import serializers
+from django.core.exceptions import ImproperlyConfigured
+from django.db import router, transaction
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+
+from .async_history_writer import HistoryJSONEncoder
+
+ARCHIVE_SUFFIX = '.jsonl.gz'
+BLOCK_SIZE = 1024 * 1024
+
+logger = logging.getLogger('edc_base')
+
+
+class HistoryArchiveError(Exception):
+    pass
+
+
+def get_history_model(model):
+    """Returns the historical model of a model registered
+    with HistoricalRecords.
+    """
+    try:
+        manager_name = model._meta.simple_history_manager_attribute
+    except AttributeError:
+        raise HistoryArchiveError(
+            f'Model has no HistoricalRecords. Got {model._meta.label_lower}.')
+    return getattr(model, manager_name).model
+
+
+def get_archive_path(history_model, archive_dir=None):
+    archive_dir = archive_dir or getattr(settings, 'EDC_BASE_HISTORY_ARCHIVE_DIR', None)
+    if not archive_dir:
+        raise ImproperlyConfigured(
+            'History archive folder not set. See settings.EDC_BASE_HISTORY_ARCHIVE_DIR.')
+    return os.path.join(archive_dir, f'{history_model._meta.label_lower}{ARCHIVE_SUFFIX}')
+
+
+class HistoryArchiver:
+
+    """Moves historical records older than `cutoff` from the
+    database to a gzip JSON Lines archive, one file per historical
+    model.
+
+    Records are read in (history_date, primary key) order,
+    `chunk_size` at a time. Each chunk is appended to the archive as
+    a gzip member, synced to disk, read back and only then deleted
+    from the database. A member left incomplete by a failed append
+    is truncated at once or, after a crash, at the start of the next
+    run, so the archive always reads to the end and a repeated run
+    appends only what is left. Each line is keyed by the record's
+    natural key (history_id).
+
+    If not `delete`, records at or before the last record in the
+    archive are skipped, so records written later with an earlier
+    `history_date` are not archived.
+    """
+
+    def __init__(self, model, cutoff, archive_dir=None, chunk_size=None,
+                 using=None, delete=None):
+        self.history_model = get_history_model(model)
+        self.cutoff = cutoff
+        self.path = get_archive_path(self.history_model, archive_dir)
+        self.chunk_size = chunk_size or 1000
+        self.using = using or router.db_for_write(self.history_model)
+        self.delete = True if delete is None else delete
+
+    @property
+    def queryset(self):
+        return self.history_model.objects.using(self.using).filter(
+            history_date__lt=self.cutoff).order_by('history_date', 'pk')
+
+    def iter_chunks(self, after=None):
+        """Yields the records to archive, `chunk_size` at a time,
+        after `after`, a (history_date, pk) tuple, if given.
+        """
+        while True:
+            queryset = self.queryset
+            if after is not None:
+                history_date, pk = after
+                queryset = queryset.filter(
+                    Q(history_date__gt=history_date) | Q(history_date=history_date, pk__gt=pk))
+            chunk = list(queryset[:self.chunk_size])
+            if not chunk:
+                return
+            yield chunk
+            after = (chunk[-1].history_date, chunk[-1].pk)
+
+    @staticmethod
+    def serialize(history_instance):
+        data = serializers.serialize('python', [history_instance])[0]
+        data.update(natural_key=list(history_instance.natural_key()))
+        return json.dumps(data, cls=HistoryJSONEncoder)
+
+    def append(self, chunk):
+        """Appends the chunk as a gzip member and reads it back.
+
+        On any error the archive is truncated to its size before
+        the append.
+        """
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        data = b''.join(
+            self.serialize(history_instance).encode() + b'\n' for history_instance in chunk)
+        size = os.path.getsize(self.path) if os.path.exists(self.path) else 0
+        with open(self.path, 'ab') as f:
+            try:
+                with gzip.GzipFile(fileobj=f, mode='wb') as gz:
+                    gz.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+                with open(self.path, 'rb') as member:
+                    member.seek(size)
+                    if gzip.decompress(member.read()) != data:
+                        raise HistoryArchiveError(
+                            f'Archive does not read back as written. Got {self.path}.')
+            except BaseException:
+                f.truncate(size)
+                raise
+
+    def scan(self):
+        """Returns the size of the archive up to the end of its
+        last complete gzip member and the last line in it.
+
+        Reads the archive in blocks, so memory does not grow with
+        the archive.
+        """
+        size = offset = 0
+        last_line = member_last_line = None
+        pending = b''
+        decompressor = None
+        with open(self.path, 'rb') as f:
+            for block in iter(lambda: f.read(BLOCK_SIZE), b''):
+                while block:
+                    if decompressor is None:
+                        decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+                    try:
+                        lines = (pending + decompressor.decompress(block)).split(b'\n')
+                    except zlib.error:
+                        return size, last_line
+                    if len(lines) > 1:
+                        member_last_line = lines[-2]
+                    pending = lines[-1]
+                    if not decompressor.eof:
+                        offset += len(block)
+                        break
+                    offset += len(block) - len(decompressor.unused_data)
+                    block = decompressor.unused_data
+                    size, last_line = offset, member_last_line
+                    decompressor, pending = None, b''
+        return size, last_line
+
+    def repair(self):
+        """Truncates an incomplete gzip member left at the end of
+        the archive by a crash and returns the (history_date, pk) of
+        the last archived record or None.
+        """
+        if not os.path.exists(self.path):
+            return None
+        size, last_line = self.scan()
+        if size < os.path.getsize(self.path):
+            logger.warning(
+                f'Truncating an incomplete gzip member at the end of the history '
+                f'archive. Got {self.path} at {size} bytes.')
+            with open(self.path, 'r+b') as f:
+                f.truncate(size)
+                f.flush()
+                os.fsync(f.fileno())
+        if not last_line:
+            return None
+        data = json.loads(last_line)
+        return parse_datetime(data['fields']['history_date']), data['natural_key'][0]
+
+    def archive(self):
+        """Archives and deletes the records, returning the count.
+        """
+        count = 0
+        last_archived = self.repair()
+        for chunk in self.iter_chunks(after=None if self.delete else last_archived):
+            self.append(chunk)
+            if self.delete:
+                with transaction.atomic(using=self.using):
+                    self.history_model.objects.using(self.using).filter(
+                        pk__in=[obj.pk for obj in chunk]).delete()
+            count += len(chunk)
+        return count
+
+
+class HistoryArchive:
+
+    """A read-only view of the archived historical records of a model.
+
+    For example:
+
+        archive = HistoryArchive(MyModel)
+        obj = archive.as_of(report_datetime, pk=pk)
+        objs = archive.as_of(report_datetime, queryset=MyModel.history.all())
+    """
+
+    def __init__(self, model, archive_dir=None, path=None):
+        self.model = model
+        self.history_model = get_history_model(model)
+        self.path = path or get_archive_path(self.history_model, archive_dir)
+
+    def __iter__(self):
+        return self.iter_records()
+
+    def iter_records(self, pk=None):
+        """Yields unsaved historical records from the archive or,
+        if `pk`, only those of the instance with that primary key.
+
+        The archive is read one line at a time.
+        """
+        if not os.path.exists(self.path):
+            return
+        pk_name = self.model._meta.pk.name
+        with gzip.open(self.path, 'rt') as f:
+            for line in f:
+                data = json.loads(line)
+                if pk is not None and str(data['fields'].get(pk_name)) != str(pk):
+                    continue
+                data.pop('natural_key', None)
+                for obj in serializers.deserialize('python', [data]):
+                    yield obj.object
+
+    def get_by_natural_key(self, history_id):
+        for history_instance in self:
+            if str(history_instance.history_id) == str(history_id):
+                return history_instance
+        raise self.history_model.DoesNotExist(
+            f'Archived historical record not found. Got {history_id}.')
+
+    def as_of(self, date, pk=None, queryset=None):
+        """Returns the instances of the model as they were on `date`
+        or, if `pk`, one instance, as `history.as_of` does.
+
+        Archived records are combined with `queryset`, if given, e.g.
+        for dates after the archive cutoff. The archive is streamed
+        and only the latest record per instance is kept, so without
+        `pk` memory grows with the number of instances archived.
+        """
+        pk_attname = self.model._meta.pk.attname
+        latest = {}
+        records = self.iter_records(pk=pk)
+        if queryset is not None:
+            queryset = queryset.filter(history_date__lte=date)
+            if pk is not None:
+                queryset = queryset.filter(**{pk_attname: pk})
+            records = chain(records, queryset.iterator())
+        for history_instance in records:
+            key = getattr(history_instance, pk_attname)
+            if ((pk is not None and str(key) != str(pk))
+                    or history_instance.history_date > date):
+                continue
+            if (key not in latest
+                    or history_instance.history_date >= latest[key].history_date):
+                latest[key] = history_instance
+        if pk is not None:
+            try:
+                history_instance = latest[next(iter(latest))]
+            except StopIteration:
+                raise self.model.DoesNotExist(
+                    f'{self.model._meta.object_name} had not yet been created.')
+            if history_instance.history_type == '-':
+                raise self.model.DoesNotExist(
+                    f'{self.model._meta.object_name} had already been deleted.')
+            return history_instance.instance
+        return [
+            history_instance.instance for history_instance in latest.values()
+            if history_instance.history_type != '-']
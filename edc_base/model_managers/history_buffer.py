@@ -0,0 +1,113 @@
+from collections import OrderedDict
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+
+
+class HistoryBufferEntry:
+
+    """Historical records buffered for one savepoint of a
+    transaction, by history model.
+
+    Registered with `transaction.on_commit`. Django drops the
+    callback if the savepoint or the transaction is rolled back.
+    """
+
+    def __init__(self, buffer):
+        self.buffer = buffer
+        self.records = OrderedDict()
+
+    def __call__(self):
+        self.buffer.write(self)
+
+
+class HistoryBuffer:
+
+    """Buffers historical records per transaction (and savepoint)
+    of a database connection and writes them with one bulk_create
+    per history model when the transaction commits.
+
+    Records of rolled back transactions or savepoints are dropped.
+    """
+
+    def __init__(self, using):
+        self.using = using
+        self.entries = {}
+
+    @property
+    def connection(self):
+        return connections[self.using]
+
+    def add(self, history_instance):
+        """Buffers a historical record. Returns False, without
+        buffering, if not in a transaction.
+        """
+        if not self.connection.in_atomic_block:
+            return False
+        key = tuple(self.connection.savepoint_ids)
+        entry = self.entries.get(key)
+        if entry is None or not self.is_registered(entry):
+            self.discard_rolled_back()
+            entry = self.entries[key] = HistoryBufferEntry(self)
+            transaction.on_commit(entry, using=self.using)
+        entry.records.setdefault(history_instance.__class__, []).append(
+            history_instance)
+        return True
+
+    def is_registered(self, entry):
+        return any(func is entry for _, func in self.connection.run_on_commit)
+
+    def discard_rolled_back(self):
+        """Drops entries whose on_commit callback was discarded
+        by a rollback.
+        """
+        registered = [func for _, func in self.connection.run_on_commit]
+        for key, entry in list(self.entries.items()):
+            if not any(func is entry for func in registered):
+                del self.entries[key]
+
+    def write(self, entry):
+        """Writes and clears the records of an entry.
+        """
+        for history_model, history_instances in entry.records.items():
+            history_model.objects.using(self.using).bulk_create(history_instances)
+        entry.records.clear()
+        for key, value in list(self.entries.items()):
+            if value is entry:
+                del self.entries[key]
+
+    def flush(self):
+        """Writes the buffered records of the current savepoint
+        (and of savepoints released into it) now, within the current
+        transaction, if any.
+
+        Records of outer savepoints are left for the commit, since
+        writing them inside the current savepoint would lose them if
+        it rolls back.
+        """
+        self.discard_rolled_back()
+        current = tuple(self.connection.savepoint_ids)
+        for key, entry in list(self.entries.items()):
+            if key[:len(current)] == current:
+                self.write(entry)
+
+    def __len__(self):
+        return sum(len(records) for entry in self.entries.values()
+                   for records in entry.records.values())
+
+
+def get_history_buffer(using=None):
+    """Returns the HistoryBuffer of the connection (connections
+    are per thread).
+    """
+    connection = connections[using or DEFAULT_DB_ALIAS]
+    try:
+        return connection.edc_history_buffer
+    except AttributeError:
+        connection.edc_history_buffer = HistoryBuffer(
+            using or DEFAULT_DB_ALIAS)
+        return connection.edc_history_buffer
+
+
+def flush_history(using=None):
+    """Writes any buffered historical records now.
+    """
+    get_history_buffer(using).flush()
@@ -1,10 +1,13 @@
 from django.db import models
 
 from .historical_records import HistoricalRecords
+from .history_queryset import AuditedHistoryManager
 
 
 class HistoryManagerMixin(models.Model):
 
+    objects = AuditedHistoryManager()
+
     history = HistoricalRecords()
 
     class Meta:
@@ -0,0 +1,99 @@
+from django.db import models, transaction
+from django_revision import RevisionField
+
+from ..audit_context import get_audit_context, get_audit_username
+from ..model_fields import HostnameModificationField
+from ..utils import get_utcnow
+from .audited_queryset import AuditedQuerySet
+
+
+class HistoryQuerySet(AuditedQuerySet):
+
+    """An AuditedQuerySet whose update and bulk_update also write
+    the historical records of the affected rows in the same
+    transaction, if the model has HistoricalRecords.
+
+    `update` selects the primary keys of the matching rows and, in
+    batches of `history_batch_size`, updates those rows (setting the
+    audit fields not in the update) and bulk creates their historical
+    records. Pass `history=False` to skip the historical records.
+
+    As for AuditedQuerySet, bulk_create writes historical records
+    only if `history=True`, since bulk_create only sets an AutoField
+    primary key on PostgreSQL.
+    """
+
+    history_batch_size = 500
+
+    _update_history = True
+
+    def _clone(self):
+        clone = super()._clone()
+        clone._update_history = self._update_history
+        return clone
+
+    def has_history(self, history=None):
+        """Returns True if history should be written, by default
+        if the model has HistoricalRecords.
+        """
+        if history is None:
+            return hasattr(self.model._meta, 'historical_records')
+        return history
+
+    def bulk_create(self, objs, *args, history=None, **kwargs):
+        with transaction.atomic(using=self.db):
+            return super().bulk_create(objs, *args, history=history, **kwargs)
+
+    def bulk_update(self, objs, fields, *args, history=None, **kwargs):
+        # QuerySet.bulk_update calls update(), which should not
+        # also write the historical records.
+        queryset = self._chain()
+        queryset._update_history = False
+        with transaction.atomic(using=self.db):
+            return super(HistoryQuerySet, queryset).bulk_update(
+                objs, fields, *args, history=self.has_history(history), **kwargs)
+
+    def update(self, history=None, **kwargs):
+        if not self.has_history(history) or not self._update_history:
+            return super().update(**kwargs)
+        self.check_write()
+        changed_fields = [self.model._meta.get_field(name).name for name in kwargs]
+        kwargs.update(self.get_audit_update_kwargs(kwargs))
+        base_queryset = self.model._base_manager.using(self.db)
+        rows = 0
+        with transaction.atomic(using=self.db):
+            pks = list(self.values_list('pk', flat=True))
+            for index in range(0, len(pks), self.history_batch_size):
+                batch = pks[index:index + self.history_batch_size]
+                rows += base_queryset.filter(pk__in=batch).update(**kwargs)
+                self.bulk_create_history(
+                    list(base_queryset.filter(pk__in=batch)), '~',
+                    changed_fields=changed_fields)
+        return rows
+
+    def get_audit_update_kwargs(self, kwargs):
+        """Returns the values of the audit fields `save` would set
+        on update that are not in `kwargs`.
+        """
+        context = get_audit_context()
+        values = {}
+        for field in self.model._meta.concrete_fields:
+            if field.name in kwargs or field.attname in kwargs:
+                continue
+            elif field.name == 'modified':
+                values.update(modified=get_utcnow())
+            elif field.name == 'user_modified':
+                username = get_audit_username() or context.os_username
+                if username:
+                    values.update(user_modified=username[:field.max_length])
+            elif field.name == 'device_modified':
+                values.update(device_modified=context.device_id)
+            elif isinstance(field, HostnameModificationField):
+                values.update({field.attname: context.hostname[:field.max_length]})
+            elif isinstance(field, RevisionField):
+                values.update({field.attname: context.revision})
+        return values
+
+
+class AuditedHistoryManager(models.Manager.from_queryset(HistoryQuerySet)):
+    pass
@@ -3,5 +3,7 @@ from django.db import models
 
 class ListModelManager(models.Manager):
 
+    natural_key_fields = ('short_name', )
+
     def get_by_natural_key(self, short_name):
         return self.get(short_name=short_name)
@@ -1,11 +1,13 @@
 import socket
 
 from django.db import models
-from django_revision import RevisionField
 
-from ..constants import BASE_MODEL_UPDATE_FIELDS
-from ..model_fields import HostnameModificationField, UserField
+from ..constants import BASE_MODEL_UPDATE_FIELDS, DEFAULT_BASE_FIELDS
+from ..model_fields import HostnameCreationField, HostnameModificationField
+from ..model_fields import RevisionField, UserField
+from ..model_managers import AuditedManager
 from ..utils import get_utcnow
+from . import ordering_indexes  # noqa (connects class_prepared)
 from .url_mixin import UrlMixin
 
 
@@ -13,10 +15,25 @@ class BaseModel(UrlMixin, models.Model):
 
     """Base model class for all models. Adds created and modified'
     values for user, date and hostname (computer).
+
+    Set `track_changed_fields = True` on a model to snapshot field
+    values when an instance is loaded from the database. save() then
+    updates only the changed fields (plus the audit fields) and
+    does not write at all if nothing changed. See `changed_fields`.
+
+    Concrete subclasses get indexes for the default ordering,
+    get_latest_by and (site, -modified) unless they set
+    `add_ordering_indexes = False`. See `ordering_indexes`.
     """
 
     get_latest_by = 'modified'
 
+    track_changed_fields = False
+
+    add_ordering_indexes = True
+
+    _loaded_values = None
+
     created = models.DateTimeField(
         blank=True,
         default=get_utcnow)
@@ -37,7 +54,7 @@ class BaseModel(UrlMixin, models.Model):
         verbose_name='user modified',
         help_text='Updated by admin.save_model')
 
-    hostname_created = models.CharField(
+    hostname_created = HostnameCreationField(
         max_length=60,
         blank=True,
         default=socket.gethostname,
@@ -51,13 +68,86 @@ class BaseModel(UrlMixin, models.Model):
     revision = RevisionField(
         help_text="System field. Git repository tag:branch:commit.")
 
-    objects = models.Manager()
+    objects = AuditedManager()
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        if cls.track_changed_fields:
+            instance.snapshot_field_values()
+        return instance
+
+    def refresh_from_db(self, using=None, fields=None):
+        super().refresh_from_db(using=using, fields=fields)
+        if self.track_changed_fields:
+            # a partial refresh, e.g. loading a deferred field, keeps
+            # the snapshot (and unsaved changes) of the other fields
+            self.snapshot_field_values(update_fields=fields)
+
+    def snapshot_field_values(self, update_fields=None):
+        """Keeps the current values of the loaded (not deferred)
+        concrete fields, or only of `update_fields`, to compare
+        against in `changed_fields`.
+        """
+        values = {
+            field.attname: self.__dict__[field.attname]
+            for field in self._meta.concrete_fields
+            if field.attname in self.__dict__
+            and (not update_fields or field.name in update_fields
+                 or field.attname in update_fields)}
+        if update_fields and self._loaded_values is not None:
+            self._loaded_values.update(values)
+        else:
+            self._loaded_values = values
+
+    @property
+    def changed_fields(self):
+        """Returns the set of names of the fields changed since
+        the instance was loaded or last saved, or None if changes
+        are not tracked for this instance.
+        """
+        if self._loaded_values is None:
+            return None
+        changed_fields = set()
+        for field in self._meta.concrete_fields:
+            if field.attname not in self.__dict__:
+                continue
+            try:
+                loaded_value = self._loaded_values[field.attname]
+            except KeyError:
+                changed_fields.add(field.name)
+            else:
+                if self.__dict__[field.attname] != loaded_value:
+                    changed_fields.add(field.name)
+        return changed_fields
+
+    def get_changed_update_fields(self, *args, **kwargs):
+        """Returns update_fields for the changed fields, an empty
+        list if only audit fields changed or None to save all fields.
+        """
+        if (self._loaded_values is None or args or kwargs.get('update_fields')
+                or kwargs.get('force_insert') or self._state.adding):
+            return None
+        changed_fields = self.changed_fields
+        if self._meta.pk.name in changed_fields:
+            return None
+        audit_fields = [
+            f.name for f in self._meta.concrete_fields
+            if f.name in DEFAULT_BASE_FIELDS and not f.primary_key]
+        changed_fields = [f for f in changed_fields if f not in audit_fields]
+        return changed_fields + audit_fields if changed_fields else []
 
     def save(self, *args, **kwargs):
+        if self.track_changed_fields:
+            update_fields = self.get_changed_update_fields(*args, **kwargs)
+            if update_fields == []:
+                return
+            elif update_fields:
+                kwargs.update(update_fields=update_fields)
         try:
             # don't allow update_fields to bypass these audit fields
             update_fields = kwargs.get(
-                'update_fields', None) + BASE_MODEL_UPDATE_FIELDS
+                'update_fields', None) + ['modified'] + BASE_MODEL_UPDATE_FIELDS
             kwargs.update({'update_fields': update_fields})
         except TypeError:
             pass
@@ -67,6 +157,8 @@ class BaseModel(UrlMixin, models.Model):
         self.hostname_created = self.hostname_created[:60]
         self.hostname_modified = self.hostname_modified[:50]
         super().save(*args, **kwargs)
+        if self.track_changed_fields:
+            self.snapshot_field_values(kwargs.get('update_fields'))
 
     @property
     def verbose_name(self):
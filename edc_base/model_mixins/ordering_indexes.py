@@ -0,0 +1,64 @@
+from django.db.models import Index
+from django.db.models.constants import LOOKUP_SEP
+from django.db.models.signals import class_prepared
+
+
+def get_ordering_index_fields(model):
+    """Returns a list of index field lists, e.g. ['-modified', '-created'],
+    that cover the default ordering, get_latest_by and, for models
+    with a site, (site, -modified).
+
+    Orderings on expressions, related fields or '?' are skipped.
+    """
+    opts = model._meta
+    field_names = [f.name for f in opts.concrete_fields]
+    index_fields = []
+    ordering = [f for f in opts.ordering or [] if isinstance(f, str)]
+    if ordering and len(ordering) == len(opts.ordering or []) and all(
+            _is_concrete(name, field_names) for name in ordering):
+        index_fields.append(list(ordering))
+    latest_by = opts.get_latest_by
+    if isinstance(latest_by, str) and _is_concrete(latest_by, field_names):
+        latest_by = latest_by if latest_by.startswith('-') else f'-{latest_by}'
+        if not any(fields[0].lstrip('-') == latest_by.lstrip('-')
+                   for fields in index_fields):
+            index_fields.append([latest_by])
+    if 'site' in field_names and 'modified' in field_names:
+        index_fields.append(['site', '-modified'])
+    return index_fields
+
+
+def _is_concrete(name, field_names):
+    name = name.lstrip('-')
+    return LOOKUP_SEP not in name and name != '?' and name in field_names
+
+
+def get_missing_ordering_index_fields(model):
+    """Returns the index field lists from `get_ordering_index_fields`
+    that are not in the model's Meta.indexes.
+    """
+    declared = [list(index.fields) for index in model._meta.indexes]
+    return [fields for fields in get_ordering_index_fields(model)
+            if fields not in declared]
+
+
+def add_ordering_indexes(sender, **kwargs):
+    """Adds indexes for the default ordering to concrete models
+    that set `add_ordering_indexes = True`, as BaseModel does.
+
+    Connected to class_prepared.
+    """
+    opts = sender._meta
+    if (not getattr(sender, 'add_ordering_indexes', False)
+            or opts.abstract or opts.proxy or not opts.managed):
+        return
+    indexes = []
+    for fields in get_missing_ordering_index_fields(sender):
+        index = Index(fields=fields)
+        index.set_name_with_model(sender)
+        indexes.append(index)
+    if indexes:
+        opts.indexes = list(opts.indexes) + indexes
+
+
+class_prepared.connect(add_ordering_indexes)
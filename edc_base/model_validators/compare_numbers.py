@@ -1,4 +1,5 @@
 from django.core.exceptions import ValidationError, ImproperlyConfigured
+from django.db.models import Q
 
 
 class CompareNumbersValidator():
@@ -6,6 +7,7 @@ class CompareNumbersValidator():
 
     default_comparision_operator = None
     default_message = 'Expected value to be \'{}{}\'. Got {}.'
+    lookups = {'<': 'lt', '<=': 'lte', '>': 'gt', '>=': 'gte'}
 
     def __init__(self, comparision_value, comparision_operator=None, message=None):
         self.comparision_operator = comparision_operator or self.default_comparision_operator
@@ -39,3 +41,12 @@ class CompareNumbersValidator():
                     raise ValidationError(message)
             except TypeError as e:
                 raise TypeError('Expected to compare numbers. {}'.format(e))
+
+    def get_q(self, field_name):
+        """Returns a Q object that selects rows where the value
+        of `field_name` passes this validator.
+        """
+        if self.comparision_operator == '!=':
+            return ~Q(**{field_name: self.comparision_value})
+        lookup = self.lookups.get(self.comparision_operator)
+        return Q(**{f'{field_name}__{lookup}': self.comparision_value})
@@ -1,26 +1,70 @@
 from datetime import date
 from dateutil.relativedelta import relativedelta
+from django.core.exceptions import ValidationError
+from django.db.models import Q
 
+from ..model_functions import AgeInYears
 from .compare_numbers import CompareNumbersValidator
 
 
-class MinConsentAgeValidator(CompareNumbersValidator):
+class ConsentAgeQuerysetMixin:
+
+    """Adds queryset filters equivalent to calling the validator
+    on the date of birth of each row.
+
+    Age is calculated in the database as of `reference`, a date,
+    datetime, field name or expression (default today). Rows
+    where the date of birth is after the reference or null are
+    never valid, as a date of birth in the future is not valid
+    when calling the validator.
+    """
+
+    @staticmethod
+    def check_dob(dob):
+        if dob > date.today():
+            raise ValidationError(f'Date of birth cannot be a future date. Got {dob}')
+
+    def annotate(self, queryset, field_name=None, reference=None):
+        field_name = field_name or 'dob'
+        return queryset.annotate(**{
+            f'{field_name}_age_in_years': AgeInYears(
+                field_name, reference=reference or date.today(), timezone='UTC')})
+
+    def filter_queryset(self, queryset, field_name=None, reference=None):
+        """Returns the queryset of rows that pass this validator.
+        """
+        field_name = field_name or 'dob'
+        return self.annotate(queryset, field_name, reference).filter(
+            self.get_q(f'{field_name}_age_in_years'))
+
+    def exclude_queryset(self, queryset, field_name=None, reference=None):
+        """Returns the queryset of rows that fail this validator.
+        """
+        field_name = field_name or 'dob'
+        return self.annotate(queryset, field_name, reference).filter(
+            Q(**{f'{field_name}_age_in_years__isnull': True})
+            | ~self.get_q(f'{field_name}_age_in_years'))
+
+
+class MinConsentAgeValidator(ConsentAgeQuerysetMixin, CompareNumbersValidator):
 
     default_comparision_operator = '>='
     default_message = 'The minimum age of consent is {}{} years. Got {}'
 
     def __call__(self, dob):
+        self.check_dob(dob)
         rdelta = relativedelta(date.today(), dob)
         return CompareNumbersValidator(
             self.comparision_value, self.comparision_operator).__call__(rdelta.years)
 
 
-class MaxConsentAgeValidator(CompareNumbersValidator):
+class MaxConsentAgeValidator(ConsentAgeQuerysetMixin, CompareNumbersValidator):
 
     default_comparision_operator = '<='
     default_message = 'The maximum age of consent is {}{} years. Got {}'
 
     def __call__(self, dob):
+        self.check_dob(dob)
         rdelta = relativedelta(date.today(), dob)
         return CompareNumbersValidator(
             self.comparision_value, self.comparision_operator).__call__(rdelta.years)
@@ -0,0 +1,182 @@
+import json
+
+from django.apps import apps as django_apps
+from django.core import serializers
+from django.core.exceptions import ObjectDoesNotExist
+from django.db import router, transaction
+
+from .model_managers.async_history_writer import HistoryJSONEncoder
+
+
+class NaturalKeyStreamError(Exception):
+    pass
+
+
+def get_natural_key_fields(model):
+    """Returns the names of the fields of the natural key of `model`
+    as declared by its default manager's `natural_key_fields`.
+    """
+    natural_key_fields = getattr(model._default_manager, 'natural_key_fields', None)
+    if not natural_key_fields:
+        raise NaturalKeyStreamError(
+            f'Model manager does not declare natural_key_fields. '
+            f'Got {model._meta.label_lower}.')
+    return tuple(natural_key_fields)
+
+
+def export_natural_keys(model, fp, chunk_size=None, using=None):
+    """Writes the rows of `model` to `fp` as JSON Lines keyed by
+    natural key, reading `chunk_size` rows at a time. Returns the
+    number of rows written.
+
+    Foreign keys are written as natural keys, if the related model
+    has one, and the primary key is left out unless it is part of
+    the natural key.
+    """
+    get_natural_key_fields(model)
+    chunk_size = chunk_size or 2000
+    using = using or router.db_for_read(model)
+    foreign_keys = [
+        field.name for field in model._meta.concrete_fields if field.many_to_one]
+    queryset = model._default_manager.using(using).select_related(
+        *foreign_keys).order_by('pk')
+    count = 0
+    lines = []
+    for obj in queryset.iterator(chunk_size=chunk_size):
+        data = serializers.serialize(
+            'python', [obj], use_natural_foreign_keys=True,
+            use_natural_primary_keys=True)[0]
+        data.pop('pk', None)
+        data.update(natural_key=list(obj.natural_key()))
+        lines.append(json.dumps(data, cls=HistoryJSONEncoder))
+        if len(lines) == chunk_size:
+            fp.write('\n'.join(lines) + '\n')
+            count += len(lines)
+            lines = []
+    if lines:
+        fp.write('\n'.join(lines) + '\n')
+        count += len(lines)
+    return count
+
+
+class NaturalKeyImporter:
+
+    """Inserts rows written by `export_natural_keys` in batches.
+
+    For each batch of `batch_size` rows of a model, existing natural
+    keys are found with one `__in` query and skipped, foreign keys are
+    resolved with one `__in` query per related model (or once per
+    distinct key if the related manager does not declare
+    `natural_key_fields`) and the new rows are inserted with one
+    bulk_create, so the number of queries grows with the number of
+    batches, not rows.
+    """
+
+    def __init__(self, batch_size=None, using=None):
+        self.batch_size = batch_size or 1000
+        self.using = using
+        self.inserted = 0
+        self.skipped = 0
+        self._related_cache = {}
+
+    def load(self, lines):
+        """Loads JSON lines from an iterable, e.g. a file.
+        """
+        batch = []
+        for line in lines:
+            if not line.strip():
+                continue
+            batch.append(json.loads(line))
+            if len(batch) == self.batch_size:
+                self.load_batch(batch)
+                batch = []
+        if batch:
+            self.load_batch(batch)
+        return self.inserted
+
+    def load_batch(self, records):
+        by_model = {}
+        for record in records:
+            by_model.setdefault(record['model'], []).append(record)
+        for label, model_records in by_model.items():
+            model = django_apps.get_model(label)
+            using = self.using or router.db_for_write(model)
+            with transaction.atomic(using=using):
+                self.insert(model, model_records, using)
+
+    def insert(self, model, records, using):
+        natural_key_fields = get_natural_key_fields(model)
+        if len(natural_key_fields) != 1:
+            raise NaturalKeyStreamError(
+                f'Expected a natural key of one field. Got {natural_key_fields} '
+                f'for {model._meta.label_lower}.')
+        key_field = model._meta.get_field(natural_key_fields[0])
+        keys = {str(key_field.to_python(r['natural_key'][0])): r for r in records}
+        existing = set(
+            str(value) for value in model._default_manager.using(using).filter(
+                **{f'{key_field.name}__in': list(keys)}).values_list(key_field.name, flat=True))
+        records = [record for key, record in keys.items() if key not in existing]
+        self.skipped += len(keys) - len(records)
+        related = self.resolve_foreign_keys(model, records, using)
+        objs = []
+        for record in records:
+            attrs = {key_field.attname: key_field.to_python(record['natural_key'][0])}
+            for name, value in record['fields'].items():
+                field = model._meta.get_field(name)
+                if field.many_to_many:
+                    if value:
+                        raise NaturalKeyStreamError(
+                            f'Many to many fields are not supported. Got {name}.')
+                elif field.many_to_one:
+                    attrs[field.attname] = related[name].get(self.to_key(value))
+                else:
+                    attrs[field.attname] = field.to_python(value)
+            objs.append(model(**attrs))
+        model._base_manager.using(using).bulk_create(objs, batch_size=self.batch_size)
+        self.inserted += len(objs)
+
+    @staticmethod
+    def to_key(value):
+        return tuple(value) if isinstance(value, list) else value
+
+    def resolve_foreign_keys(self, model, records, using):
+        """Returns a dict of {field name: {natural key or pk: pk}}.
+        """
+        related = {}
+        for field in model._meta.concrete_fields:
+            if not field.many_to_one:
+                continue
+            values = set(
+                self.to_key(r['fields'].get(field.name)) for r in records
+                if r['fields'].get(field.name) is not None)
+            related[field.name] = self.resolve_related(field.related_model, values, using)
+        return related
+
+    def resolve_related(self, related_model, values, using):
+        keys = [value for value in values if isinstance(value, tuple)]
+        resolved = {value: value for value in values if not isinstance(value, tuple)}
+        if not keys:
+            return resolved
+        manager = related_model._default_manager.db_manager(using)
+        natural_key_fields = getattr(manager, 'natural_key_fields', None)
+        if natural_key_fields and len(natural_key_fields) == 1:
+            field_name = natural_key_fields[0]
+            keys_by_value = {str(key[0]): key for key in keys}
+            for key_value, pk in manager.filter(
+                    **{f'{field_name}__in': list(keys_by_value)}).values_list(
+                        field_name, 'pk'):
+                resolved[keys_by_value[str(key_value)]] = pk
+        else:
+            cache = self._related_cache.setdefault(related_model, {})
+            for key in keys:
+                if key not in cache:
+                    try:
+                        cache[key] = manager.get_by_natural_key(*key).pk
+                    except ObjectDoesNotExist:
+                        continue
+                resolved[key] = cache[key]
+        missing = [key for key in keys if key not in resolved]
+        if missing:
+            raise NaturalKeyStreamError(
+                f'Related {related_model._meta.label_lower} not found. Got {missing[:5]}.')
+        return resolved
@@ -0,0 +1,133 @@
+import secrets
+import threading
+
+from django.apps import apps as django_apps
+
+from .utils import safe_allowed_chars
+
+
+class RandomIdentifierError(Exception):
+    pass
+
+
+class RandomIdentifierGenerator:
+
+    """Generates random identifiers in bulk from an alphabet
+    (default `safe_allowed_chars`, as `get_safe_random_string`)
+    using `secrets`.
+
+    Random bytes are drawn in pools of `pool_size` and mapped to
+    the alphabet with `bytes.translate`. Bytes beyond the largest
+    multiple of the alphabet length are discarded so that each
+    character is equally likely.
+
+    If `model` and `field_name` are given, identifiers are checked
+    against the field with one `__in` query per batch and those
+    already in use are replaced.
+
+    For example:
+
+        generator = RandomIdentifierGenerator(
+            model='edc_label.label', field_name='identifier', length=8)
+        identifiers = generator.generate(5000)
+    """
+
+    default_length = 12
+    default_pool_size = 4096
+    default_batch_size = 500
+    max_attempts = 10
+
+    def __init__(self, model=None, field_name=None, length=None, allowed_chars=None,
+                 pool_size=None, batch_size=None):
+        self._model_cls = None
+        self.model = model
+        self.field_name = field_name
+        if model and not field_name:
+            raise RandomIdentifierError(
+                f'Expected a field name for model {model}. Got None.')
+        self.length = length or self.default_length
+        self.allowed_chars = allowed_chars or safe_allowed_chars
+        if len(set(self.allowed_chars)) != len(self.allowed_chars):
+            raise RandomIdentifierError(
+                f'Expected unique allowed characters. Got {self.allowed_chars}.')
+        self.pool_size = pool_size or self.default_pool_size
+        self.batch_size = batch_size or self.default_batch_size
+        alphabet = self.allowed_chars.encode('latin-1')
+        accepted = 256 - 256 % len(alphabet)
+        self._table = bytes(alphabet[i % len(alphabet)] for i in range(256))
+        self._delete = bytes(range(accepted, 256))
+        self._pool = ''
+        self._lock = threading.Lock()
+
+    @property
+    def model_cls(self):
+        if not self._model_cls and self.model:
+            if isinstance(self.model, str):
+                self._model_cls = django_apps.get_model(self.model)
+            else:
+                self._model_cls = self.model
+        return self._model_cls
+
+    def refill(self, size=None):
+        """Adds at least `size` (default `pool_size`) random
+        characters to the pool.
+        """
+        size = size or self.pool_size
+        chars = []
+        needed = size
+        while needed > 0:
+            data = secrets.token_bytes(needed + needed // 8 + 16).translate(
+                self._table, self._delete)
+            chars.append(data.decode('latin-1'))
+            needed -= len(data)
+        self._pool += ''.join(chars)
+
+    def random_strings(self, count):
+        """Returns a list of `count` random strings from the pool,
+        not checked for uniqueness.
+        """
+        size = count * self.length
+        with self._lock:
+            if len(self._pool) < size:
+                self.refill(max(self.pool_size, size - len(self._pool)))
+            chars, self._pool = self._pool[:size], self._pool[size:]
+        length = self.length
+        return [chars[i:i + length] for i in range(0, size, length)]
+
+    def generate(self, count):
+        """Returns a list of `count` unique identifiers not yet
+        used in the model field, if any.
+        """
+        identifiers = []
+        seen = set()
+        for _ in range(self.max_attempts):
+            needed = count - len(identifiers)
+            if not needed:
+                break
+            candidates = [
+                candidate for candidate in dict.fromkeys(self.random_strings(needed))
+                if candidate not in seen]
+            for index in range(0, len(candidates), self.batch_size):
+                batch = candidates[index:index + self.batch_size]
+                existing = self.get_existing(batch)
+                for candidate in batch:
+                    if candidate not in existing:
+                        seen.add(candidate)
+                        identifiers.append(candidate)
+        if len(identifiers) < count:
+            raise RandomIdentifierError(
+                f'Unable to generate {count} unique identifiers of length '
+                f'{self.length} after {self.max_attempts} attempts. '
+                f'Got {len(identifiers)}.')
+        return identifiers
+
+    def get_existing(self, candidates):
+        """Returns the set of candidates already used in the model
+        field with one query.
+        """
+        if not self.model_cls:
+            return set()
+        return set(
+            self.model_cls.objects.filter(
+                **{f'{self.field_name}__in': candidates}).values_list(
+                    self.field_name, flat=True))
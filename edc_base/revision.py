@@ -0,0 +1,114 @@
+import json
+import os
+
+from django.conf import settings
+from django_revision.revision import site_revision, DummyRepo
+
+REVISION_MANIFEST_FILENAME = 'revision.json'
+
+REVISION_MAX_LENGTH = 75
+
+_resolved = None
+
+
+class RevisionError(Exception):
+    pass
+
+
+def get_revision_manifest_path():
+    """Returns the path of the revision manifest,
+    settings.REVISION_MANIFEST or `revision.json` in
+    settings.GIT_DIR (or BASE_DIR).
+    """
+    try:
+        return settings.REVISION_MANIFEST
+    except AttributeError:
+        try:
+            folder = settings.GIT_DIR
+        except AttributeError:
+            folder = settings.BASE_DIR
+        return os.path.join(folder, REVISION_MANIFEST_FILENAME)
+
+
+def get_git_revision():
+    """Returns the revision of the git checkout at settings.GIT_DIR
+    as found by `django_revision` when it was imported, or None.
+    """
+    if isinstance(site_revision.repo, DummyRepo) or site_revision.invalid:
+        return None
+    return site_revision.revision or None
+
+
+def read_revision_manifest(path=None):
+    """Returns the revision in the manifest file or None if
+    there is no manifest.
+    """
+    path = path or get_revision_manifest_path()
+    try:
+        with open(path) as f:
+            manifest = json.load(f)
+    except FileNotFoundError:
+        return None
+    except ValueError as e:
+        raise RevisionError(f'Invalid revision manifest. Got {path}. {e}')
+    return manifest.get('revision') or None
+
+
+def write_revision_manifest(path=None):
+    """Writes the revision of the git checkout to the manifest file
+    and returns the path.
+
+    Run at build time, e.g. `manage.py write_revision_manifest`,
+    for deployments without a git checkout.
+    """
+    revision = get_git_revision()
+    if not revision:
+        raise RevisionError(
+            f'Unable to write a revision manifest. No git checkout found. '
+            f'Got GIT_DIR={site_revision.working_dir}.')
+    path = path or get_revision_manifest_path()
+    manifest = dict(
+        revision=revision,
+        tag=site_revision.tag or None,
+        branch=site_revision.branch,
+        commit=site_revision.commit)
+    with open(path, 'w') as f:
+        json.dump(manifest, f, indent=2)
+        f.write('\n')
+    return path
+
+
+def resolve_revision():
+    """Returns a tuple of (revision, source) from, in order,
+    settings.REVISION, the git checkout or the manifest file.
+    """
+    revision = getattr(settings, 'REVISION', None)
+    if revision:
+        return revision[:REVISION_MAX_LENGTH], 'settings.REVISION'
+    revision = get_git_revision()
+    if revision:
+        return revision[:REVISION_MAX_LENGTH], 'git'
+    revision = read_revision_manifest()
+    if revision:
+        return revision[:REVISION_MAX_LENGTH], get_revision_manifest_path()
+    return '', None
+
+
+def get_revision():
+    """Returns the revision, resolved on first use (at startup
+    in AppConfig.ready) and cached for the life of the process.
+    """
+    global _resolved
+    if _resolved is None:
+        _resolved = resolve_revision()
+    return _resolved[0]
+
+
+def get_revision_source():
+    get_revision()
+    return _resolved[1]
+
+
+def clear_revision_cache():
+    global _resolved
+    _resolved = None
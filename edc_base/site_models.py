@@ -1,7 +1,11 @@
-import copy
+import json
+import os
 import sys
+import time
 
 from django.apps import apps as django_apps
+from django.conf import settings
+from django.db.models import prefetch_related_objects
 from django.utils.module_loading import import_module, module_has_submodule
 
 
@@ -25,6 +29,28 @@ class SiteModels:
     def __init__(self):
         self.registry = {}
         self.loaded = False
+        self._journal = None
+
+    @property
+    def registry(self):
+        return self._registry
+
+    @registry.setter
+    def registry(self, registry):
+        """Sets the registry and rebuilds the app_label index.
+        """
+        self._registry = registry
+        self._app_labels = {}
+        for model in registry:
+            self._app_labels.setdefault(model.split('.')[0], set()).add(model)
+        self._site_models = {}
+
+    def _add(self, model, wrapper_cls):
+        if self._journal is not None:
+            self._journal.append(model)
+        self._registry.update({model: wrapper_cls})
+        self._app_labels.setdefault(model.split('.')[0], set()).add(model)
+        self._site_models = {}
 
     def register(self, models=None, wrapper_cls=None):
         """Registers with app_label.modelname, SyncModel.
@@ -33,11 +59,10 @@ class SiteModels:
         for model in models:
             model = model.lower()
             if model not in self.registry:
-                self.registry.update({model: wrapper_cls or self.wrapper_cls})
+                self._add(model, wrapper_cls or self.wrapper_cls)
                 if self.register_historical:
                     historical_model = '.historical'.join(model.split('.'))
-                    self.registry.update(
-                        {historical_model: wrapper_cls or self.wrapper_cls})
+                    self._add(historical_model, wrapper_cls or self.wrapper_cls)
             else:
                 raise SiteModelAlreadyRegistered(
                     f'Model is already registered. Got {model}.')
@@ -56,48 +81,205 @@ class SiteModels:
                 models.append(model._meta.label_lower)
         self.register(models)
 
+    def get_wrapper_cls(self, model):
+        """Returns the wrapper class for a registered model, or None.
+        """
+        try:
+            wrapper_cls = self.registry[model._meta.label_lower]
+        except KeyError:
+            raise SiteModelNotRegistered(
+                f'{repr(model)} is not registered with {self}.')
+        return wrapper_cls or self.wrapper_cls
+
     def get_wrapped_instance(self, instance=None):
         """Returns a wrapped model instance.
         """
         if instance._meta.label_lower not in self.registry:
             raise SiteModelNotRegistered(
                 f'{repr(instance)} is not registered with {self}.')
-        wrapper_cls = self.registry.get(
-            instance._meta.label_lower) or self.wrapper_cls
+        wrapper_cls = self.get_wrapper_cls(instance)
         if wrapper_cls:
             return wrapper_cls(instance)
         return instance
 
+    def get_wrapped_queryset(self, queryset, chunk_size=None):
+        """Returns a generator of a wrapped model instance for each
+        row of the queryset.
+
+        The wrapper class is resolved once. Rows are read with
+        `iterator()`, `chunk_size` at a time, after applying the
+        wrapper class's `select_related_fields`. Its
+        `prefetch_related_lookups` are prefetched per chunk.
+        """
+        chunk_size = chunk_size or 2000
+        wrapper_cls = self.get_wrapper_cls(queryset.model)
+        select_related = getattr(wrapper_cls, 'select_related_fields', None)
+        prefetch_related = getattr(wrapper_cls, 'prefetch_related_lookups', None)
+        if select_related:
+            queryset = queryset.select_related(*select_related)
+        return self._iter_wrapped(queryset, chunk_size, wrapper_cls, prefetch_related)
+
+    def _iter_wrapped(self, queryset, chunk_size, wrapper_cls, prefetch_related):
+        chunk = []
+        for obj in queryset.iterator(chunk_size=chunk_size):
+            chunk.append(obj)
+            if len(chunk) == chunk_size:
+                yield from self._wrap_chunk(chunk, wrapper_cls, prefetch_related)
+                chunk = []
+        if chunk:
+            yield from self._wrap_chunk(chunk, wrapper_cls, prefetch_related)
+
+    @staticmethod
+    def _wrap_chunk(chunk, wrapper_cls, prefetch_related):
+        if prefetch_related:
+            prefetch_related_objects(chunk, *prefetch_related)
+        for obj in chunk:
+            yield wrapper_cls(obj) if wrapper_cls else obj
+
     def site_models(self, app_label=None):
         """Returns a dictionary of registered models.
+
+        The sorted model lists are kept per app_label until the
+        next registration.
+        """
+        if app_label is not None:
+            model_list = self._get_site_models(app_label)
+            if not model_list:
+                return {}
+            return {django_apps.get_app_config(app_label).name: list(model_list)}
+        try:
+            site_models = self._site_models[None]
+        except KeyError:
+            site_models = []
+            for app_config in django_apps.get_app_configs():
+                if app_config.label in self._app_labels:
+                    model_list = self._get_site_models(app_config.label)
+                    if model_list:
+                        site_models.append((app_config.name, model_list))
+            self._site_models[None] = site_models
+        return {name: list(model_list) for name, model_list in site_models}
+
+    def _get_site_models(self, app_label):
+        """Returns the sorted list of registered models for
+        app_label from the cache, if possible.
         """
-        site_models = {}
-        app_configs = (django_apps.get_app_configs()
-                       if app_label is None else [django_apps.get_app_config(app_label)])
-        for app_config in app_configs:
+        try:
+            return self._site_models[app_label]
+        except KeyError:
+            app_config = django_apps.get_app_config(app_label)
+            registered = self._app_labels.get(app_label, set())
             model_list = [model for model in app_config.get_models()
-                          if model._meta.label_lower in self.registry]
-            if model_list:
-                model_list.sort(key=lambda m: m._meta.verbose_name)
-                site_models.update({app_config.name: model_list})
-        return site_models
+                          if model._meta.label_lower in registered]
+            model_list.sort(key=lambda m: m._meta.verbose_name)
+            self._site_models[app_label] = model_list
+            return model_list
 
-    def autodiscover(self, module_name=None):
+    def autodiscover(self, module_name=None, manifest_path=None):
+        """Imports `module_name` from each app, if it exists,
+        to register models.
+
+        Models registered by a module that fails to import are
+        removed using a journal of the registrations.
+
+        If `manifest_path` (default settings.EDC_BASE_AUTODISCOVER_MANIFEST)
+        is set, which apps have `module_name` is kept in a JSON file
+        and apps known not to have it are skipped on later calls.
+        """
         module_name = module_name or self.module_name
+        manifest_path = manifest_path or getattr(
+            settings, 'EDC_BASE_AUTODISCOVER_MANIFEST', None)
+        manifest = AutodiscoverManifest(manifest_path, module_name) if manifest_path else None
         sys.stdout.write(' * checking for models to register ...\n')
         for app in django_apps.app_configs:
+            if manifest and manifest.skip(app):
+                continue
             try:
                 mod = import_module(app)
-                try:
-                    before_import_registry = copy.deepcopy(self.registry)
-                    import_module(f'{app}.{module_name}')
-                    sys.stdout.write(
-                        f' * registered models from \'{app}\'.\n')
-                except Exception as e:
-                    if f'No module named \'{app}.{module_name}\'' not in str(e):
-                        raise
-                    self.registry = before_import_registry
-                    if module_has_submodule(mod, module_name):
-                        raise
             except ImportError:
-                pass
+                if manifest:
+                    manifest.discard(app)
+                continue
+            has_module = module_has_submodule(mod, module_name)
+            if manifest:
+                manifest.update(app, mod, has_module)
+            if has_module:
+                self._import(app, module_name)
+        if manifest:
+            manifest.save()
+
+    def _import(self, app, module_name):
+        start = time.perf_counter()
+        self._journal = []
+        try:
+            import_module(f'{app}.{module_name}')
+        except Exception:
+            for model in self._journal:
+                del self._registry[model]
+                self._app_labels[model.split('.')[0]].discard(model)
+            self._site_models = {}
+            raise
+        finally:
+            self._journal = None
+        sys.stdout.write(
+            f' * registered models from \'{app}\' '
+            f'({(time.perf_counter() - start) * 1000:.1f}ms).\n')
+
+
+class AutodiscoverManifest:
+
+    """A JSON file of which apps have `module_name`.
+
+    An app is skipped if it did not have `module_name` when last
+    checked and its package folder has not been modified since.
+    Apps that could not be imported are not kept, so they are
+    checked again on the next call.
+    """
+
+    def __init__(self, path, module_name):
+        self.path = path
+        self.module_name = module_name
+        self.changed = False
+        try:
+            with open(path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            data = {}
+        if data.get('module_name') != module_name:
+            data = {}
+        self.apps = data.get('apps', {})
+
+    @staticmethod
+    def get_mtime(mod):
+        try:
+            return os.stat(list(mod.__path__)[0]).st_mtime
+        except (AttributeError, IndexError, OSError):
+            return None
+
+    def skip(self, app):
+        try:
+            entry = self.apps[app]
+        except KeyError:
+            return False
+        if entry['mtime'] is None or entry['has_module']:
+            return False
+        try:
+            return self.get_mtime(sys.modules[app]) == entry['mtime']
+        except KeyError:
+            return False
+
+    def update(self, app, mod, has_module=None):
+        entry = {'mtime': self.get_mtime(mod), 'has_module': bool(has_module)}
+        if self.apps.get(app) != entry:
+            self.apps[app] = entry
+            self.changed = True
+
+    def discard(self, app):
+        if self.apps.pop(app, None) is not None:
+            self.changed = True
+
+    def save(self):
+        if self.changed:
+            with open(self.path, 'w') as f:
+                json.dump({'module_name': self.module_name, 'apps': self.apps},
+                          f, indent=2, sort_keys=True)
+            self.changed = False
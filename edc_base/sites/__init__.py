@@ -1,6 +1,7 @@
 from .admin import ModelAdminSiteMixin
 from .forms import SiteModelFormMixin
 from .managers import CurrentSiteManager
+from .site_context import SiteContext, get_site_context, site_context
 from .site_model_mixin import SiteModelMixin
 from .view_mixins import SiteQuerysetViewMixin
 
@@ -1,5 +1,7 @@
 from django.conf import settings
 
+from .site_context import get_site_context
+
 
 class ReviewerSiteSaveError(Exception):
     pass
@@ -9,10 +11,6 @@ class ModelAdminSiteMixin:
 
     def save_model(self, request, obj, form, change):
         if 'django.contrib.sites' in settings.INSTALLED_APPS:
-            try:
-                REVIEWER_SITE_ID = settings.REVIEWER_SITE_ID
-            except AttributeError:
-                REVIEWER_SITE_ID = 0
-            if int(request.site.id) == int(REVIEWER_SITE_ID):
+            if get_site_context(request).is_reviewer:
                 raise ReviewerSiteSaveError('Reviewers may not update data.')
         super().save_model(request, obj, form, change)
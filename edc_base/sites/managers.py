@@ -1,18 +1,21 @@
 from django.db import models
 from django.contrib.sites.managers import CurrentSiteManager as BaseCurrentSiteManager
-from django.conf import settings
+
+from .shards import fan_out
+from .site_context import get_current_site_id, is_reviewer_site
 
 
 class CurrentSiteManager(BaseCurrentSiteManager):
 
     def get_queryset(self):
-        try:
-            REVIEWER_SITE_ID = settings.REVIEWER_SITE_ID
-        except AttributeError:
-            REVIEWER_SITE_ID = 0
-        if int(settings.SITE_ID) == int(REVIEWER_SITE_ID):
-            queryset = models.Manager.get_queryset(self)
-        else:
-            return super().get_queryset().filter(
-                **{self._get_field_name() + '__id': settings.SITE_ID})
-        return queryset
+        queryset = models.Manager.get_queryset(self)
+        if is_reviewer_site():
+            return queryset
+        return queryset.filter(
+            **{self._get_field_name() + '__id': get_current_site_id()})
+
+    def fan_out(self, chunk_size=None):
+        """Returns a generator of the rows of all sites from the
+        site databases. See `SiteShardRouter`.
+        """
+        return fan_out(models.Manager.get_queryset(self), chunk_size=chunk_size)
@@ -0,0 +1,122 @@
+import logging
+import sys
+import time
+
+from django.conf import settings
+from django.db import DatabaseError, connections, router
+from django.db.models.signals import pre_delete, pre_save
+
+from .site_context import is_reviewer_site
+
+logger = logging.getLogger('edc_base')
+
+
+class ReviewerReplicaWriteError(Exception):
+    pass
+
+
+class ReviewerReplicaRouter:
+
+    """A database router that, when running as the reviewer site
+    (SITE_ID == REVIEWER_SITE_ID or a reviewer site context), sends
+    reads and writes to a read replica, which rejects any write,
+    and refuses saves, deletes and the bulk writes of
+    `AuditedQuerySet` (see `check_write`). The pre_save and
+    pre_delete receivers are connected when the router is loaded.
+
+    Asking for the write database (e.g. the transaction of an admin
+    change form) is allowed, so reviewers can still view forms.
+
+    Models of the apps or models in `writable_models` (sessions,
+    auth, ...) are left to the default routing so that reviewers
+    can log in.
+
+    If the replica cannot be connected to, reads fall back to the
+    default routing. The replica is tried again after
+    `retry_seconds`.
+
+    For example, in settings:
+
+        DATABASE_ROUTERS = ['edc_base.sites.routers.ReviewerReplicaRouter']
+        EDC_BASE_REVIEWER_REPLICA_DB = 'replica'
+    """
+
+    default_replica_db = 'replica'
+    default_writable_models = [
+        'admin', 'auth', 'contenttypes', 'sessions', 'sites', 'edc_base.userprofile']
+    retry_seconds = 30
+
+    def __init__(self):
+        self._unavailable_since = None
+        pre_save.connect(
+            reviewer_replica_on_pre_write, weak=False,
+            dispatch_uid='edc_base_reviewer_replica_on_pre_save')
+        pre_delete.connect(
+            reviewer_replica_on_pre_write, weak=False,
+            dispatch_uid='edc_base_reviewer_replica_on_pre_delete')
+
+    @property
+    def replica_db(self):
+        return getattr(settings, 'EDC_BASE_REVIEWER_REPLICA_DB', self.default_replica_db)
+
+    @property
+    def writable_models(self):
+        return getattr(
+            settings, 'EDC_BASE_REVIEWER_WRITABLE_MODELS', self.default_writable_models)
+
+    def is_routed(self, model):
+        writable_models = self.writable_models
+        return (model._meta.app_label not in writable_models
+                and model._meta.label_lower not in writable_models
+                and is_reviewer_site())
+
+    def replica_available(self):
+        if self.replica_db not in connections.databases:
+            return False
+        if (self._unavailable_since is not None
+                and time.monotonic() - self._unavailable_since < self.retry_seconds):
+            return False
+        try:
+            connections[self.replica_db].ensure_connection()
+        except DatabaseError as e:
+            logger.warning(
+                f'Reviewer replica database {self.replica_db} unavailable. '
+                f'Reading from the default database. Got {e}')
+            self._unavailable_since = time.monotonic()
+            return False
+        self._unavailable_since = None
+        return True
+
+    def db_for_read(self, model, **hints):
+        if self.is_routed(model) and self.replica_available():
+            return self.replica_db
+        return None
+
+    def db_for_write(self, model, **hints):
+        return self.db_for_read(model, **hints)
+
+    def check_write(self, model):
+        if self.is_routed(model) and 'migrate' not in sys.argv:
+            raise ReviewerReplicaWriteError(
+                f'Reviewers may not update data. Got {model._meta.label_lower}.')
+
+    def allow_relation(self, obj1, obj2, **hints):
+        if self.replica_db in [obj1._state.db, obj2._state.db]:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return None
+
+
+def check_reviewer_write(model):
+    """Raises ReviewerReplicaWriteError if a configured
+    ReviewerReplicaRouter refuses writes to `model`.
+    """
+    for db_router in router.routers:
+        if isinstance(db_router, ReviewerReplicaRouter):
+            db_router.check_write(model)
+
+
+def reviewer_replica_on_pre_write(sender, **kwargs):
+    check_reviewer_write(sender)
@@ -0,0 +1,183 @@
+import heapq
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from django.db import connections
+from django.db.models.constants import LOOKUP_SEP
+
+from .site_context import get_current_site_id, is_reviewer_site
+
+
+class SiteShardError(Exception):
+    pass
+
+
+def get_site_databases():
+    """Returns settings.EDC_BASE_SITE_DATABASES, a dict of
+    {site_id: database alias}, with int keys.
+    """
+    return {int(site_id): alias for site_id, alias in getattr(
+        settings, 'EDC_BASE_SITE_DATABASES', {}).items()}
+
+
+def get_site_database(site_id):
+    """Returns the database alias for `site_id` or None.
+    """
+    if site_id is None:
+        return None
+    return get_site_databases().get(int(site_id))
+
+
+def is_site_model(model):
+    """Returns True if the model has a `site` foreign key to
+    sites.Site, e.g. a SiteModelMixin model or its historical model.
+    """
+    try:
+        return model._meta.edc_base_is_site_model
+    except AttributeError:
+        is_site = any(
+            field.name == 'site' and field.many_to_one
+            and field.related_model._meta.label_lower == 'sites.site'
+            for field in model._meta.concrete_fields)
+        model._meta.edc_base_is_site_model = is_site
+        return is_site
+
+
+def refers_to_site_model(model):
+    """Returns True if the model has a foreign key to a site model.
+    """
+    return any(
+        field.is_relation and (field.many_to_one or field.one_to_one)
+        and field.related_model is not None and is_site_model(field.related_model)
+        for field in model._meta.concrete_fields)
+
+
+class SiteShardRouter:
+
+    """A database router that keeps the rows of site models in a
+    database per site (settings.EDC_BASE_SITE_DATABASES).
+
+    Rows are written to the database of their `site_id`. Reads go
+    to the database of the current site (settings.SITE_ID or the
+    site context). Since no one database has the rows of every site,
+    reads by the reviewer site raise SiteShardError; use `fan_out`
+    (e.g. `CurrentSiteManager.fan_out`) to query every site database
+    or list a router for an aggregate database (e.g. the
+    ReviewerReplicaRouter) before this one.
+
+    For example, in settings:
+
+        DATABASE_ROUTERS = ['edc_base.sites.shards.SiteShardRouter']
+        EDC_BASE_SITE_DATABASES = {10: 'mochudi', 20: 'molepolole'}
+
+    Other models stay in the default database. Each site database
+    needs the Site rows and any other rows its site models refer to.
+    See the `migrate_site_shards` management command. Relations
+    between databases are refused, except to rows of models that
+    neither are nor refer to site models (e.g. Site), which are
+    copied to each site database. Models with a foreign key to a
+    site model should themselves be site models (see the
+    edc_base.W003 system check).
+    """
+
+    def get_database(self, model, hints, for_read=None):
+        if not is_site_model(model):
+            return None
+        instance = hints.get('instance')
+        if instance is not None and isinstance(instance, model):
+            alias = get_site_database(getattr(instance, 'site_id', None))
+            if alias is not None:
+                return alias
+        if is_reviewer_site():
+            if for_read and get_site_databases():
+                raise SiteShardError(
+                    f'The reviewer site reads from all site databases. Use fan_out(). '
+                    f'Got {model._meta.label_lower}.')
+            return None
+        return get_site_database(get_current_site_id())
+
+    def db_for_read(self, model, **hints):
+        return self.get_database(model, hints, for_read=True)
+
+    def db_for_write(self, model, **hints):
+        return self.get_database(model, hints)
+
+    def allow_relation(self, obj1, obj2, **hints):
+        aliases = set(get_site_databases().values())
+        if obj1._state.db not in aliases and obj2._state.db not in aliases:
+            return None
+        elif obj1._state.db == obj2._state.db:
+            return True
+        elif obj1._state.db in aliases and obj2._state.db in aliases:
+            return False
+        shared = obj2 if obj1._state.db in aliases else obj1
+        return not (is_site_model(shared._meta.model)
+                    or refers_to_site_model(shared._meta.model))
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return None
+
+
+def get_ordering_key(queryset, nulls_largest=None):
+    """Returns a (key function, reverse) for merging rows of
+    `queryset` from several databases, or None if unordered or
+    not orderable by field values.
+
+    NULLs sort first in ascending order or, if `nulls_largest`
+    (e.g. PostgreSQL), last.
+    """
+    ordering = list(queryset.query.order_by or (
+        queryset.query.default_ordering and queryset.model._meta.ordering or []))
+    if not ordering:
+        return None
+    names = []
+    directions = set()
+    for field_name in ordering:
+        if not isinstance(field_name, str) or LOOKUP_SEP in field_name or field_name == '?':
+            return None
+        directions.add(field_name.startswith('-'))
+        names.append(field_name.lstrip('-'))
+    if len(directions) > 1:
+        return None
+    opts = queryset.model._meta
+    try:
+        names = [opts.pk.attname if name == 'pk' else opts.get_field(name).attname
+                 for name in names]
+    except FieldDoesNotExist:
+        return None
+
+    def key(obj):
+        values = (getattr(obj, name) for name in names)
+        return tuple(
+            ((value is None) == bool(nulls_largest), value) for value in values)
+    return key, directions.pop()
+
+
+def fan_out(queryset, aliases=None, chunk_size=None):
+    """Yields the rows of `queryset` from each site database
+    (default all in settings.EDC_BASE_SITE_DATABASES).
+
+    If the queryset is ordered by fields all in the same direction,
+    rows are merged in that order, otherwise they are yielded one
+    database after the other.
+    """
+    aliases = aliases or sorted(set(get_site_databases().values()))
+    if not aliases:
+        raise SiteShardError('No site databases. See settings.EDC_BASE_SITE_DATABASES.')
+    chunk_size = chunk_size or 2000
+    iterators = [queryset.using(alias).iterator(chunk_size=chunk_size) for alias in aliases]
+    ordering = get_ordering_key(
+        queryset, nulls_largest=connections[aliases[0]].features.nulls_order_largest)
+    if ordering is None:
+        for iterator in iterators:
+            yield from iterator
+    else:
+        key, reverse = ordering
+        yield from heapq.merge(*iterators, key=key, reverse=reverse)
+
+
+def fan_out_count(queryset, aliases=None):
+    """Returns the count of `queryset` over the site databases.
+    """
+    aliases = aliases or sorted(set(get_site_databases().values()))
+    return sum(queryset.using(alias).count() for alias in aliases)
@@ -0,0 +1,129 @@
+from collections import namedtuple
+from contextlib import contextmanager
+from contextvars import ContextVar
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+
+SiteContext = namedtuple('SiteContext', 'site site_id reviewer_site_id is_reviewer')
+
+_site_context = ContextVar('edc_base_site_context', default=None)
+
+_process_site_context = None
+
+_reviewer_site_id = None
+
+
+def get_reviewer_site_id():
+    """Returns settings.REVIEWER_SITE_ID as an int (default 0).
+    """
+    global _reviewer_site_id
+    if _reviewer_site_id is None:
+        _reviewer_site_id = int(getattr(settings, 'REVIEWER_SITE_ID', 0))
+    return _reviewer_site_id
+
+
+def get_current_site_id():
+    """Returns the site id of the current site context, if set,
+    or settings.SITE_ID, without a query.
+    """
+    context = _site_context.get()
+    if context is not None:
+        return int(context.site_id)
+    return int(getattr(settings, 'SITE_ID', 0) or 0)
+
+
+def is_reviewer_site():
+    """Returns True if the site of the current site context, if set,
+    or settings.SITE_ID is the reviewer site, without a query.
+
+    False if neither is set.
+    """
+    context = _site_context.get()
+    if context is not None:
+        return context.is_reviewer
+    elif getattr(settings, 'SITE_ID', None) is None:
+        return False
+    return get_current_site_id() == get_reviewer_site_id()
+
+
+def make_site_context(site):
+    reviewer_site_id = get_reviewer_site_id()
+    return SiteContext(
+        site=site,
+        site_id=site.id,
+        reviewer_site_id=reviewer_site_id,
+        is_reviewer=int(site.id) == reviewer_site_id)
+
+
+def get_process_site_context():
+    """Returns the SiteContext of the current site
+    (`Site.objects.get_current()`), looked up on first use only.
+    """
+    global _process_site_context
+    if _process_site_context is None:
+        from django.contrib.sites.models import Site
+        _process_site_context = make_site_context(Site.objects.get_current())
+    return _process_site_context
+
+
+def get_site_context(request=None):
+    """Returns the SiteContext of `request.site`, if `request`,
+    or the one set for this request or task, if any, or the one
+    of this process.
+    """
+    site = getattr(request, 'site', None)
+    if site is not None:
+        context = getattr(request, '_site_context', None)
+        if context is None or context.site is not site:
+            context = request._site_context = make_site_context(site)
+        return context
+    return _site_context.get() or get_process_site_context()
+
+
+def set_site_context(site):
+    """Sets the SiteContext for `site` and returns a token
+    for `reset_site_context`.
+    """
+    return _site_context.set(make_site_context(site))
+
+
+def reset_site_context(token):
+    _site_context.reset(token)
+
+
+@contextmanager
+def site_context(site):
+    """A context manager that sets the site context for the
+    duration of the block.
+
+        with site_context(site):
+            obj.save()
+    """
+    token = set_site_context(site)
+    try:
+        yield get_site_context()
+    finally:
+        reset_site_context(token)
+
+
+def clear_site_context():
+    global _process_site_context, _reviewer_site_id
+    _process_site_context = None
+    _reviewer_site_id = None
+
+
+@receiver(post_save, sender='sites.Site', weak=False,
+          dispatch_uid='edc_base_site_context_on_post_save')
+@receiver(post_delete, sender='sites.Site', weak=False,
+          dispatch_uid='edc_base_site_context_on_post_delete')
+def site_context_on_site_change(sender, **kwargs):
+    clear_site_context()
+
+
+@receiver(setting_changed, weak=False, dispatch_uid='edc_base_site_context_on_setting_changed')
+def site_context_on_setting_changed(setting, **kwargs):
+    if setting in ['SITE_ID', 'REVIEWER_SITE_ID']:
+        clear_site_context()
@@ -1,9 +1,10 @@
 import sys
 
 from django.contrib.sites.models import Site
-from django.core.exceptions import ObjectDoesNotExist
-from django.db import models
-from django.conf import settings
+from django.db import models, router
+
+from .shards import get_site_database, get_site_databases
+from .site_context import get_site_context
 
 
 class SiteModelError(Exception):
@@ -15,23 +16,51 @@ class SiteModelMixin(models.Model):
     site = models.ForeignKey(
         Site, on_delete=models.PROTECT, null=True, editable=False)
 
-    def save(self, *args, **kwargs):
-        site = Site.objects.get_current()
-        try:
-            REVIEWER_SITE_ID = settings.REVIEWER_SITE_ID
-        except AttributeError:
-            REVIEWER_SITE_ID = 0
-        if (int(site.id) == int(REVIEWER_SITE_ID)
-                and 'migrate' not in sys.argv):
+    @staticmethod
+    def check_site_context():
+        """Returns the SiteContext or raises if adding and
+        updating data is disabled for the current site.
+        """
+        context = get_site_context()
+        if context.is_reviewer and 'migrate' not in sys.argv:
             raise SiteModelError(
                 'Adding and updating data has been disabled. '
-                f'See Site configuration. Got {site.name}.')
-        else:
-            try:
-                if not self.site:
-                    self.site = Site.objects.get_current()
-            except ObjectDoesNotExist:
-                self.site = Site.objects.get_current()
+                f'See Site configuration. Got {context.site.name}.')
+        return context
+
+    @classmethod
+    def update_site_for_bulk_save(cls, objs):
+        """Checks the site context once and sets the site of
+        each object that has none, as `save` would.
+        """
+        context = cls.check_site_context()
+        for obj in objs:
+            if obj.site_id is None:
+                obj.site = context.site
+
+    @classmethod
+    def group_by_site_database(cls, objs):
+        """Returns a dict of {database alias or None: objects} of the
+        site databases of the objects, or None if there are none.
+        See `SiteShardRouter`.
+        """
+        if not get_site_databases():
+            return None
+        groups = {}
+        for obj in objs:
+            groups.setdefault(get_site_database(obj.site_id), []).append(obj)
+        return groups
+
+    def save(self, *args, **kwargs):
+        context = self.check_site_context()
+        if self.site_id is None:
+            self.site = context.site
+        # with per-site databases, rows are saved to their site's database
+        # unless saved to another database than the current site's
+        site_database = get_site_database(self.site_id)
+        using = kwargs.get('using')
+        if site_database and (using is None or using == router.db_for_write(self.__class__)):
+            kwargs.update(using=site_database)
         super().save(*args, **kwargs)
 
     class Meta:
@@ -1,22 +1,56 @@
 import sys
 
-from django.core.exceptions import ObjectDoesNotExist
+from collections import namedtuple
+from django.db import transaction
 
+from .site_context import clear_site_context
 
-def add_or_update_django_sites(apps=None, sites=None, fqdn=None):
+SitesDiff = namedtuple('SitesDiff', 'added updated deleted')
+
+
+def add_or_update_django_sites(apps=None, sites=None, fqdn=None, delete_unknown=None):
+    """Adds or updates the django Site rows for `sites`, a sequence of
+    (site_id, site_name, ...), in one transaction and returns a
+    SitesDiff of the site ids added, updated and deleted.
+
+    Existing sites are read with one query, missing sites are bulk
+    created and changed sites bulk updated, so nothing is written
+    if nothing changed. Sites not in `sites` are deleted if
+    `delete_unknown`, otherwise only the 'example.com' site is.
+    """
     Site = apps.get_model('sites', 'Site')
-    Site.objects.filter(name='example.com').delete()
-    for site_id, site_name, _ in sites:
-        try:
-            site_obj = Site.objects.get(pk=site_id)
-        except ObjectDoesNotExist:
-            Site.objects.create(
-                pk=site_id,
-                name=site_name,
-                domain=f'{site_name}.{fqdn}')
-        else:
-            site_obj.name = site_name
-            site_obj.domain = f'{site_name}.{fqdn}'
-            site_obj.save()
-    sys.stdout.write(f'Updated sites for {fqdn}.\n')
+    wanted = {
+        int(site_id): (site_name, f'{site_name}.{fqdn}') for site_id, site_name, _ in sites}
+    with transaction.atomic(using=Site.objects.db):
+        existing = {site.pk: site for site in Site.objects.all()}
+        added = [
+            Site(pk=site_id, name=name, domain=domain)
+            for site_id, (name, domain) in wanted.items() if site_id not in existing]
+        updated = []
+        for site_id, (name, domain) in wanted.items():
+            site = existing.get(site_id)
+            if site and (site.name, site.domain) != (name, domain):
+                site.name, site.domain = name, domain
+                updated.append(site)
+        deleted = [
+            site.pk for site in existing.values() if site.pk not in wanted
+            and (delete_unknown or site.name == 'example.com')]
+        if deleted:
+            Site.objects.filter(pk__in=deleted).delete()
+        if added:
+            Site.objects.bulk_create(added)
+        if updated:
+            Site.objects.bulk_update(updated, ['name', 'domain'])
+    diff = SitesDiff(
+        added=sorted(site.pk for site in added),
+        updated=sorted(site.pk for site in updated),
+        deleted=sorted(deleted))
+    if added or updated or deleted:
+        from django.contrib.sites.models import SITE_CACHE
+        SITE_CACHE.clear()
+        clear_site_context()
+    sys.stdout.write(
+        f'Updated sites for {fqdn}. Added {diff.added or "none"}, '
+        f'updated {diff.updated or "none"}, deleted {diff.deleted or "none"}.\n')
     sys.stdout.flush()
+    return diff
@@ -1,19 +1,16 @@
-from django.conf import settings
+from .site_context import get_site_context
 
 
 class SiteQuerysetViewMixin:
 
     def get_queryset_filter_options(self, request, *args, **kwargs):
         options = super().get_queryset_filter_options(request, *args, **kwargs)
-        try:
-            REVIEWER_SITE_ID = settings.REVIEWER_SITE_ID
-        except AttributeError:
-            REVIEWER_SITE_ID = 0
-        if int(request.site.id) == int(REVIEWER_SITE_ID):
+        context = get_site_context(request)
+        if context.is_reviewer:
             try:
                 options.pop('site')
             except KeyError:
                 pass
         else:
-            options.update(site=request.site)
+            options.update(site=context.site)
         return options
@@ -44,3 +44,101 @@ def edc_base_check(app_configs, **kwargs):
                     f'Folder does not exist. Got {settings.STATIC_ROOT}',
                     id=f'settings.STATIC_ROOT'))
     return errors
+
+
+def _get_ordering_index_models(app_configs):
+    from django.apps import apps as django_apps
+    if app_configs is None:
+        models = django_apps.get_models()
+    else:
+        models = [model for app_config in app_configs
+                  for model in app_config.get_models()]
+    return [model for model in models
+            if hasattr(model, 'add_ordering_indexes')
+            and model._meta.managed and not model._meta.proxy]
+
+
+def ordering_index_check(app_configs, **kwargs):
+    """Warns for BaseModel models without indexes for their default
+    ordering, get_latest_by or (site, -modified).
+    """
+    from .model_mixins.ordering_indexes import get_missing_ordering_index_fields
+    errors = []
+    for model in _get_ordering_index_models(app_configs):
+        for fields in get_missing_ordering_index_fields(model):
+            errors.append(
+                Warning(
+                    f'Model has no index for its default ordering. '
+                    f'Expected an index on {fields}. Got {model._meta.label_lower}.',
+                    hint='Declare the index in Meta.indexes or remove '
+                         'add_ordering_indexes = False.',
+                    obj=model, id='edc_base.W001'))
+    return errors
+
+
+def ordering_index_database_check(app_configs, databases=None, **kwargs):
+    """Warns for declared ordering indexes that are not in the
+    database, e.g. if migrations have not been made or applied.
+
+    Runs with `manage.py check --tag database` (Django < 3.1, on
+    the default database) or `manage.py check --database default`
+    (Django >= 3.1, on the given databases).
+    """
+    import django
+    from django.db import DEFAULT_DB_ALIAS, connections, router
+    from .model_mixins.ordering_indexes import get_ordering_index_fields
+    if databases is None and django.VERSION < (3, 1):
+        # Django < 3.1 does not pass `databases`
+        databases = [DEFAULT_DB_ALIAS]
+    errors = []
+    for alias in databases or []:
+        connection = connections[alias]
+        tables = connection.introspection.table_names()
+        with connection.cursor() as cursor:
+            for model in _get_ordering_index_models(app_configs):
+                if (model._meta.db_table not in tables
+                        or not router.allow_migrate_model(alias, model)):
+                    continue
+                constraints = connection.introspection.get_constraints(
+                    cursor, model._meta.db_table)
+                names = [name for name, constraint in constraints.items()
+                         if constraint['index']]
+                for index in model._meta.indexes:
+                    if (list(index.fields) in get_ordering_index_fields(model)
+                            and index.name not in names):
+                        errors.append(
+                            Warning(
+                                f'Ordering index {index.name} is missing from the '
+                                f'database {alias}. Got {model._meta.label_lower}.',
+                                hint='Run makemigrations and migrate.',
+                                obj=model, id='edc_base.W002'))
+    return errors
+
+
+def site_database_relation_check(app_configs, **kwargs):
+    """Warns for models that are not site models but have a foreign
+    key to a site model if settings.EDC_BASE_SITE_DATABASES is set,
+    since their rows stay in the default database while the rows
+    they refer to are in the site databases.
+    """
+    from django.apps import apps as django_apps
+    from .sites.shards import get_site_databases, is_site_model, refers_to_site_model
+    errors = []
+    if not get_site_databases():
+        return errors
+    if app_configs is None:
+        models = django_apps.get_models()
+    else:
+        models = [model for app_config in app_configs
+                  for model in app_config.get_models()]
+    for model in models:
+        if not is_site_model(model) and refers_to_site_model(model):
+            errors.append(
+                Warning(
+                    f'Model has a foreign key to a site model but is not a site model. '
+                    f'Its rows stay in the default database while the rows it refers to '
+                    f'are in the site databases. Got {model._meta.label_lower}.',
+                    hint='Add SiteModelMixin to the model or unset '
+                         'EDC_BASE_SITE_DATABASES.',
+                    obj=model, id='edc_base.W003'))
+    return errors
@@ -0,0 +1,5 @@
+from .test_site_models import autodiscover_site_models
+
+autodiscover_site_models.register(['edc_base.testagemodel'])
+
+raise ValueError('Failed to import autodiscover_fail')
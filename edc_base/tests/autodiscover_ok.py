@@ -0,0 +1,3 @@
+from .test_site_models import autodiscover_site_models
+
+autodiscover_site_models.register(['edc_base.testmodel'])
@@ -2,8 +2,9 @@ __all__ = ['TestModel', 'TestValidatorModel']
 
 from django.db import models
 
-from ..model_mixins import BaseUuidModel
-from ..sites import SiteModelMixin
+from ..model_managers import HistoricalRecords, HistoryManagerMixin
+from ..model_mixins import BaseUuidModel, ListModelMixin
+from ..sites import CurrentSiteManager, SiteModelMixin
 from ..model_validators import CompareNumbersValidator
 
 
@@ -31,3 +32,113 @@ class TestValidatorModel(models.Model):
 class TestModelWithSite(SiteModelMixin, BaseUuidModel):
 
     f1 = models.CharField(max_length=10, default='1')
+
+    on_site = CurrentSiteManager()
+
+
+class TestModelWithSiteRelated(BaseUuidModel):
+
+    site_model = models.ForeignKey(TestModelWithSite, on_delete=models.CASCADE)
+
+
+class TestAgeModel(BaseUuidModel):
+
+    dob = models.DateField(null=True)
+    consent_datetime = models.DateTimeField(null=True)
+
+
+class TestModelWithHistory(BaseUuidModel):
+
+    f1 = models.CharField(max_length=10, null=True)
+
+    history = HistoricalRecords()
+
+
+class TestModelWithChanges(BaseUuidModel):
+
+    f1 = models.CharField(max_length=10, null=True)
+    f2 = models.CharField(max_length=10, null=True)
+    f3 = models.IntegerField(null=True)
+
+    track_changed_fields = True
+
+    history = HistoricalRecords()
+
+
+class TestModelWithBufferedHistory(BaseUuidModel):
+
+    f1 = models.CharField(max_length=10, null=True)
+
+    history = HistoricalRecords(buffered=True)
+
+
+class TestModelWithAsyncHistory(BaseUuidModel):
+
+    f1 = models.CharField(max_length=10, null=True)
+
+    history = HistoricalRecords(asynchronous=True)
+
+
+class TestModelWithDiffedHistory(BaseUuidModel):
+
+    f1 = models.CharField(max_length=10, null=True)
+    f2 = models.CharField(max_length=10, null=True)
+
+    history = HistoricalRecords(skip_unchanged=True)
+
+
+class TestModelWithIndexedDiffedHistory(BaseUuidModel):
+
+    f1 = models.CharField(max_length=10, null=True)
+    f2 = models.CharField(max_length=10, null=True)
+
+    history = HistoricalRecords(index_changed_fields=True)
+
+
+class TestModelWithBufferedDiffedHistory(BaseUuidModel):
+
+    f1 = models.CharField(max_length=10, null=True)
+
+    history = HistoricalRecords(buffered=True, skip_unchanged=True)
+
+
+class TestModelWithTrackedDiffedHistory(BaseUuidModel):
+
+    f1 = models.CharField(max_length=10, null=True)
+    f2 = models.CharField(max_length=10, null=True)
+
+    track_changed_fields = True
+
+    history = HistoricalRecords(skip_unchanged=True)
+
+
+class TestModelWithHistoryManager(HistoryManagerMixin, BaseUuidModel):
+
+    f1 = models.CharField(max_length=10, null=True)
+    f2 = models.IntegerField(default=0)
+
+    history = HistoricalRecords()
+
+
+class TestPlainModelWithHistoryManager(HistoryManagerMixin, models.Model):
+
+    f1 = models.CharField(max_length=10, null=True)
+
+    history = HistoricalRecords()
+
+
+class TestModelWithHistoryManagerOnly(HistoryManagerMixin, BaseUuidModel):
+
+    f1 = models.CharField(max_length=10, null=True)
+
+
+class TestListModel(ListModelMixin, BaseUuidModel):
+
+    pass
+
+
+class TestModelWithListModel(BaseUuidModel):
+
+    list_item = models.ForeignKey(TestListModel, on_delete=models.PROTECT, null=True)
+
+    history = HistoricalRecords()
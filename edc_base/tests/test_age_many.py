@@ -0,0 +1,83 @@
+import pytz
+
+from datetime import datetime, date
+from dateutil import tz
+from dateutil.relativedelta import relativedelta
+from unittest import skipIf
+
+from django.test import TestCase
+
+from ..age_many import age_many, np
+from ..utils import age
+
+
+@skipIf(np is None, 'numpy not installed')
+class TestAgeMany(TestCase):
+
+    def assert_matches_age(self, born_seq, reference_seq, timezone=None):
+        ages = age_many(born_seq, reference_seq, timezone=timezone)
+        for index, (born, reference_dt) in enumerate(zip(born_seq, reference_seq)):
+            rdelta = age(born, reference_dt, timezone)
+            self.assertFalse(ages.mask[index])
+            self.assertEqual(
+                (ages.years[index], ages.months[index], ages.days[index]),
+                (rdelta.years, rdelta.months, rdelta.days),
+                msg=f'born={born}, reference_dt={reference_dt}')
+
+    def test_dates_and_datetimes(self):
+        born_seq = [
+            date(1990, 5, 1),
+            pytz.utc.localize(datetime(1990, 5, 1)),
+            date(2016, 10, 28),
+            datetime(2000, 1, 31, 23, 59),
+            date(2016, 2, 29),
+            datetime(1990, 5, 1, 0, 0, tzinfo=tz.gettz('Africa/Gaborone'))]
+        reference_seq = [
+            pytz.utc.localize(datetime(2000, 5, 1)),
+            date(2000, 5, 1),
+            pytz.utc.localize(datetime(2016, 12, 12)),
+            datetime(2000, 3, 1),
+            date(2017, 2, 28),
+            datetime(1990, 5, 1, 0, 0, tzinfo=tz.gettz('UTC'))]
+        self.assert_matches_age(born_seq, reference_seq)
+
+    def test_month_end_and_leap_day(self):
+        born_seq = [date(2016, 2, 29), date(2016, 1, 31), date(2015, 12, 31)]
+        reference_seq = [
+            pytz.utc.localize(datetime(2017, 2, 28)),
+            pytz.utc.localize(datetime(2016, 2, 29)),
+            pytz.utc.localize(datetime(2016, 2, 28, 23, 59))]
+        self.assert_matches_age(born_seq, reference_seq)
+
+    def test_timezone_dst(self):
+        born_seq = [date(2017, 3, 12), date(2017, 11, 5), date(2016, 3, 13)]
+        reference_seq = [date(2017, 11, 5), date(2018, 3, 11), date(2017, 3, 12)]
+        self.assert_matches_age(
+            born_seq, reference_seq, timezone='America/New_York')
+
+    def test_scalar_reference(self):
+        born_seq = [date(1990, 5, 1), date(1995, 6, 15)]
+        ages = age_many(born_seq, date(2000, 5, 1))
+        self.assertEqual(list(ages.years), [10, 4])
+
+    def test_datetime64_arrays(self):
+        born_seq = np.array(['1990-05-01', '2016-02-29', 'NaT'], dtype='datetime64[D]')
+        reference_seq = np.array(
+            ['2000-05-01T10:00', '2017-02-28T00:00', '2017-02-28T00:00'],
+            dtype='datetime64[m]')
+        ages = age_many(born_seq, reference_seq)
+        self.assertEqual(ages.years[0], 10)
+        self.assertEqual(ages.years[1], 1)
+        self.assertTrue(ages.mask[2])
+        self.assertEqual(ages.errors[2], 'Date of birth is required.')
+
+    def test_errors_are_masked(self):
+        born = pytz.utc.localize(datetime(1990, 5, 2, 5, 0))
+        ages = age_many(
+            [None, date(1990, 5, 1), born],
+            [date(2000, 5, 1), None, born - relativedelta(hours=3)])
+        self.assertEqual(list(ages.mask), [True, True, True])
+        self.assertEqual(ages.errors[0], 'Date of birth is required.')
+        self.assertEqual(ages.errors[1], 'Reference date is required.')
+        self.assertIn('precedes DOB', ages.errors[2])
+        self.assertIs(ages.years.mask[2], np.True_)
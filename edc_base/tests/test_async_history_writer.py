@@ -0,0 +1,92 @@
+import os
+import shutil
+import tempfile
+import time
+
+from django.core.management import call_command
+from django.db import transaction
+from django.test import TransactionTestCase, override_settings
+from io import StringIO
+
+from ..model_managers import get_async_history_writer, history_writer_metrics
+from ..model_managers.async_history_writer import stop_async_history_writer
+from .models import TestModelWithAsyncHistory
+
+
+class TestAsyncHistoryWriter(TransactionTestCase):
+
+    model = TestModelWithAsyncHistory
+
+    def setUp(self):
+        self.spool_dir = tempfile.mkdtemp()
+        self.settings = override_settings(
+            EDC_BASE_HISTORY_SPOOL_DIR=self.spool_dir,
+            EDC_BASE_HISTORY_QUEUE_SIZE=5)
+        self.settings.enable()
+
+    def tearDown(self):
+        stop_async_history_writer()
+        self.settings.disable()
+        shutil.rmtree(self.spool_dir)
+
+    def test_written_after_commit(self):
+        with transaction.atomic():
+            obj = self.model.objects.create(f1='1')
+            obj.f1 = '2'
+            obj.save()
+        get_async_history_writer().flush()
+        self.assertEqual(
+            sorted(obj.history.values_list('f1', flat=True)), ['1', '2'])
+        history = obj.history.get(f1='1')
+        self.assertEqual(history.modified, obj.history.model.objects.get(
+            history_id=history.history_id).modified)
+        metrics = history_writer_metrics()
+        self.assertEqual(metrics['written'], 2)
+        self.assertEqual(metrics['queue_depth'], 0)
+
+    def test_rolled_back_not_written(self):
+        try:
+            with transaction.atomic():
+                self.model.objects.create(f1='1')
+                raise ValueError
+        except ValueError:
+            pass
+        self.assertIsNone(history_writer_metrics())
+        self.assertEqual(self.model.history.count(), 0)
+
+    def test_spool_deleted_when_written(self):
+        obj = self.model.objects.create(f1='1')
+        stop_async_history_writer()
+        self.assertEqual(obj.history.count(), 1)
+        self.assertEqual(os.listdir(self.spool_dir), [])
+
+    def test_replay_spool(self):
+        writer = get_async_history_writer()
+        writer.start = lambda: None  # no background thread
+        for i in range(7):
+            self.model.objects.create(f1=str(i))
+        self.assertEqual(writer.metrics()['queue_depth'], 5)
+        self.assertEqual(writer.metrics()['spooled_only'], 2)
+        self.assertGreaterEqual(writer.metrics()['lag'], 0)
+        self.assertEqual(self.model.history.count(), 0)
+        # the spool holds all 7, locked while the writer is running
+        out = StringIO()
+        call_command('replay_history_spool', '--min-age=0', stdout=out)
+        self.assertIn('In use.', out.getvalue())
+        self.assertEqual(self.model.history.count(), 0)
+        writer.segment.close()
+        writer.segment.release()
+        filename = os.listdir(self.spool_dir)[0]
+        past = time.time() - 120
+        os.utime(os.path.join(self.spool_dir, filename), (past, past))
+        out = StringIO()
+        call_command('replay_history_spool', stdout=out)
+        self.assertIn(f'Replayed 7 historical records from {filename}.', out.getvalue())
+        self.assertEqual(self.model.history.count(), 7)
+        self.assertEqual(os.listdir(self.spool_dir), [])
+        # replaying records already written is a no-op
+        with open(os.path.join(self.spool_dir, 'again.jsonl'), 'w') as f:
+            f.write(writer.serialize(self.model.history.first()) + '\n')
+        os.utime(os.path.join(self.spool_dir, 'again.jsonl'), (past, past))
+        call_command('replay_history_spool', stdout=out)
+        self.assertEqual(self.model.history.count(), 7)
@@ -0,0 +1,59 @@
+from django.contrib.auth.models import User, AnonymousUser
+from django.http import HttpResponse
+from django.test import TestCase, RequestFactory
+
+from ..audit_context import audit_context, get_audit_context, get_audit_username
+from ..audit_context import set_audit_context, reset_audit_context, AuditContextError
+from ..middleware import AuditContextMiddleware
+from .models import TestModel
+
+
+class TestAuditContext(TestCase):
+
+    def test_process_context(self):
+        context = get_audit_context()
+        self.assertTrue(context.hostname)
+        self.assertTrue(context.os_username)
+        self.assertIsNone(context.user)
+        self.assertIs(get_audit_context(), context)
+
+    def test_fields_read_context(self):
+        with audit_context(hostname='host1', user='erik', os_username='os_user'):
+            obj = TestModel.objects.create(f1='1', f2='2', f5='5')
+        self.assertEqual(obj.hostname_created, 'host1')
+        self.assertEqual(obj.hostname_modified, 'host1')
+        self.assertEqual(obj.user_created, 'erik')
+        self.assertEqual(obj.user_modified, 'erik')
+        with audit_context(hostname='host2', os_username='os_user'):
+            obj.user_modified = ''
+            obj.save()
+        self.assertEqual(obj.hostname_created, 'host1')
+        self.assertEqual(obj.hostname_modified, 'host2')
+        self.assertEqual(obj.user_modified, 'os_user')
+
+    def test_context_is_reset(self):
+        hostname = get_audit_context().hostname
+        token = set_audit_context(hostname='host1')
+        self.assertEqual(get_audit_context().hostname, 'host1')
+        reset_audit_context(token)
+        self.assertEqual(get_audit_context().hostname, hostname)
+
+    def test_invalid_value(self):
+        self.assertRaises(AuditContextError, set_audit_context, bad='value')
+
+    def test_middleware(self):
+        user = User.objects.create(username='erik')
+        request = RequestFactory().get('/')
+        request.user = user
+        usernames = []
+
+        def get_response(request):
+            usernames.append(get_audit_username())
+            return HttpResponse()
+
+        middleware = AuditContextMiddleware(get_response)
+        middleware(request)
+        request.user = AnonymousUser()
+        middleware(request)
+        self.assertEqual(usernames, ['erik', None])
+        self.assertIsNone(get_audit_username())
@@ -0,0 +1,55 @@
+import socket
+
+from django.test import TestCase
+
+from ..model_managers import AuditedQuerySetError
+from ..revision import get_revision
+from .models import TestModel, TestModelWithHistory
+
+
+class TestAuditedQuerySet(TestCase):
+
+    def test_bulk_create_sets_audit_fields(self):
+        objs = TestModel.objects.bulk_create(
+            [TestModel(f1=str(i), f2='2', f5='5', hostname_created='h' * 100)
+             for i in range(3)])
+        for obj in TestModel.objects.filter(pk__in=[obj.pk for obj in objs]):
+            self.assertIsNotNone(obj.created)
+            self.assertEqual(obj.created, obj.modified)
+            self.assertEqual(obj.hostname_created, 'h' * 60)
+            self.assertEqual(obj.hostname_modified, socket.gethostname()[:50])
+            self.assertEqual(obj.revision, get_revision())
+            self.assertEqual(obj.device_created, obj.device_modified)
+            self.assertTrue(obj.device_created)
+        self.assertEqual(TestModel.objects.count(), 3)
+
+    def test_bulk_update_sets_audit_fields(self):
+        obj = TestModel.objects.create(f1='1', f2='2', f5='5')
+        modified = obj.modified
+        obj.f1 = 'changed'
+        obj.hostname_modified = 'elsewhere'
+        TestModel.objects.bulk_update([obj], ['f1'])
+        obj.refresh_from_db()
+        self.assertEqual(obj.f1, 'changed')
+        self.assertGreater(obj.modified, modified)
+        self.assertEqual(obj.hostname_modified, socket.gethostname()[:50])
+        self.assertTrue(obj.user_modified)
+
+    def test_bulk_create_and_update_with_history(self):
+        with self.assertNumQueries(2):
+            objs = TestModelWithHistory.objects.bulk_create(
+                [TestModelWithHistory(f1=str(i)) for i in range(5)], history=True)
+        self.assertEqual(
+            TestModelWithHistory.history.filter(history_type='+').count(), 5)
+        for obj in objs:
+            obj.f1 = 'changed'
+        TestModelWithHistory.objects.bulk_update(objs, ['f1'], history=True)
+        self.assertEqual(
+            set(TestModelWithHistory.history.filter(
+                history_type='~').values_list('f1', flat=True)), {'changed'})
+        self.assertEqual(objs[0].history.count(), 2)
+
+    def test_history_requires_historical_records(self):
+        self.assertRaises(
+            AuditedQuerySetError, TestModel.objects.bulk_create,
+            [TestModel(f1='1', f2='2', f5='5')], history=True)
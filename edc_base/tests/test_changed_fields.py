@@ -0,0 +1,77 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from .models import TestModel, TestModelWithChanges
+
+
+class TestChangedFields(TestCase):
+
+    def setUp(self):
+        self.obj = TestModelWithChanges.objects.create(f1='1', f2='2', f3=3)
+
+    def test_changed_fields(self):
+        obj = TestModelWithChanges.objects.get(pk=self.obj.pk)
+        self.assertEqual(obj.changed_fields, set())
+        obj.f1 = 'changed'
+        obj.f3 = 3
+        self.assertEqual(obj.changed_fields, {'f1'})
+
+    def test_not_tracked(self):
+        obj = TestModel.objects.create(f1='1', f2='2', f5='5')
+        self.assertIsNone(TestModel.objects.get(pk=obj.pk).changed_fields)
+
+    def test_save_updates_changed_fields_only(self):
+        obj = TestModelWithChanges.objects.get(pk=self.obj.pk)
+        obj.f1 = 'changed'
+        with CaptureQueriesContext(connection) as context:
+            obj.save()
+        update_sql = [q['sql'] for q in context.captured_queries
+                      if q['sql'].startswith('UPDATE')][0]
+        self.assertIn('"f1"', update_sql)
+        self.assertNotIn('"f2"', update_sql)
+        self.assertIn('"modified"', update_sql)
+        obj = TestModelWithChanges.objects.get(pk=self.obj.pk)
+        self.assertEqual((obj.f1, obj.f2, obj.f3), ('changed', '2', 3))
+        self.assertGreater(obj.modified, self.obj.modified)
+        self.assertEqual(obj.history.count(), 2)
+
+    def test_save_skipped_if_nothing_changed(self):
+        obj = TestModelWithChanges.objects.get(pk=self.obj.pk)
+        obj.f1 = '1'
+        with self.assertNumQueries(0):
+            obj.save()
+        self.assertEqual(obj.history.count(), 1)
+
+    def test_changes_reset_after_save(self):
+        obj = TestModelWithChanges.objects.get(pk=self.obj.pk)
+        obj.f1 = 'changed'
+        obj.save()
+        self.assertEqual(obj.changed_fields, set())
+        obj.f2 = 'changed'
+        obj.f3 = 4
+        obj.save(update_fields=['f2'])
+        self.assertEqual(obj.changed_fields, {'f3'})
+
+    def test_deferred_fields(self):
+        obj = TestModelWithChanges.objects.only('f1').get(pk=self.obj.pk)
+        obj.f2 = 'changed'
+        self.assertEqual(obj.changed_fields, {'f2'})
+        obj.save()
+        obj = TestModelWithChanges.objects.get(pk=self.obj.pk)
+        self.assertEqual((obj.f1, obj.f2, obj.f3), ('1', 'changed', 3))
+
+    def test_refresh_from_db(self):
+        obj = TestModelWithChanges.objects.get(pk=self.obj.pk)
+        TestModelWithChanges.objects.filter(pk=self.obj.pk).update(f1='other')
+        obj.refresh_from_db()
+        self.assertEqual(obj.changed_fields, set())
+
+    def test_loading_deferred_field_keeps_changes(self):
+        obj = TestModelWithChanges.objects.only('f1').get(pk=self.obj.pk)
+        obj.f1 = 'changed'
+        self.assertEqual(obj.f3, 3)
+        self.assertEqual(obj.changed_fields, {'f1'})
+        obj.save()
+        obj = TestModelWithChanges.objects.get(pk=self.obj.pk)
+        self.assertEqual((obj.f1, obj.f2, obj.f3), ('changed', '2', 3))
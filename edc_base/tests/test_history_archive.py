@@ -0,0 +1,132 @@
+import gzip
+import os
+import shutil
+import tempfile
+
+from datetime import timedelta
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from io import StringIO
+from unittest.mock import patch
+
+from ..model_managers.history_archive import HistoryArchive, HistoryArchiver
+from ..utils import get_utcnow
+from .models import TestModelWithHistory
+
+
+class TestHistoryArchive(TestCase):
+
+    model = TestModelWithHistory
+
+    def setUp(self):
+        self.archive_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.archive_dir)
+
+    def make_history(self):
+        obj = self.model.objects.create(f1='1')
+        obj.f1 = '2'
+        obj.save()
+        past = get_utcnow() - timedelta(days=10)
+        obj.history.filter(f1='1').update(history_date=past - timedelta(hours=1))
+        obj.history.filter(f1='2').update(history_date=past)
+        obj.f1 = '3'
+        obj.save()
+        return obj, past
+
+    def test_archive_and_delete(self):
+        obj, past = self.make_history()
+        archiver = HistoryArchiver(
+            self.model, get_utcnow() - timedelta(days=1),
+            archive_dir=self.archive_dir, chunk_size=1)
+        self.assertEqual(archiver.archive(), 2)
+        self.assertEqual(list(obj.history.values_list('f1', flat=True)), ['3'])
+        with gzip.open(archiver.path, 'rt') as f:
+            self.assertEqual(len(f.readlines()), 2)
+        # appends
+        obj.history.update(history_date=past)
+        self.assertEqual(archiver.archive(), 1)
+        self.assertEqual(len(list(HistoryArchive(self.model, self.archive_dir))), 3)
+
+    def test_as_of(self):
+        obj, past = self.make_history()
+        HistoryArchiver(
+            self.model, get_utcnow() - timedelta(days=1),
+            archive_dir=self.archive_dir).archive()
+        archive = HistoryArchive(self.model, self.archive_dir)
+        self.assertEqual(archive.as_of(past, pk=obj.pk).f1, '2')
+        self.assertEqual(
+            archive.as_of(get_utcnow(), pk=obj.pk, queryset=self.model.history.all()).f1, '3')
+        self.assertEqual(len(archive.as_of(get_utcnow())), 1)
+        self.assertRaises(
+            self.model.DoesNotExist, archive.as_of,
+            past - timedelta(days=1), pk=obj.pk)
+        other = self.model.objects.create(f1='other')
+        with CaptureQueriesContext(connection) as context:
+            self.assertEqual(
+                archive.as_of(get_utcnow(), pk=obj.pk, queryset=self.model.history.all()).f1,
+                '3')
+        self.assertIn(obj.pk.hex, context.captured_queries[0]['sql'])
+        self.assertEqual(
+            archive.as_of(get_utcnow(), pk=other.pk, queryset=self.model.history.all()).f1,
+            'other')
+        history_id = next(iter(archive)).history_id
+        self.assertEqual(archive.get_by_natural_key(history_id).history_id, history_id)
+
+    def test_command(self):
+        obj, _ = self.make_history()
+        out = StringIO()
+        call_command(
+            'archive_history', 'edc_base.testmodelwithhistory', days=1,
+            archive_dir=self.archive_dir, stdout=out)
+        self.assertIn('Archived 2 historical records', out.getvalue())
+        self.assertEqual(obj.history.count(), 1)
+        call_command(
+            'archive_history', 'edc_base.testmodelwithhistory', days=1, keep=True,
+            archive_dir=self.archive_dir, stdout=out)
+        self.assertEqual(obj.history.count(), 1)
+
+    def test_keep_skips_archived(self):
+        obj, _ = self.make_history()
+        archiver = HistoryArchiver(
+            self.model, get_utcnow() - timedelta(days=1),
+            archive_dir=self.archive_dir, delete=False)
+        self.assertEqual(archiver.archive(), 2)
+        self.assertEqual(archiver.archive(), 0)
+        self.assertEqual(obj.history.count(), 3)
+        self.assertEqual(len(list(HistoryArchive(self.model, self.archive_dir))), 2)
+
+    def test_incomplete_member_truncated(self):
+        obj, _ = self.make_history()
+        archiver = HistoryArchiver(
+            self.model, get_utcnow() - timedelta(days=1),
+            archive_dir=self.archive_dir, chunk_size=1, delete=False)
+        self.assertEqual(archiver.archive(), 2)
+        # a crash while appending the second member
+        size = os.path.getsize(archiver.path)
+        with open(archiver.path, 'r+b') as f:
+            f.truncate(size - 10)
+        with self.assertRaises(EOFError):
+            len(list(HistoryArchive(self.model, self.archive_dir)))
+        self.assertEqual(archiver.archive(), 1)
+        self.assertEqual(
+            sorted(obj.f1 for obj in HistoryArchive(self.model, self.archive_dir)), ['1', '2'])
+        self.assertEqual(archiver.archive(), 0)
+
+    def test_failed_append_truncated(self):
+        obj, _ = self.make_history()
+        archiver = HistoryArchiver(
+            self.model, get_utcnow() - timedelta(days=1),
+            archive_dir=self.archive_dir, chunk_size=1)
+        archiver.append([obj.history.get(f1='1')])
+        size = os.path.getsize(archiver.path)
+        with patch('edc_base.model_managers.history_archive.os.fsync', side_effect=OSError):
+            self.assertRaises(OSError, archiver.archive)
+        self.assertEqual(os.path.getsize(archiver.path), size)
+        self.assertEqual(obj.history.count(), 3)
+        self.assertEqual(archiver.archive(), 2)
+        self.assertEqual(obj.history.count(), 1)
+        self.assertEqual(len(list(HistoryArchive(self.model, self.archive_dir))), 3)
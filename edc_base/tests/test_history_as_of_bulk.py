@@ -0,0 +1,59 @@
+from datetime import timedelta
+from django.test import TestCase
+
+from ..utils import get_utcnow
+from .models import TestModelWithHistory
+
+
+class TestHistoryAsOfBulk(TestCase):
+
+    model = TestModelWithHistory
+
+    def setUp(self):
+        self.history_model = self.model.history.model
+        self.now = get_utcnow()
+        self.objs = []
+        for i in range(5):
+            obj = self.model.objects.create(f1=f'{i}-1')
+            obj.f1 = f'{i}-2'
+            obj.save()
+            self.objs.append(obj)
+        for history in self.history_model.objects.all():
+            days = 10 if history.f1.endswith('-1') else 5
+            history.history_date = self.now - timedelta(days=days)
+            history.save()
+        self.ids = [obj.id for obj in self.objs]
+        self.objs[4].delete()
+
+    def test_as_of_bulk(self):
+        with self.assertNumQueries(1):
+            values = dict(self.history_model.objects.as_of_bulk(
+                self.now - timedelta(days=7)).values_list('id', 'f1'))
+        self.assertEqual(values, {pk: f'{i}-1' for i, pk in enumerate(self.ids)})
+        values = dict(self.history_model.objects.as_of_bulk(
+            self.now + timedelta(days=1)).values_list('id', 'f1'))
+        self.assertEqual(
+            values, {pk: f'{i}-2' for i, pk in enumerate(self.ids[:4])})
+
+    def test_as_of_bulk_matches_as_of(self):
+        date = self.now - timedelta(days=7)
+        for history in self.history_model.objects.as_of_bulk(date).iterator():
+            instance = history.instance
+            self.assertEqual(instance.f1, self.model.history.model.objects.filter(
+                id=instance.id, history_date__lte=date).latest('history_date').f1)
+
+    def test_as_of_bulk_before_created(self):
+        self.assertFalse(self.history_model.objects.as_of_bulk(
+            self.now - timedelta(days=11)).exists())
+
+    def test_as_of_bulk_queryset(self):
+        history = self.history_model.objects.as_of_bulk(
+            self.now, queryset=self.model.objects.filter(f1__startswith='1'))
+        self.assertEqual([h.id for h in history], [self.ids[1]])
+
+    def test_as_of_bulk_include_deleted(self):
+        history = self.history_model.objects.as_of_bulk(self.now + timedelta(days=1))
+        self.assertEqual(history.count(), 4)
+        history = self.history_model.objects.as_of_bulk(
+            self.now + timedelta(days=1), include_deleted=True)
+        self.assertEqual(history.count(), 5)
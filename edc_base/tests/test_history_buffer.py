@@ -0,0 +1,83 @@
+from django.db import transaction
+from django.test import TransactionTestCase
+
+from ..model_managers import flush_history, get_history_buffer
+from .models import TestModelWithBufferedHistory
+
+
+class TestHistoryBuffer(TransactionTestCase):
+
+    model = TestModelWithBufferedHistory
+
+    def test_written_on_commit(self):
+        with transaction.atomic():
+            for i in range(5):
+                self.model.objects.create(f1=str(i))
+            self.assertEqual(self.model.history.count(), 0)
+            self.assertEqual(len(get_history_buffer()), 5)
+        self.assertEqual(self.model.history.count(), 5)
+        self.assertEqual(len(get_history_buffer()), 0)
+
+    def test_one_insert_per_commit(self):
+        with self.assertNumQueries(4 + 1 + 2):
+            with transaction.atomic():
+                for i in range(4):
+                    self.model.objects.create(f1=str(i))
+        self.assertEqual(self.model.history.count(), 4)
+
+    def test_dropped_on_rollback(self):
+        try:
+            with transaction.atomic():
+                self.model.objects.create(f1='1')
+                raise ValueError
+        except ValueError:
+            pass
+        with transaction.atomic():
+            self.model.objects.create(f1='2')
+        self.assertEqual(
+            list(self.model.history.values_list('f1', flat=True)), ['2'])
+        self.assertEqual(len(get_history_buffer()), 0)
+
+    def test_dropped_on_savepoint_rollback(self):
+        with transaction.atomic():
+            self.model.objects.create(f1='1')
+            try:
+                with transaction.atomic():
+                    self.model.objects.create(f1='2')
+                    raise ValueError
+            except ValueError:
+                pass
+            with transaction.atomic():
+                self.model.objects.create(f1='3')
+            self.model.objects.create(f1='4')
+        self.assertEqual(
+            sorted(self.model.history.values_list('f1', flat=True)), ['1', '3', '4'])
+
+    def test_flush(self):
+        with transaction.atomic():
+            self.model.objects.create(f1='1')
+            flush_history()
+            self.assertEqual(self.model.history.count(), 1)
+            self.model.objects.create(f1='2')
+        self.assertEqual(self.model.history.count(), 2)
+
+    def test_flush_in_savepoint_keeps_outer_records(self):
+        with transaction.atomic():
+            self.model.objects.create(f1='1')
+            try:
+                with transaction.atomic():
+                    self.model.objects.create(f1='2')
+                    flush_history()
+                    self.assertEqual(
+                        list(self.model.history.values_list('f1', flat=True)), ['2'])
+                    raise ValueError
+            except ValueError:
+                pass
+        self.assertEqual(
+            list(self.model.history.values_list('f1', flat=True)), ['1'])
+
+    def test_autocommit_writes_immediately(self):
+        obj = self.model.objects.create(f1='1')
+        self.assertEqual(obj.history.count(), 1)
+        obj.delete()
+        self.assertEqual(self.model.history.count(), 2)
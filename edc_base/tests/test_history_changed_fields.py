@@ -0,0 +1,100 @@
+from django.db import transaction
+from django.test import TestCase, TransactionTestCase
+
+from ..model_managers import changed_field_q
+from .models import TestModelWithBufferedDiffedHistory, TestModelWithDiffedHistory
+from .models import TestModelWithIndexedDiffedHistory
+from .models import TestModelWithTrackedDiffedHistory
+from .models import TestModelWithHistory
+
+
+class TestHistoryChangedFields(TestCase):
+
+    model = TestModelWithDiffedHistory
+
+    def test_unchanged_save_skipped(self):
+        obj = self.model.objects.create(f1='1')
+        obj.save()
+        obj = self.model.objects.get(pk=obj.pk)
+        obj.save()
+        self.assertEqual(obj.history.count(), 1)
+        self.assertIsNone(obj.history.get().changed_field_names)
+
+    def test_audit_fields_ignored(self):
+        obj = self.model.objects.create(f1='1')
+        obj.hostname_modified = 'another'
+        obj.revision = 'another'
+        obj.save(update_fields=['hostname_modified', 'revision'])
+        self.assertEqual(obj.history.count(), 1)
+
+    def test_changed_fields_recorded(self):
+        obj = self.model.objects.create(f1='1')
+        obj.f1 = '2'
+        obj.f2 = '2'
+        obj.save()
+        obj.f2 = '3'
+        obj.save()
+        history = obj.history.filter(history_type='~').order_by('history_date')
+        self.assertEqual(
+            [h.changed_field_names for h in history], [['f1', 'f2'], ['f2']])
+        self.assertEqual(obj.history.filter(changed_field_q('f1')).count(), 1)
+        self.assertEqual(obj.history.filter(changed_field_q('f2')).count(), 2)
+
+    def test_changed_fields_not_indexed(self):
+        self.assertIsNone(self.model.history.model.changed_field_model)
+        self.assertFalse(hasattr(self.model.history.model, 'history_changed_field_set'))
+
+    def test_changed_fields_indexed(self):
+        model = TestModelWithIndexedDiffedHistory
+        obj = model.objects.create(f1='1')
+        obj.f1 = '2'
+        obj.f2 = '2'
+        obj.save()
+        obj.save()
+        history = obj.history.get(history_type='~')
+        self.assertEqual(
+            sorted(history.history_changed_field_set.values_list('field_name', flat=True)),
+            ['f1', 'f2'])
+        self.assertEqual(obj.history.filter(changed_field_q('f1', indexed=True)).count(), 1)
+        query = str(obj.history.filter(changed_field_q('f1', indexed=True)).query)
+        self.assertNotIn('LIKE', query)
+        obj.history.all().delete()
+        self.assertFalse(model.history.model.changed_field_model.objects.exists())
+
+    def test_tracked_model_uses_snapshot(self):
+        obj = TestModelWithTrackedDiffedHistory.objects.create(f1='1')
+        obj = TestModelWithTrackedDiffedHistory.objects.get(pk=obj.pk)
+        with self.assertNumQueries(1):
+            obj.save(update_fields=['f1'])
+        obj.f2 = '2'
+        obj.save()
+        self.assertEqual(obj.history.count(), 2)
+        self.assertEqual(obj.history.filter(changed_field_q('f2')).count(), 1)
+
+    def test_bulk_update_records_fields(self):
+        obj = self.model.objects.create(f1='1')
+        obj.f2 = '2'
+        self.model.objects.bulk_update([obj], ['f2'], history=True)
+        self.assertEqual(
+            obj.history.get(history_type='~').changed_field_names, ['f2'])
+        self.assertEqual(obj.history.filter(changed_field_q('f2')).count(), 1)
+
+    def test_not_opted_in(self):
+        obj = TestModelWithHistory.objects.create()
+        obj.save()
+        self.assertEqual(obj.history.count(), 2)
+        self.assertFalse(hasattr(obj.history.first(), 'history_changed_fields'))
+
+
+class TestBufferedHistoryChangedFields(TransactionTestCase):
+
+    def test_revert_before_flush_recorded(self):
+        obj = TestModelWithBufferedDiffedHistory.objects.create(f1='1')
+        with transaction.atomic():
+            obj.f1 = '2'
+            obj.save()
+            obj.f1 = '1'
+            obj.save()
+        self.assertEqual(
+            list(obj.history.order_by('history_date').values_list('f1', flat=True)),
+            ['1', '2', '1'])
@@ -0,0 +1,79 @@
+from django.db import transaction
+from django.db.models import F
+from django.test import TestCase
+
+from ..audit_context import audit_context
+from .models import TestModelWithHistoryManager, TestModelWithHistoryManagerOnly
+from .models import TestPlainModelWithHistoryManager
+
+
+class TestHistoryQuerySet(TestCase):
+
+    model = TestModelWithHistoryManager
+
+    def test_update_writes_history(self):
+        for i in range(5):
+            self.model.objects.create(f1=str(i))
+        self.model.history.all().delete()
+        qs = self.model.objects.filter(f1__in=['1', '2', '3'])
+        qs.history_batch_size = 2
+        with audit_context(user='erik'):
+            self.assertEqual(qs.update(f2=F('f2') + 1), 3)
+        history = self.model.history.all()
+        self.assertEqual(history.count(), 3)
+        self.assertEqual(set(h.history_type for h in history), {'~'})
+        self.assertEqual(set(h.f2 for h in history), {1})
+        self.assertEqual(set(h.user_modified for h in history), {'erik'})
+        for obj in self.model.objects.filter(f2=1):
+            self.assertEqual(obj.history.get().modified, obj.modified)
+
+    def test_update_filtered_field(self):
+        self.model.objects.create(f1='1')
+        self.model.objects.filter(f1='1').update(f1='2')
+        self.assertEqual(
+            list(self.model.history.filter(history_type='~').values_list('f1', flat=True)),
+            ['2'])
+
+    def test_update_without_history(self):
+        self.model.objects.create(f1='1')
+        self.model.objects.update(f1='2', history=False)
+        self.assertEqual(self.model.history.count(), 1)
+
+    def test_update_rolled_back(self):
+        self.model.objects.create(f1='1')
+        try:
+            with transaction.atomic():
+                self.model.objects.update(f1='2')
+                raise ValueError
+        except ValueError:
+            pass
+        self.assertEqual(self.model.history.count(), 1)
+
+    def test_bulk_create_and_bulk_update(self):
+        objs = self.model.objects.bulk_create(
+            [self.model(f1=str(i)) for i in range(3)], history=True)
+        self.assertEqual(self.model.history.filter(history_type='+').count(), 3)
+        for obj in objs:
+            obj.f2 = 5
+        self.model.objects.bulk_update(objs, ['f2'])
+        self.assertEqual(
+            list(self.model.history.filter(history_type='~').values_list('f2', flat=True)),
+            [5, 5, 5])
+
+    def test_bulk_create_without_history_by_default(self):
+        self.model.objects.bulk_create([self.model(f1='1')])
+        self.assertEqual(self.model.history.count(), 0)
+
+    def test_model_without_history(self):
+        model = TestModelWithHistoryManagerOnly
+        self.assertFalse(hasattr(model._meta, 'historical_records'))
+        model.objects.bulk_create([model(f1='1'), model(f1='2')])
+        self.assertEqual(model.objects.update(f1='3'), 2)
+        objs = list(model.objects.all())
+        model.objects.bulk_update(objs, ['f1'])
+
+    def test_plain_model(self):
+        model = TestPlainModelWithHistoryManager
+        model.objects.bulk_create([model(f1='1'), model(f1='2')])
+        self.assertEqual(model.objects.update(f1='3'), 2)
+        self.assertEqual(model.history.filter(f1='3').count(), 2)
@@ -0,0 +1,99 @@
+import pytz
+
+from datetime import datetime, date
+from django.test import TestCase
+
+from ..model_functions import AgeInYears, AgeInMonths, AgeInDays
+from ..model_validators import MinConsentAgeValidator, MaxConsentAgeValidator
+from ..utils import age
+from .models import TestAgeModel
+
+
+class TestModelFunctions(TestCase):
+
+    def setUp(self):
+        self.rows = [
+            (date(1990, 5, 1), datetime(2000, 5, 1, 10, 0)),
+            (date(2016, 2, 29), datetime(2017, 2, 28, 0, 0)),
+            (date(2000, 1, 31), datetime(2000, 3, 1, 23, 59)),
+            (date(1999, 12, 31), datetime(2017, 12, 30, 22, 0)),
+            (date(2010, 6, 15), datetime(2010, 6, 14, 0, 0)),
+            (None, datetime(2010, 6, 14, 0, 0))]
+        for dob, consent_datetime in self.rows:
+            TestAgeModel.objects.create(
+                dob=dob, consent_datetime=pytz.utc.localize(consent_datetime))
+
+    def test_matches_age(self):
+        for timezone in ['UTC', 'Africa/Gaborone', 'America/New_York']:
+            qs = TestAgeModel.objects.annotate(
+                years=AgeInYears('dob', reference='consent_datetime', timezone=timezone),
+                months=AgeInMonths('dob', reference='consent_datetime', timezone=timezone),
+                days=AgeInDays('dob', reference='consent_datetime', timezone=timezone))
+            for obj in qs:
+                try:
+                    rdelta = age(obj.dob, obj.consent_datetime, timezone)
+                except Exception:
+                    self.assertIsNone(obj.years)
+                    self.assertIsNone(obj.months)
+                    self.assertIsNone(obj.days)
+                else:
+                    self.assertEqual(
+                        (obj.years, obj.months, obj.days),
+                        (rdelta.years, rdelta.years * 12 + rdelta.months, rdelta.days),
+                        msg=f'dob={obj.dob}, timezone={timezone}')
+
+    def test_reference_value(self):
+        qs = TestAgeModel.objects.annotate(
+            years=AgeInYears('dob', reference=date(2018, 1, 1)))
+        self.assertEqual(qs.get(dob=date(1990, 5, 1)).years, 27)
+        qs = TestAgeModel.objects.annotate(
+            years=AgeInYears('dob', reference=pytz.utc.localize(datetime(2018, 1, 1))))
+        self.assertEqual(qs.get(dob=date(1999, 12, 31)).years, 18)
+
+    def test_filter_and_order(self):
+        qs = TestAgeModel.objects.annotate(
+            years=AgeInYears('dob', reference='consent_datetime'))
+        self.assertEqual(
+            list(qs.filter(years__gte=10).order_by('-years').values_list('years', flat=True)),
+            [17, 10])
+
+    def test_consent_age_validators_filter_queryset(self):
+        reference = date(2018, 1, 1)
+        min_validator = MinConsentAgeValidator(18)
+        max_validator = MaxConsentAgeValidator(20)
+        qs = TestAgeModel.objects.all()
+        self.assertEqual(
+            sorted(obj.dob for obj in min_validator.filter_queryset(
+                qs, reference=reference)),
+            [date(1990, 5, 1), date(1999, 12, 31)])
+        self.assertEqual(
+            sorted(obj.dob for obj in max_validator.filter_queryset(
+                qs, reference=reference)),
+            [date(1999, 12, 31), date(2000, 1, 31), date(2010, 6, 15), date(2016, 2, 29)])
+        self.assertEqual(
+            sorted(obj.dob for obj in min_validator.exclude_queryset(
+                qs.exclude(dob=None), reference=reference)),
+            [date(2000, 1, 31), date(2010, 6, 15), date(2016, 2, 29)])
+
+    def test_consent_age_validators_null_age(self):
+        reference = date(2010, 1, 1)
+        max_validator = MaxConsentAgeValidator(64)
+        qs = TestAgeModel.objects.all()
+        # dob after the reference (2010-06-15 and 2016-02-29) or null
+        self.assertEqual(
+            sorted(obj.dob for obj in max_validator.filter_queryset(qs, reference=reference)),
+            [date(1990, 5, 1), date(1999, 12, 31), date(2000, 1, 31)])
+        excluded = list(max_validator.exclude_queryset(qs, reference=reference))
+        self.assertEqual(
+            sorted(obj.dob for obj in excluded if obj.dob),
+            [date(2010, 6, 15), date(2016, 2, 29)])
+        self.assertEqual(len(excluded), 3)
+        self.assertEqual(
+            max_validator.filter_queryset(qs, reference=reference).count()
+            + len(excluded), qs.count())
+
+    def test_compare_numbers_get_q(self):
+        self.assertEqual(
+            MinConsentAgeValidator(18).get_q('age').children, [('age__gte', 18)])
+        self.assertEqual(
+            MaxConsentAgeValidator(64).get_q('age').children, [('age__lte', 64)])
@@ -0,0 +1,100 @@
+import os
+import tempfile
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from io import StringIO
+
+from ..natural_key_stream import NaturalKeyImporter, NaturalKeyStreamError
+from ..natural_key_stream import export_natural_keys
+from .models import TestListModel, TestModel, TestModelWithListModel
+
+
+class TestNaturalKeyStream(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create(username='erik')
+        self.history_model = TestModelWithListModel.history.model
+
+    def make_history(self, count, start=0):
+        for i in range(start, start + count):
+            list_item = TestListModel.objects.create(name=f'item{i}', short_name=f'item{i}')
+            obj = TestModelWithListModel(list_item=list_item)
+            obj._history_user = self.user
+            obj.save()
+
+    def export_and_delete(self):
+        fp = StringIO()
+        export_natural_keys(self.history_model, fp, chunk_size=3)
+        expected = list(self.history_model.objects.order_by('pk').values())
+        self.history_model.objects.all().delete()
+        return fp.getvalue().splitlines(), expected
+
+    def import_queries(self, lines):
+        importer = NaturalKeyImporter()
+        with CaptureQueriesContext(connection) as context:
+            importer.load(lines)
+        return importer, len(context.captured_queries)
+
+    def test_round_trip(self):
+        self.make_history(5)
+        lines, expected = self.export_and_delete()
+        self.assertEqual(len(lines), 5)
+        importer, _ = self.import_queries(lines)
+        self.assertEqual(importer.inserted, 5)
+        self.assertEqual(
+            list(self.history_model.objects.order_by('pk').values()), expected)
+        importer, _ = self.import_queries(lines)
+        self.assertEqual((importer.inserted, importer.skipped), (0, 5))
+
+    def test_query_count_is_flat(self):
+        self.make_history(3)
+        lines, _ = self.export_and_delete()
+        _, small = self.import_queries(lines)
+        self.make_history(30, start=3)
+        lines, _ = self.export_and_delete()
+        _, large = self.import_queries(lines)
+        self.assertEqual(small, large)
+
+    def test_list_model(self):
+        self.make_history(2)
+        fp = StringIO()
+        export_natural_keys(TestListModel, fp)
+        TestModelWithListModel.objects.all().delete()
+        TestListModel.objects.all().delete()
+        NaturalKeyImporter().load(fp.getvalue().splitlines())
+        self.assertEqual(
+            list(TestListModel.objects.order_by('name').values_list('short_name', flat=True)),
+            ['item0', 'item1'])
+
+    def test_missing_related(self):
+        self.make_history(1)
+        lines, _ = self.export_and_delete()
+        TestModelWithListModel.objects.all().delete()
+        TestListModel.objects.all().delete()
+        self.assertRaises(NaturalKeyStreamError, NaturalKeyImporter().load, lines)
+
+    def test_no_natural_key_fields(self):
+        self.assertRaises(
+            NaturalKeyStreamError, export_natural_keys, TestModel, StringIO())
+
+    def test_commands(self):
+        self.make_history(2)
+        out = StringIO()
+        call_command('stream_dumpdata', self.history_model._meta.label_lower, stdout=out)
+        self.history_model.objects.all().delete()
+        path = self.tmp_path()
+        with open(path, 'w') as f:
+            f.write(out.getvalue())
+        out = StringIO()
+        call_command('stream_loaddata', path, stdout=out)
+        self.assertIn('Inserted 2 rows', out.getvalue())
+
+    def tmp_path(self):
+        fd, path = tempfile.mkstemp(suffix='.jsonl')
+        os.close(fd)
+        self.addCleanup(os.remove, path)
+        return path
@@ -0,0 +1,56 @@
+from django.db import models
+from django.test import TestCase
+from django.test.utils import isolate_apps
+
+from ..model_mixins import BaseUuidModel
+from ..model_mixins.ordering_indexes import get_missing_ordering_index_fields
+from ..system_checks import ordering_index_check, ordering_index_database_check
+from .models import TestModel, TestModelWithSite
+
+
+class TestOrderingIndexes(TestCase):
+
+    def get_index_fields(self, model):
+        return [list(index.fields) for index in model._meta.indexes]
+
+    def test_base_model_indexes(self):
+        self.assertEqual(self.get_index_fields(TestModel), [['-modified', '-created']])
+
+    def test_site_model_indexes(self):
+        # Meta is inherited from SiteModelMixin, so no default ordering
+        self.assertEqual(self.get_index_fields(TestModelWithSite), [['site', '-modified']])
+
+    @isolate_apps('edc_base')
+    def test_custom_ordering(self):
+
+        class OrderedModel(BaseUuidModel):
+            name = models.CharField(max_length=10)
+
+            class Meta(BaseUuidModel.Meta):
+                ordering = ['name', 'subject__name']
+                get_latest_by = 'created'
+                indexes = [models.Index(fields=['-created'], name='ordered_created_idx')]
+
+        self.assertEqual(self.get_index_fields(OrderedModel), [['-created']])
+
+    @isolate_apps('edc_base')
+    def test_opt_out_is_flagged(self):
+
+        class UnindexedModel(BaseUuidModel):
+            add_ordering_indexes = False
+
+            class Meta(BaseUuidModel.Meta):
+                pass
+
+        self.assertEqual(self.get_index_fields(UnindexedModel), [])
+        self.assertEqual(
+            get_missing_ordering_index_fields(UnindexedModel), [['-modified', '-created']])
+        errors = ordering_index_check(
+            [UnindexedModel._meta.apps.get_app_config('edc_base')])
+        self.assertEqual([error.id for error in errors], ['edc_base.W001'])
+
+    def test_checks(self):
+        self.assertEqual(ordering_index_check(None), [])
+        self.assertEqual(ordering_index_database_check(None), [])
+        self.assertEqual(ordering_index_database_check(None, databases=['default']), [])
+        self.assertEqual(ordering_index_database_check(None, databases=[]), [])
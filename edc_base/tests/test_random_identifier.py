@@ -0,0 +1,46 @@
+from collections import Counter
+from django.test import TestCase
+
+from ..random_identifier import RandomIdentifierGenerator, RandomIdentifierError
+from ..utils import safe_allowed_chars
+from .models import TestModel
+
+
+class TestRandomIdentifier(TestCase):
+
+    def test_generate(self):
+        generator = RandomIdentifierGenerator(length=8)
+        identifiers = generator.generate(1000)
+        self.assertEqual(len(identifiers), 1000)
+        self.assertEqual(len(set(identifiers)), 1000)
+        for identifier in identifiers:
+            self.assertEqual(len(identifier), 8)
+            self.assertTrue(set(identifier).issubset(set(safe_allowed_chars)))
+
+    def test_all_chars_used(self):
+        generator = RandomIdentifierGenerator(allowed_chars='ABC', length=1000)
+        counter = Counter(generator.generate(1)[0])
+        self.assertEqual(set(counter), {'A', 'B', 'C'})
+
+    def test_refills_pool(self):
+        generator = RandomIdentifierGenerator(length=10, pool_size=15)
+        self.assertEqual(len(generator.generate(100)), 100)
+
+    def test_excludes_existing(self):
+        TestModel.objects.create(f1='AAAA')
+        TestModel.objects.create(f1='BBBB')
+        generator = RandomIdentifierGenerator(
+            model='edc_base.testmodel', field_name='f1', length=4, batch_size=2)
+        candidates = iter([['AAAA', 'CCCC', 'BBBB'], ['AAAA', 'DDDD']])
+        generator.random_strings = lambda count: next(candidates)
+        with self.assertNumQueries(3):
+            identifiers = generator.generate(2)
+        self.assertEqual(identifiers, ['CCCC', 'DDDD'])
+
+    def test_raises_if_exhausted(self):
+        generator = RandomIdentifierGenerator(allowed_chars='AB', length=1)
+        self.assertRaises(RandomIdentifierError, generator.generate, 3)
+
+    def test_model_requires_field_name(self):
+        self.assertRaises(
+            RandomIdentifierError, RandomIdentifierGenerator, model='edc_base.testmodel')
@@ -0,0 +1,71 @@
+import json
+import os
+import tempfile
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from io import StringIO
+from unittest.mock import patch
+
+from ..model_fields import RevisionField
+from ..revision import clear_revision_cache, get_revision, get_revision_source
+from ..revision import read_revision_manifest, write_revision_manifest, RevisionError
+from .models import TestModel
+
+
+class TestRevision(TestCase):
+
+    def setUp(self):
+        clear_revision_cache()
+        self.manifest = os.path.join(tempfile.mkdtemp(), 'revision.json')
+
+    def tearDown(self):
+        clear_revision_cache()
+
+    @override_settings(REVISION='v1.0.0:frozen')
+    def test_settings_override(self):
+        self.assertEqual(get_revision(), 'v1.0.0:frozen')
+        self.assertEqual(get_revision_source(), 'settings.REVISION')
+
+    def test_manifest_without_git(self):
+        with open(self.manifest, 'w') as f:
+            json.dump({'revision': 'v1.0.0:master:abc'}, f)
+        with override_settings(REVISION_MANIFEST=self.manifest), patch(
+                'edc_base.revision.get_git_revision', return_value=None):
+            self.assertEqual(get_revision(), 'v1.0.0:master:abc')
+            self.assertEqual(get_revision_source(), self.manifest)
+
+    def test_no_revision(self):
+        with override_settings(REVISION_MANIFEST=self.manifest), patch(
+                'edc_base.revision.get_git_revision', return_value=None):
+            self.assertEqual(get_revision(), '')
+            self.assertIsNone(get_revision_source())
+
+    def test_invalid_manifest(self):
+        with open(self.manifest, 'w') as f:
+            f.write('not json')
+        self.assertRaises(RevisionError, read_revision_manifest, self.manifest)
+
+    def test_write_manifest(self):
+        with patch('edc_base.revision.get_git_revision', return_value='tag:branch:commit'):
+            write_revision_manifest(self.manifest)
+        self.assertEqual(read_revision_manifest(self.manifest), 'tag:branch:commit')
+        with patch('edc_base.revision.get_git_revision', return_value=None):
+            self.assertRaises(RevisionError, write_revision_manifest, self.manifest)
+
+    def test_write_manifest_command(self):
+        out = StringIO()
+        with patch('edc_base.revision.get_git_revision', return_value='tag:branch:commit'):
+            call_command('write_revision_manifest', path=self.manifest, stdout=out)
+        self.assertIn(self.manifest, out.getvalue())
+
+    @override_settings(REVISION='v1.0.0:frozen')
+    def test_save_uses_cached_revision(self):
+        get_revision()
+        with patch('edc_base.revision.resolve_revision', side_effect=AssertionError):
+            obj = TestModel.objects.create(f1='1', f2='2', f5='5')
+        self.assertEqual(obj.revision, 'v1.0.0:frozen')
+
+    def test_field_deconstructs_as_django_revision(self):
+        _, path, _, _ = RevisionField().deconstruct()
+        self.assertEqual(path, 'django_revision.revision_field.RevisionField')
@@ -0,0 +1,106 @@
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import OperationalError, connections
+from django.db.models.signals import pre_delete, pre_save
+from django.test import RequestFactory, TestCase
+from django.test.utils import override_settings
+from unittest.mock import patch
+
+from ..sites.routers import ReviewerReplicaRouter, ReviewerReplicaWriteError
+from ..sites.site_context import is_reviewer_site
+from .models import TestModel, TestModelWithHistoryManager
+from .urls import admin_site
+
+ROUTERS = ['edc_base.sites.routers.ReviewerReplicaRouter']
+
+
+@override_settings(DATABASE_ROUTERS=ROUTERS, SITE_ID=20, REVIEWER_SITE_ID=20)
+class TestReviewerReplicaRouter(TestCase):
+
+    databases = {'default', 'replica'}
+
+    def setUp(self):
+        with self.settings(REVIEWER_SITE_ID=0):
+            TestModel.objects.using('replica').create(f1='replica')
+
+    def test_reads_from_replica(self):
+        self.assertEqual(TestModel.objects.get().f1, 'replica')
+        self.assertEqual(TestModel.objects.db, 'replica')
+
+    def test_writes_refused(self):
+        self.assertRaises(ReviewerReplicaWriteError, TestModel.objects.create)
+        obj = TestModel.objects.get()
+        obj.f1 = 'changed'
+        self.assertRaises(ReviewerReplicaWriteError, obj.save)
+
+    def test_delete_refused(self):
+        self.assertRaises(ReviewerReplicaWriteError, TestModel.objects.get().delete)
+
+    def test_bulk_writes_refused(self):
+        self.assertRaises(ReviewerReplicaWriteError, TestModel.objects.update, f1='changed')
+        self.assertRaises(
+            ReviewerReplicaWriteError, TestModel.objects.bulk_create, [TestModel(f1='new')])
+        obj = TestModel.objects.get()
+        obj.f1 = 'changed'
+        self.assertRaises(
+            ReviewerReplicaWriteError, TestModel.objects.bulk_update, [obj], ['f1'])
+        self.assertRaises(
+            ReviewerReplicaWriteError, TestModelWithHistoryManager.objects.update, f1='changed')
+        with self.settings(REVIEWER_SITE_ID=0):
+            self.assertEqual(TestModel.objects.using('replica').get().f1, 'replica')
+
+    @override_settings(ROOT_URLCONF='edc_base.tests.urls')
+    def test_admin_change_view(self):
+        request = RequestFactory().get('/')
+        request.user = User.objects.create_superuser('reviewer', 'reviewer@example.com', 'pass')
+        obj = TestModel.objects.get()
+        response = admin_site._registry[TestModel].change_view(request, str(obj.pk))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context_data['original'], obj)
+
+    def test_no_site_id(self):
+        with self.settings():
+            del settings.SITE_ID
+            del settings.REVIEWER_SITE_ID
+            self.assertFalse(is_reviewer_site())
+            self.assertEqual(TestModel.objects.db, 'default')
+            TestModel.objects.create()
+
+    def test_writable_apps(self):
+        User.objects.create(username='reviewer')
+        self.assertEqual(User.objects.db, 'default')
+        self.assertTrue(User.objects.filter(username='reviewer').exists())
+
+    @override_settings(REVIEWER_SITE_ID=0)
+    def test_not_reviewer(self):
+        self.assertEqual(TestModel.objects.db, 'default')
+        self.assertFalse(TestModel.objects.exists())
+        TestModel.objects.create()
+
+    @override_settings(EDC_BASE_REVIEWER_REPLICA_DB='missing')
+    def test_replica_not_configured(self):
+        self.assertEqual(TestModel.objects.db, 'default')
+
+    def test_replica_unavailable(self):
+        router = ReviewerReplicaRouter()
+        with patch.object(connections['replica'], 'ensure_connection',
+                          side_effect=OperationalError('down')) as ensure_connection:
+            with self.assertLogs('edc_base', 'WARNING'):
+                self.assertIsNone(router.db_for_read(TestModel))
+            self.assertIsNone(router.db_for_read(TestModel))
+        self.assertEqual(ensure_connection.call_count, 1)
+        router.retry_seconds = 0
+        self.assertEqual(router.db_for_read(TestModel), 'replica')
+
+    def test_receivers_connected_by_router(self):
+        signals = [
+            (pre_save, 'edc_base_reviewer_replica_on_pre_save'),
+            (pre_delete, 'edc_base_reviewer_replica_on_pre_delete')]
+        for signal, dispatch_uid in signals:
+            signal.disconnect(dispatch_uid=dispatch_uid)
+        self.assertFalse(any(
+            key[0] == dispatch_uid for signal, dispatch_uid in signals
+            for key, _ in signal.receivers))
+        ReviewerReplicaRouter()
+        for signal, dispatch_uid in signals:
+            self.assertTrue(any(key[0] == dispatch_uid for key, _ in signal.receivers))
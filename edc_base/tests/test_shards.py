@@ -0,0 +1,187 @@
+import django
+
+from django.apps import apps as django_apps
+from django.contrib.sites.models import Site
+from django.core.management import CommandError, call_command, load_command_class
+from django.test import TestCase
+from django.test.utils import override_settings
+from io import StringIO
+from types import SimpleNamespace
+
+from ..sites import site_context
+from ..sites.shards import SiteShardError, SiteShardRouter, fan_out, fan_out_count
+from ..sites.shards import get_ordering_key, is_site_model
+from ..system_checks import site_database_relation_check
+from .models import TestModel, TestModelWithSite, TestModelWithSiteRelated
+from .site_test_case_mixin import SiteTestCaseMixin
+
+SITE_DATABASES = {20: 'site20', 30: 'site30'}
+
+
+@override_settings(
+    DATABASE_ROUTERS=['edc_base.sites.shards.SiteShardRouter'],
+    EDC_BASE_SITE_DATABASES=SITE_DATABASES, SITE_ID=20)
+class TestSiteShards(SiteTestCaseMixin, TestCase):
+
+    databases = {'default', 'site20', 'site30'}
+
+    def setUp(self):
+        for alias in SITE_DATABASES.values():
+            Site.objects.using(alias).bulk_create(
+                Site.objects.using('default').all(), ignore_conflicts=True)
+
+    def test_is_site_model(self):
+        self.assertTrue(is_site_model(TestModelWithSite))
+        self.assertFalse(is_site_model(TestModel))
+
+    def test_rows_written_to_site_database(self):
+        obj = TestModelWithSite.objects.create()
+        self.assertEqual(obj._state.db, 'site20')
+        with site_context(Site.objects.get(pk=30)):
+            TestModelWithSite.objects.create()
+        obj = TestModelWithSite.objects.create(site=Site.objects.get(pk=30))
+        self.assertEqual(obj._state.db, 'site30')
+        self.assertEqual(TestModelWithSite.objects.using('site20').count(), 1)
+        self.assertEqual(TestModelWithSite.objects.using('site30').count(), 2)
+        self.assertFalse(TestModelWithSite.objects.using('default').exists())
+        TestModel.objects.create()
+        self.assertEqual(TestModel.objects.using('default').count(), 1)
+
+    def test_explicit_database(self):
+        obj = TestModelWithSite(site=Site.objects.get(pk=30))
+        obj.save(using='default')
+        self.assertEqual(obj._state.db, 'default')
+        self.assertTrue(TestModelWithSite.objects.using('default').filter(pk=obj.pk).exists())
+        obj = TestModelWithSite.objects.using('site20').create(site=Site.objects.get(pk=30))
+        self.assertEqual(obj._state.db, 'site30')
+
+    def test_bulk_create_and_update_mixed_sites(self):
+        objs = TestModelWithSite.objects.bulk_create([
+            TestModelWithSite(f1='20'),
+            TestModelWithSite(f1='30', site=Site.objects.get(pk=30)),
+            TestModelWithSite(f1='40', site=Site.objects.get(pk=40))])
+        self.assertEqual([obj.f1 for obj in objs], ['20', '30', '40'])
+        self.assertEqual(
+            list(TestModelWithSite.objects.using('site20').order_by('f1').values_list(
+                'f1', flat=True)), ['20', '40'])
+        self.assertEqual(
+            list(TestModelWithSite.objects.using('site30').values_list('f1', flat=True)),
+            ['30'])
+        for obj in objs:
+            obj.f1 = f'{obj.f1}!'
+        rows = TestModelWithSite.objects.bulk_update(objs, ['f1'])
+        self.assertEqual(rows, None if django.VERSION < (4, 0) else 3)
+        self.assertEqual(TestModelWithSite.objects.using('site30').get().f1, '30!')
+        self.assertEqual(TestModelWithSite.objects.using('site20').filter(
+            f1__endswith='!').count(), 2)
+
+    def test_reads_from_current_site_database(self):
+        TestModelWithSite.objects.create(f1='20')
+        TestModelWithSite.objects.create(f1='30', site=Site.objects.get(pk=30))
+        self.assertEqual(list(TestModelWithSite.on_site.values_list('f1', flat=True)), ['20'])
+        obj = TestModelWithSite.objects.get()
+        obj.f1 = 'changed'
+        obj.save()
+        self.assertEqual(TestModelWithSite.objects.using('site20').get().f1, 'changed')
+
+    def test_fan_out(self):
+        for f1, site_id in [('a', 20), ('c', 30), ('b', 20), ('d', 30)]:
+            TestModelWithSite.objects.create(f1=f1, site=Site.objects.get(pk=site_id))
+        self.assertEqual(
+            [obj.f1 for obj in fan_out(TestModelWithSite.objects.order_by('f1'))],
+            ['a', 'b', 'c', 'd'])
+        self.assertEqual(
+            [obj.f1 for obj in fan_out(TestModelWithSite.objects.order_by('-f1'))],
+            ['d', 'c', 'b', 'a'])
+        self.assertEqual(fan_out_count(TestModelWithSite.objects.filter(f1__in=['a', 'c'])), 2)
+        self.assertEqual(len(list(TestModelWithSite.on_site.fan_out())), 4)
+
+    @override_settings(REVIEWER_SITE_ID=20)
+    def test_reviewer_reads_fan_out(self):
+        self.assertRaises(SiteShardError, SiteShardRouter().db_for_read, TestModelWithSite)
+        self.assertIsNone(SiteShardRouter().db_for_write(TestModelWithSite))
+        self.assertRaises(SiteShardError, TestModelWithSite.on_site.count)
+        self.assertEqual(TestModel.objects.count(), 0)
+        with self.settings(REVIEWER_SITE_ID=0):
+            TestModelWithSite.objects.create()
+            TestModelWithSite.objects.create(site=Site.objects.get(pk=30))
+        self.assertEqual(len(list(TestModelWithSite.on_site.fan_out())), 2)
+
+    def test_ordering_key_nulls(self):
+        objs = [SimpleNamespace(f1=f1) for f1 in ['b', None, 'a']]
+        key, reverse = get_ordering_key(TestModelWithSite.objects.order_by('f1'))
+        self.assertEqual([obj.f1 for obj in sorted(objs, key=key)], [None, 'a', 'b'])
+        key, reverse = get_ordering_key(
+            TestModelWithSite.objects.order_by('-f1'), nulls_largest=True)
+        self.assertTrue(reverse)
+        self.assertEqual(
+            [obj.f1 for obj in sorted(objs, key=key, reverse=reverse)], [None, 'b', 'a'])
+
+    def test_migrate_site_shards(self):
+        TestModelWithSite.objects.using('default').bulk_create(
+            [TestModelWithSite(site_id=site_id) for site_id in [20, 30, 40]])
+        out = StringIO()
+        call_command('migrate_site_shards', 'edc_base.testmodelwithsite',
+                     batch_size=1, delete=True, stdout=out)
+        self.assertIn('Copied 1 edc_base.testmodelwithsite for site 20 to site20.',
+                      out.getvalue())
+        self.assertEqual(TestModelWithSite.objects.using('site20').get().site_id, 20)
+        self.assertEqual(TestModelWithSite.objects.using('site30').get().site_id, 30)
+        self.assertEqual(
+            list(TestModelWithSite.objects.using('default').values_list('site_id', flat=True)),
+            [40])
+        # again, nothing to copy
+        call_command('migrate_site_shards', 'edc_base.testmodelwithsite', stdout=out)
+        self.assertEqual(TestModelWithSite.objects.using('site20').count(), 1)
+
+    def test_migrate_site_shards_keeps_rows_not_copied(self):
+        copied, added = TestModelWithSite.objects.using('default').bulk_create(
+            [TestModelWithSite(site_id=20), TestModelWithSite(site_id=20)])
+        TestModelWithSite.objects.using('site20').bulk_create([copied])
+        command = load_command_class('edc_base', 'migrate_site_shards')
+        self.assertEqual(command.delete(
+            TestModelWithSite, 20, 'default', 'site20', {'batch_size': 1}), (1, 1))
+        self.assertEqual(
+            list(TestModelWithSite.objects.using('default').values_list('pk', flat=True)),
+            [added.pk])
+
+    def test_migrate_site_shards_refuses_cascade(self):
+        obj = TestModelWithSite.objects.using('default').bulk_create(
+            [TestModelWithSite(site_id=20)])[0]
+        TestModelWithSiteRelated.objects.create(site_model=obj)
+        self.assertRaises(
+            CommandError, call_command, 'migrate_site_shards',
+            'edc_base.testmodelwithsite', delete=True, stdout=StringIO())
+        self.assertTrue(TestModelWithSite.objects.using('default').filter(pk=obj.pk).exists())
+
+    def test_related_rows_after_migrate_site_shards(self):
+        obj = TestModelWithSite.objects.using('default').bulk_create(
+            [TestModelWithSite(site_id=20)])[0]
+        TestModelWithSiteRelated.objects.create(site_model=TestModelWithSite.objects.using(
+            'default').create(site_id=40))
+        call_command('migrate_site_shards', 'edc_base.testmodelwithsite',
+                     delete=True, stdout=StringIO())
+        obj = TestModelWithSite.objects.get(pk=obj.pk)
+        self.assertEqual(obj._state.db, 'site20')
+        related = TestModelWithSiteRelated(site_model=obj)
+        related.save()
+        self.assertEqual(related._state.db, 'site20')
+        self.assertTrue(TestModelWithSiteRelated.objects.using('site20').filter(
+            site_model=obj).exists())
+        related = TestModelWithSiteRelated.objects.using('default').get()
+        with self.assertRaises(ValueError):
+            related.site_model = obj
+        self.assertFalse(SiteShardRouter().allow_relation(
+            obj, TestModelWithSite.objects.using('site30').create(site_id=30)))
+        self.assertTrue(SiteShardRouter().allow_relation(obj, Site.objects.get(pk=20)))
+
+    def test_site_database_relation_check(self):
+        app_configs = [django_apps.get_app_config('edc_base')]
+        self.assertIn(
+            TestModelWithSiteRelated,
+            [error.obj for error in site_database_relation_check(app_configs)])
+        self.assertNotIn(
+            TestModelWithSite,
+            [error.obj for error in site_database_relation_check(app_configs)])
+        with self.settings(EDC_BASE_SITE_DATABASES={}):
+            self.assertEqual(site_database_relation_check(app_configs), [])
@@ -0,0 +1,185 @@
+import json
+import os
+import shutil
+import sys
+import tempfile
+
+from django.apps import apps as django_apps
+from django.test import TestCase
+from io import StringIO
+from unittest.mock import patch
+
+from ..site_models import SiteModels, SiteModelAlreadyRegistered, SiteModelNotRegistered
+from .models import TestAgeModel, TestListModel, TestModel, TestModelWithListModel
+
+autodiscover_site_models = SiteModels()
+
+
+class TestSiteModels(TestCase):
+
+    def setUp(self):
+        self.site_models = SiteModels()
+
+    def test_site_models(self):
+        self.site_models.register(
+            ['edc_base.testmodelwithhistory', 'edc_base.testmodel', 'auth.user'])
+        site_models = self.site_models.site_models()
+        self.assertEqual(list(site_models), ['django.contrib.auth', 'edc_base'])
+        self.assertEqual(
+            [m._meta.label_lower for m in site_models['edc_base']],
+            ['edc_base.historicaltestmodelwithhistory', 'edc_base.testmodel',
+             'edc_base.testmodelwithhistory'])
+        self.assertEqual(
+            self.site_models.site_models(app_label='edc_base'),
+            {'edc_base': site_models['edc_base']})
+        self.assertEqual(self.site_models.site_models(app_label='sites'), {})
+
+    def test_cache_invalidated_on_register(self):
+        self.site_models.register(['edc_base.testmodel'])
+        self.assertEqual(len(self.site_models.site_models()['edc_base']), 1)
+        self.site_models.site_models()['edc_base'].append(None)
+        self.assertEqual(len(self.site_models.site_models()['edc_base']), 1)
+        self.site_models.register(['edc_base.testagemodel'])
+        self.assertEqual(len(self.site_models.site_models()['edc_base']), 2)
+        self.assertEqual(len(self.site_models.site_models('edc_base')['edc_base']), 2)
+        self.assertRaises(
+            SiteModelAlreadyRegistered, self.site_models.register, ['edc_base.testmodel'])
+
+    def test_registry_reset(self):
+        self.site_models.register(['edc_base.testmodel'])
+        self.site_models.site_models()
+        self.site_models.registry = {}
+        self.assertEqual(self.site_models.site_models(), {})
+
+    def test_matches_app_configs(self):
+        self.site_models.register_for_app(app_label='edc_base')
+        expected = sorted(
+            django_apps.get_app_config('edc_base').get_models(),
+            key=lambda m: m._meta.verbose_name)
+        self.assertEqual(self.site_models.site_models()['edc_base'], expected)
+
+
+class TestAutodiscover(TestCase):
+
+    def setUp(self):
+        autodiscover_site_models.registry = {}
+        sys.modules.pop('edc_base.tests.autodiscover_ok', None)
+        stdout = patch('sys.stdout', new_callable=StringIO)
+        self.stdout = stdout.start()
+        self.addCleanup(stdout.stop)
+        self.tmp = tempfile.mkdtemp()
+        self.manifest_path = os.path.join(self.tmp, 'manifest.json')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def test_rollback_on_import_error(self):
+        autodiscover_site_models.register(['edc_base.testmodelwithsite'])
+        self.assertRaises(
+            ValueError, autodiscover_site_models.autodiscover,
+            module_name='tests.autodiscover_fail')
+        self.assertEqual(
+            list(autodiscover_site_models.registry),
+            ['edc_base.testmodelwithsite', 'edc_base.historicaltestmodelwithsite'])
+        self.assertEqual(
+            [m._meta.label_lower for m in autodiscover_site_models.site_models()['edc_base']],
+            ['edc_base.testmodelwithsite'])
+
+    def test_registers(self):
+        autodiscover_site_models.autodiscover(module_name='tests.autodiscover_ok')
+        self.assertIn('edc_base.testmodel', autodiscover_site_models.registry)
+        self.assertIn("registered models from 'edc_base'", self.stdout.getvalue())
+
+    def test_manifest(self):
+        autodiscover_site_models.autodiscover(
+            module_name='tests.autodiscover_none', manifest_path=self.manifest_path)
+        with open(self.manifest_path) as f:
+            manifest = json.load(f)
+        self.assertEqual(manifest['module_name'], 'tests.autodiscover_none')
+        self.assertFalse(manifest['apps']['edc_base']['has_module'])
+        with patch('edc_base.site_models.module_has_submodule') as module_has_submodule:
+            autodiscover_site_models.autodiscover(
+                module_name='tests.autodiscover_none', manifest_path=self.manifest_path)
+        module_has_submodule.assert_not_called()
+
+    def test_manifest_does_not_keep_import_errors(self):
+        with open(self.manifest_path, 'w') as f:
+            json.dump({'module_name': 'tests.autodiscover_none', 'apps': {
+                'edc_base': {'mtime': None, 'has_module': False},
+                'admin': {'mtime': None, 'has_module': False}}}, f)
+        with patch('edc_base.site_models.module_has_submodule',
+                   return_value=False) as module_has_submodule:
+            autodiscover_site_models.autodiscover(
+                module_name='tests.autodiscover_none', manifest_path=self.manifest_path)
+        self.assertIn('edc_base', [c[0][0].__name__ for c in module_has_submodule.call_args_list])
+        with open(self.manifest_path) as f:
+            manifest = json.load(f)
+        self.assertNotIn('admin', manifest['apps'])
+        self.assertIsNotNone(manifest['apps']['edc_base']['mtime'])
+
+    def test_manifest_other_module_name(self):
+        autodiscover_site_models.autodiscover(
+            module_name='tests.autodiscover_none', manifest_path=self.manifest_path)
+        autodiscover_site_models.autodiscover(
+            module_name='tests.autodiscover_ok', manifest_path=self.manifest_path)
+        self.assertIn('edc_base.testmodel', autodiscover_site_models.registry)
+
+
+class Wrapper:
+
+    select_related_fields = ['list_item']
+
+    def __init__(self, obj):
+        self.object = obj
+        self.list_item_name = obj.list_item.name
+
+
+class PrefetchWrapper:
+
+    prefetch_related_lookups = ['testmodelwithlistmodel_set']
+
+    def __init__(self, obj):
+        self.object = obj
+        self.count = len(obj.testmodelwithlistmodel_set.all())
+
+
+class TestWrappedQueryset(TestCase):
+
+    def setUp(self):
+        self.site_models = SiteModels()
+        self.site_models.register(['edc_base.testmodelwithlistmodel'], wrapper_cls=Wrapper)
+        self.site_models.register(['edc_base.testlistmodel'], wrapper_cls=PrefetchWrapper)
+        self.site_models.register(['edc_base.testmodel'])
+        for i in range(10):
+            list_item = TestListModel.objects.create(name=f'item{i}')
+            TestModelWithListModel.objects.create(list_item=list_item)
+            TestModelWithListModel.objects.create(list_item=list_item)
+
+    def test_select_related(self):
+        wrapped = self.site_models.get_wrapped_queryset(
+            TestModelWithListModel.objects.all(), chunk_size=3)
+        with self.assertNumQueries(1):
+            wrapped = list(wrapped)
+        self.assertEqual(len(wrapped), 20)
+        self.assertTrue(all(isinstance(obj, Wrapper) for obj in wrapped))
+
+    def test_prefetch_related_per_chunk(self):
+        wrapped = self.site_models.get_wrapped_queryset(
+            TestListModel.objects.all(), chunk_size=5)
+        with self.assertNumQueries(3):
+            wrapped = list(wrapped)
+        self.assertEqual([obj.count for obj in wrapped], [2] * 10)
+
+    def test_lazy(self):
+        with self.assertNumQueries(0):
+            wrapped = self.site_models.get_wrapped_queryset(TestModelWithListModel.objects.all())
+        with self.assertNumQueries(1):
+            next(wrapped)
+
+    def test_without_wrapper_and_not_registered(self):
+        TestModel.objects.create()
+        self.assertIsInstance(
+            next(self.site_models.get_wrapped_queryset(TestModel.objects.all())), TestModel)
+        self.assertRaises(
+            SiteModelNotRegistered, self.site_models.get_wrapped_queryset,
+            TestAgeModel.objects.all())
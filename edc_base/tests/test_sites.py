@@ -1,7 +1,16 @@
+from django.apps import apps as django_apps
 from django.contrib.sites.models import Site
-from django.test import TestCase, tag
-from django.test.utils import override_settings
+from django.db import IntegrityError, connection
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, tag
+from django.test.utils import CaptureQueriesContext, override_settings
+from io import StringIO
+from unittest.mock import patch
 
+from ..middleware import SiteContextMiddleware
+from ..sites import get_site_context, site_context
+from ..sites.site_model_mixin import SiteModelError
+from ..sites.utils import add_or_update_django_sites
 from .models import TestModelWithSite
 from .site_test_case_mixin import SiteTestCaseMixin
 
@@ -26,3 +35,126 @@ class TestSites(SiteTestCaseMixin, TestCase):
         obj = TestModelWithSite.objects.create(site=site)
         self.assertEqual(obj.site.pk, 40)
         self.assertNotEqual(obj.site.pk, Site.objects.get_current().pk)
+
+
+class TestSiteContext(SiteTestCaseMixin, TestCase):
+
+    @override_settings(SITE_ID=20)
+    def test_current_site_resolved_once(self):
+        TestModelWithSite.objects.create()
+        with self.assertNumQueries(1):
+            obj = TestModelWithSite.objects.create()
+        self.assertEqual(obj.site.pk, 20)
+        self.assertEqual(get_site_context().site_id, 20)
+
+    @override_settings(SITE_ID=20)
+    def test_invalidated_on_site_change(self):
+        self.assertEqual(get_site_context().site.name, 'molepolole')
+        site = Site.objects.get(pk=20)
+        site.name = 'renamed'
+        site.save()
+        self.assertEqual(get_site_context().site.name, 'renamed')
+
+    @override_settings(SITE_ID=20, REVIEWER_SITE_ID=20)
+    def test_reviewer(self):
+        self.assertTrue(get_site_context().is_reviewer)
+        self.assertRaises(SiteModelError, TestModelWithSite.objects.create)
+        self.assertRaises(
+            SiteModelError, TestModelWithSite.objects.bulk_create, [TestModelWithSite()])
+
+    @override_settings(SITE_ID=20)
+    def test_site_context(self):
+        with site_context(Site.objects.get(pk=30)) as context:
+            self.assertEqual(context.site_id, 30)
+            obj = TestModelWithSite.objects.create()
+        self.assertEqual(obj.site.pk, 30)
+        self.assertEqual(get_site_context().site_id, 20)
+
+    @override_settings(SITE_ID=20)
+    def test_manager_does_not_query_sites(self):
+        TestModelWithSite.objects.create()
+        with site_context(Site.objects.get(pk=30)):
+            TestModelWithSite.objects.create()
+            self.assertEqual(TestModelWithSite.on_site.count(), 1)
+        TestModelWithSite.objects.all().delete()
+        Site.objects.all().delete()
+        with self.assertNumQueries(1):
+            self.assertEqual(TestModelWithSite.on_site.count(), 0)
+
+    @override_settings(SITE_ID=20)
+    def test_bulk_create(self):
+        site = Site.objects.get(pk=40)
+        objs = TestModelWithSite.objects.bulk_create(
+            [TestModelWithSite(), TestModelWithSite(site=site)])
+        self.assertEqual([obj.site.pk for obj in objs], [20, 40])
+
+    @override_settings(SITE_ID=20, REVIEWER_SITE_ID=30)
+    def test_middleware(self):
+        request = RequestFactory().get('/')
+        request.site = Site.objects.get(pk=30)
+        middleware = SiteContextMiddleware()
+        middleware.process_request(request)
+        self.assertTrue(get_site_context().is_reviewer)
+        self.assertTrue(get_site_context(request).is_reviewer)
+        middleware.process_response(request, HttpResponse())
+        self.assertFalse(get_site_context().is_reviewer)
+
+
+class TestAddOrUpdateDjangoSites(TestCase):
+
+    sites = [(10, 'mochudi', 'Mochudi'), (20, 'molepolole', 'Molepolole')]
+
+    def setUp(self):
+        Site.objects.all().delete()
+        Site.objects.create(pk=1, name='example.com', domain='example.com')
+
+    def add_or_update(self, sites=None, **kwargs):
+        with patch('sys.stdout', new_callable=StringIO) as stdout:
+            diff = add_or_update_django_sites(
+                apps=django_apps, sites=sites or self.sites, fqdn='clinicedc.org', **kwargs)
+        self.stdout = stdout.getvalue()
+        return diff
+
+    def test_add(self):
+        diff = self.add_or_update()
+        self.assertEqual(diff.added, [10, 20])
+        self.assertEqual(diff.deleted, [1])
+        self.assertEqual(
+            list(Site.objects.order_by('pk').values_list('pk', 'domain')),
+            [(10, 'mochudi.clinicedc.org'), (20, 'molepolole.clinicedc.org')])
+        self.assertIn('Added [10, 20]', self.stdout)
+
+    def test_unchanged_does_not_write(self):
+        self.add_or_update()
+        with CaptureQueriesContext(connection) as context:
+            diff = self.add_or_update()
+        self.assertEqual(
+            [q['sql'] for q in context.captured_queries if q['sql'].startswith('SELECT')],
+            [q['sql'] for q in context.captured_queries if 'SAVEPOINT' not in q['sql']])
+        self.assertEqual(len(context.captured_queries), 3)
+        self.assertEqual(diff, ([], [], []))
+        self.assertIn('Added none, updated none, deleted none', self.stdout)
+
+    def test_update(self):
+        self.add_or_update()
+        diff = self.add_or_update(
+            sites=[(10, 'mochudi', 'Mochudi'), (20, 'ranaka', 'Ranaka')])
+        self.assertEqual(diff, ([], [20], []))
+        self.assertEqual(Site.objects.get(pk=20).domain, 'ranaka.clinicedc.org')
+
+    def test_delete_unknown(self):
+        Site.objects.create(pk=30, name='lentsweletau', domain='lentsweletau.clinicedc.org')
+        diff = self.add_or_update()
+        self.assertEqual(diff.deleted, [1])
+        diff = self.add_or_update(delete_unknown=True)
+        self.assertEqual(diff.deleted, [30])
+        self.assertEqual(list(Site.objects.order_by('pk').values_list('pk', flat=True)), [10, 20])
+
+    def test_rolled_back_on_error(self):
+        self.add_or_update()
+        with patch.object(Site.objects, 'bulk_update', side_effect=IntegrityError):
+            with self.assertRaises(IntegrityError):
+                self.add_or_update(
+                    sites=self.sites + [(30, 'lentsweletau', 'Lentsweletau')]
+                    + [(20, 'ranaka', 'Ranaka')])
+        self.assertEqual(list(Site.objects.order_by('pk').values_list('pk', flat=True)), [10, 20])
@@ -1,12 +1,15 @@
 import arrow
+import io
 import pytz
 
 from dateutil import tz
-from datetime import datetime, date
+from datetime import datetime, date, timedelta
+from decimal import Decimal
 
 from django.test import TestCase, tag
 
 from ..utils import age, get_age_in_days, formatted_age, get_safe_random_string
+from ..utils import to_arrow_utc, to_utc, get_tzinfo, Convert, ConvertError
 from ..exceptions import AgeValueError
 
 
@@ -105,3 +108,124 @@ class TestUtils(TestCase):
         dst_hours, _ = divmod(seconds, 3600)
         self.assertEqual(
             age(born.datetime, reference_dt.datetime).hours, 7 + 2 - dst_hours)
+
+    def test_to_utc_matches_arrow_across_dst(self):
+        """Assert dates localized at midnight match arrow for
+        every day of a year with DST transitions.
+        """
+        for timezone in ['Africa/Gaborone', 'America/New_York',
+                         'America/Sao_Paulo', 'Europe/London']:
+            tzinfo = tz.gettz(timezone)
+            dt = date(2016, 1, 1)
+            while dt.year == 2016:
+                self.assertEqual(
+                    to_utc(dt, timezone),
+                    arrow.Arrow.fromdate(dt, tzinfo=tzinfo).to('utc').datetime,
+                    msg=f'{dt} {timezone}')
+                dt += timedelta(days=1)
+
+    def test_to_utc_datetimes(self):
+        dt = arrow.get(datetime(2017, 3, 12, 3, 30),
+                       tz.gettz('America/New_York')).datetime
+        self.assertEqual(to_utc(dt), datetime(2017, 3, 12, 7, 30, tzinfo=tz.tzutc()))
+        self.assertEqual(
+            to_utc(datetime(2017, 3, 12, 3, 30)),
+            datetime(2017, 3, 12, 3, 30, tzinfo=tz.tzutc()))
+        self.assertEqual(to_arrow_utc(dt).datetime, to_utc(dt))
+
+    def test_tzinfo_is_cached(self):
+        self.assertIs(get_tzinfo('Africa/Gaborone'), get_tzinfo('Africa/Gaborone'))
+        self.assertIsNone(get_tzinfo('Not/A_Timezone'))
+
+    def test_age_leap_day(self):
+        born = date(2016, 2, 29)
+        self.assertEqual(age(born, date(2017, 2, 28)).years, 1)
+        self.assertEqual(age(born, date(2017, 2, 27)).years, 0)
+        self.assertEqual(age(born, date(2020, 2, 29)).years, 4)
+        self.assertEqual(age(born, date(2019, 3, 1)).days, 1)
+        self.assertEqual(
+            formatted_age(born, pytz.utc.localize(datetime(2018, 2, 28))), '2y')
+
+    def test_age_across_dst(self):
+        """Assert midnight of dates on either side of a DST
+        transition are an hour apart.
+        """
+        timezone = 'America/New_York'
+        rdelta = age(date(2017, 3, 12), date(2017, 11, 5), timezone=timezone)
+        self.assertEqual((rdelta.months, rdelta.days, rdelta.hours), (7, 23, 23))
+        rdelta = age(date(2017, 11, 5), date(2018, 3, 11), timezone=timezone)
+        self.assertEqual((rdelta.months, rdelta.days, rdelta.hours), (4, 6, 1))
+
+    def test_age_reference_date_precedes_born(self):
+        self.assertRaises(
+            AgeValueError, age, pytz.utc.localize(datetime(2000, 5, 2)),
+            date(2000, 5, 1))
+
+
+class TestConvert(TestCase):
+
+    values = [
+        ('12:30', '12:30'), ('1:05', '1:05'), ('123:45', '123:45'),
+        ('True', True), ('false', False), ('None', None),
+        ('1.50', Decimal('1.50')), ('-0.5', Decimal('-0.5')),
+        ('1.5E+3', Decimal('1.5E+3')), ('01.5', '01.5'), ('.5', '.5'), ('1.', '1.'),
+        ('10', 10), ('-10', -10), ('0', 0), ('-0', '-0'), ('010', '010'), ('1_000', '1_000'),
+        ('2017-01-31', datetime(2017, 1, 31, tzinfo=pytz.utc)),
+        ('2017-01-31T10:30:00+02:00', datetime(2017, 1, 31, 8, 30, tzinfo=pytz.utc)),
+        ('2017-01-31 10:30', datetime(2017, 1, 31, 10, 30, tzinfo=pytz.utc)),
+        ('2017-02-31', '2017-02-31'),
+        (' "hello" ', 'hello'), ('', '')]
+
+    def test_to_value(self):
+        for string_value, value in self.values:
+            with self.subTest(string_value=string_value):
+                self.assertEqual(Convert(string_value).to_value(), value)
+                self.assertEqual(type(Convert(string_value).to_value()), type(value))
+
+    def test_to_value_no_convert(self):
+        self.assertEqual(Convert(' "10" ', convert=False).to_value(), '10')
+
+    def test_iter_values(self):
+        strings = [string_value for string_value, _ in self.values]
+        expected = [Convert(string_value).to_value() for string_value in strings]
+        self.assertEqual(list(Convert.iter_values(strings)), expected)
+        self.assertEqual(list(Convert.iter_values(iter(strings), column=True)), expected)
+        self.assertEqual(
+            list(Convert.iter_values(strings, convert=False)),
+            [Convert(string_value, convert=False).to_value() for string_value in strings])
+
+    def test_iter_values_column(self):
+        column = ['1', '2', 'n/a', '3.0', '4', '-0']
+        self.assertEqual(
+            list(Convert.iter_values(column, column=True)),
+            [1, 2, 'n/a', Decimal('3.0'), 4, '-0'])
+
+    def test_iter_strings(self):
+        values = [
+            datetime(2017, 1, 31, 10, 30, tzinfo=pytz.utc), date(2017, 1, 31),
+            datetime(2017, 1, 31, 10, 30).time(), Decimal('1.50'), 10, None, True,
+            'hello', '', arrow.get(datetime(2017, 1, 31, 10, 30)), b'bytes']
+        self.assertEqual(
+            list(Convert.iter_strings(values)),
+            [Convert(value).to_string() for value in values])
+        self.assertEqual(
+            list(Convert.iter_strings(iter(values), time_format='%H:%M:%S')),
+            [Convert(value, time_format='%H:%M:%S').to_string() for value in values])
+
+    def test_write_strings(self):
+        values = [date(2017, 1, d) for d in range(1, 11)]
+        fp = io.StringIO()
+        self.assertEqual(Convert.write_strings(values, fp, chunk_size=3), 10)
+        self.assertEqual(
+            fp.getvalue(), ''.join(f'{Convert(value).to_string()}\n' for value in values))
+        fp = io.StringIO()
+        Convert.write_strings((v for v in [1, None]), fp, terminator=',')
+        self.assertEqual(fp.getvalue(), '1,None,')
+
+    def test_to_type_methods(self):
+        convert = Convert(None)
+        self.assertEqual(convert.to_int('10'), 10)
+        self.assertRaises(ConvertError, convert.to_int, '1.0')
+        self.assertRaises(ConvertError, convert.to_decimal, '01.5')
+        self.assertRaises(ConvertError, convert.to_boolean, 'yes')
+        self.assertRaises(ConvertError, convert.to_datetime, '2017-02-31')
@@ -33,6 +33,11 @@ class TestValidators(TestCase):
         self.assertIsNone(validator(date.today() - relativedelta(years=64)))
         self.assertIsNone(validator(date.today() - relativedelta(years=63)))
 
+    def test_consent_age_validators_future_dob(self):
+        for validator in [MinConsentAgeValidator(0), MaxConsentAgeValidator(64)]:
+            self.assertRaises(
+                ValidationError, validator, date.today() + relativedelta(days=1))
+
     def test_compare_numbers_gt(self):
         validator = CompareNumbersValidator(10, '>')
         self.assertRaises(ValidationError, validator, 9)
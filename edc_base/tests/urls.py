@@ -0,0 +1,11 @@
+from django.contrib import admin
+from django.urls.conf import path
+
+from .models import TestModel
+
+admin_site = admin.AdminSite(name='admin')
+admin_site.register(TestModel)
+
+urlpatterns = [
+    path('admin/', admin_site.urls),
+]
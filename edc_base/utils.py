@@ -2,27 +2,43 @@ import arrow
 import random
 import re
 
+from datetime import datetime, timezone as dt_timezone
 from dateutil import tz
 from dateutil.relativedelta import relativedelta
-from decimal import Decimal, InvalidOperation
+from decimal import Decimal
+from functools import lru_cache
 from math import ceil
 from uuid import uuid4
 
 from django.conf import settings
+from django.utils.dateparse import parse_date, parse_datetime
 from django.utils.encoding import force_text
 
 from edc_base.exceptions import AgeValueError
 
 safe_allowed_chars = 'ABCDEFGHKMNPRTUVWXYZ2346789'
 
+TZINFO_CACHE_SIZE = 64
+
+
+@lru_cache(maxsize=TZINFO_CACHE_SIZE)
+def _gettz(name):
+    return tz.gettz(name)
+
+
+def get_tzinfo(timezone=None):
+    """Returns a tzinfo for the timezone name or, if None,
+    settings.TIME_ZONE.
+
+    Resolved tzinfo objects are kept in a bounded LRU cache.
+    """
+    return _gettz(timezone or settings.TIME_ZONE)
+
 
 class MyTimezone:
 
     def __init__(self, timezone):
-        if timezone:
-            self.tzinfo = tz.gettz(timezone)
-        else:
-            self.tzinfo = tz.gettz(settings.TIME_ZONE)
+        self.tzinfo = get_tzinfo(timezone)
 
 
 class ConvertError(Exception):
@@ -62,18 +78,28 @@ def get_utcnow():
     return arrow.utcnow().datetime
 
 
-def to_arrow_utc(dt, timezone=None):
-    """Returns a datetime after converting date or datetime from the given timezone string to \'UTC\'."""
+def to_utc(dt, timezone=None):
+    """Returns a UTC datetime after converting date or datetime from
+    the given timezone string to \'UTC\'.
+
+    Same as `to_arrow_utc` but returns a `datetime`.
+    """
     try:
         dt.date()
     except AttributeError:
         # handle born as date. Use 0hr as time before converting to UTC
-        tzinfo = MyTimezone(timezone).tzinfo
-        r_utc = arrow.Arrow.fromdate(dt, tzinfo=tzinfo).to('utc')
+        dt = datetime(dt.year, dt.month, dt.day,
+                      tzinfo=get_tzinfo(timezone) or dt_timezone.utc)
     else:
-        # handle born as datetime
-        r_utc = arrow.Arrow.fromdatetime(dt, tzinfo=dt.tzinfo).to('utc')
-    return r_utc
+        # handle born as datetime, naive is assumed to be UTC
+        if dt.tzinfo is None:
+            return dt.replace(tzinfo=dt_timezone.utc)
+    return dt.astimezone(dt_timezone.utc)
+
+
+def to_arrow_utc(dt, timezone=None):
+    """Returns a datetime after converting date or datetime from the given timezone string to \'UTC\'."""
+    return arrow.Arrow.fromdatetime(to_utc(dt, timezone))
 
 
 def age(born, reference_dt, timezone=None):
@@ -84,20 +110,21 @@ def age(born, reference_dt, timezone=None):
     if not reference_dt:
         raise AgeValueError('Reference date is required.')
     # convert dates or datetimes to UTC datetimes
-    born_utc = to_arrow_utc(born, timezone)
-    reference_dt_utc = to_arrow_utc(reference_dt, timezone)
-    rdelta = relativedelta(reference_dt_utc.datetime, born_utc.datetime)
-    if born_utc.datetime > reference_dt_utc.datetime:
+    born_utc = to_utc(born, timezone)
+    reference_dt_utc = to_utc(reference_dt, timezone)
+    rdelta = relativedelta(reference_dt_utc, born_utc)
+    if born_utc > reference_dt_utc:
         raise AgeValueError(
             'Reference date {} {} precedes DOB {} {}. Got {}'.format(
-                reference_dt, str(reference_dt.tzinfo), born, timezone, rdelta))
+                reference_dt, str(getattr(reference_dt, 'tzinfo', None)),
+                born, timezone, rdelta))
     return rdelta
 
 
 def formatted_age(born, reference_dt=None, timezone=None):
     if born:
-        tzinfo = MyTimezone(timezone).tzinfo
-        born = arrow.Arrow.fromdate(born, tzinfo=tzinfo).datetime
+        born = datetime(born.year, born.month, born.day,
+                        tzinfo=get_tzinfo(timezone) or dt_timezone.utc)
         reference_dt = reference_dt or get_utcnow()
         age_delta = age(born, reference_dt or get_utcnow())
         if born > reference_dt:
@@ -130,8 +157,77 @@ def convert_from_camel(name):
     return re.sub('([a-z0-9])([A-Z])', r'\1_\2', s1).lower()
 
 
+CONVERT_PATTERNS = {
+    'time': r'[0-9]{1,2}:[0-9]{2}\n?\Z',
+    'boolean': r'(?i:true|false|none)\Z',
+    'decimal': r'-?[0-9]+\.[0-9]+(?:E[+-][0-9]+)?\Z',
+    'int': r'(?:0|-?[1-9][0-9]*)\Z',
+    'datetime': (r'[0-9]{4}-[0-9]{1,2}-[0-9]{1,2}'
+                 r'(?:[T ][0-9]{1,2}:[0-9]{1,2}'
+                 r'(?::[0-9]{1,2}(?:\.[0-9]{1,6}[0-9]{0,6})?)?'
+                 r'(?:Z|[+-][0-9]{2}(?::?[0-9]{2})?)?)?\Z')}
+
+# one alternation tried in the same order as the original chain of
+# to_time, to_boolean, to_decimal, to_int and to_datetime.
+convert_pattern = re.compile('|'.join(
+    f'(?P<{name}>{pattern})' for name, pattern in CONVERT_PATTERNS.items()))
+
+convert_type_patterns = {
+    name: re.compile(pattern) for name, pattern in CONVERT_PATTERNS.items()}
+
+
+def _time_to_value(string_value):
+    return string_value
+
+
+def _boolean_to_value(string_value):
+    return {'true': True, 'false': False, 'none': None}[string_value.lower()]
+
+
+def _decimal_to_value(string_value):
+    value = Decimal(string_value)
+    return value if str(value) == string_value else string_value
+
+
+def _int_to_value(string_value):
+    try:
+        return int(string_value)
+    except ValueError:
+        # exceeds the int max str digits limit
+        return string_value
+
+
+def _datetime_to_value(string_value):
+    try:
+        value = (parse_date(string_value) if len(string_value) <= 10
+                 else parse_datetime(string_value))
+    except ValueError:
+        return string_value
+    return to_utc(value, 'UTC')
+
+
+# each returns the string unchanged if it is not of its type
+# after all, as the original to_* methods did by raising.
+converters = {
+    'time': _time_to_value,
+    'boolean': _boolean_to_value,
+    'decimal': _decimal_to_value,
+    'int': _int_to_value,
+    'datetime': _datetime_to_value}
+
+
 class Convert(object):
 
+    """Converts a string to its original datatype (`to_value`) or
+    a value to a string (`to_string`).
+
+    The type of a string is classified with a single precompiled
+    regular expression. To convert many strings use `iter_values`,
+    many values `iter_strings` or `write_strings`.
+    """
+
+    converters = converters
+
     def __init__(self, value, convert=None, time_format=None):
         self.value = value
         self.convert = False if convert is False else True
@@ -146,28 +242,45 @@ class Convert(object):
         """
         string_value = self.value.strip(' "')
         if self.convert:
-            try:
-                return self.to_time(string_value)
-            except ConvertError:
-                pass
-            try:
-                return self.to_boolean(string_value)
-            except ConvertError:
-                pass
-            try:
-                return self.to_decimal(string_value)
-            except ConvertError:
-                pass
-            try:
-                return self.to_int(string_value)
-            except ConvertError:
-                pass
-            try:
-                return self.to_datetime(string_value)
-            except ConvertError:
-                pass
+            match = convert_pattern.match(string_value)
+            if match:
+                return self.converters[match.lastgroup](string_value)
         return string_value
 
+    @classmethod
+    def iter_values(cls, values, convert=None, column=None):
+        """Yields `to_value` for each string in an iterable.
+
+        If `column` is True the values are assumed to be a column
+        of one type. The type is inferred from the first value
+        that converts and each value is then matched against that
+        type only, falling back to the full classifier where it
+        does not match. The results are the same either way.
+        """
+        if convert is False:
+            for value in values:
+                yield value.strip(' "')
+        elif not column:
+            for value in values:
+                string_value = value.strip(' "')
+                match = convert_pattern.match(string_value)
+                yield (cls.converters[match.lastgroup](string_value)
+                       if match else string_value)
+        else:
+            type_pattern = converter = None
+            for value in values:
+                string_value = value.strip(' "')
+                if type_pattern and type_pattern.match(string_value):
+                    yield converter(string_value)
+                    continue
+                match = convert_pattern.match(string_value)
+                if match:
+                    type_pattern = convert_type_patterns[match.lastgroup]
+                    converter = cls.converters[match.lastgroup]
+                    yield converter(string_value)
+                else:
+                    yield string_value
+
     def to_string(self):
         try:
             string_value = self.value.isoformat()
@@ -181,35 +294,82 @@ class Convert(object):
             string_value = str(self.value)
         return string_value or force_text(self.value)
 
+    @classmethod
+    def iter_strings(cls, values, time_format=None):
+        """Yields `to_string` for each value in an iterable.
+
+        How to format a value is decided once per type, so a
+        column of one type is formatted in a single pass.
+        """
+        time_format = time_format or '%H:%M'
+        formatters = {}
+        for value in values:
+            formatter = formatters.get(type(value))
+            if formatter is None:
+                formatter = formatters[type(value)] = cls._get_formatter(
+                    value, time_format)
+            yield formatter(value)
+
+    @classmethod
+    def write_strings(cls, values, fp, time_format=None, terminator=None,
+                      chunk_size=None):
+        """Writes `to_string` for each value in an iterable to a
+        text file-like object, each followed by `terminator`
+        (default a newline). Returns the number of values written.
+        """
+        terminator = '\n' if terminator is None else terminator
+        chunk_size = chunk_size or 1000
+        count = 0
+        chunk = []
+        for string_value in cls.iter_strings(values, time_format=time_format):
+            chunk.append(string_value)
+            if len(chunk) == chunk_size:
+                fp.write(terminator.join(chunk) + terminator)
+                count += len(chunk)
+                chunk = []
+        if chunk:
+            fp.write(terminator.join(chunk) + terminator)
+            count += len(chunk)
+        return count
+
+    @staticmethod
+    def _get_formatter(value, time_format):
+        """Returns a function that formats values of the type of
+        `value` as `to_string` does.
+        """
+        if hasattr(value, 'isoformat'):
+            if hasattr(value, 'time') and time_format == '%H:%M' and isinstance(
+                    value, datetime):
+                return lambda value: (
+                    f'{value.isoformat()} {value.hour:02d}:{value.minute:02d}'
+                    or force_text(value))
+            elif hasattr(value, 'time'):
+                return lambda value: (
+                    f'{value.isoformat()} {value.strftime(time_format)}'
+                    or force_text(value))
+            return lambda value: value.isoformat() or force_text(value)
+        elif type(value) is str:
+            return lambda value: value
+        return lambda value: str(value) or force_text(value)
+
     def to_time(self, string_value):
-        if re.match('^[0-9]{1,2}\:[0-9]{2}$', string_value):
-            return string_value
-        else:
-            raise ConvertError()
+        return self._to_type('time', string_value)
 
     def to_boolean(self, string_value):
-        if string_value.lower() in ['true', 'false', 'none']:
-            return eval(string_value)
-        else:
-            raise ConvertError()
+        return self._to_type('boolean', string_value)
 
     def to_decimal(self, string_value):
-        if '.' in string_value:
-            try:
-                value = Decimal(string_value)
-                if str(value) == string_value:
-                    return value
-            except ValueError:
-                pass
-            except InvalidOperation:
-                pass
-        raise ConvertError()
+        return self._to_type('decimal', string_value)
 
     def to_int(self, string_value):
-        try:
-            value = int(string_value)
-            if str(value) == string_value:
+        return self._to_type('int', string_value)
+
+    def to_datetime(self, string_value):
+        return self._to_type('datetime', string_value)
+
+    def _to_type(self, name, string_value):
+        if convert_type_patterns[name].match(string_value):
+            value = self.converters[name](string_value)
+            if name == 'time' or value is not string_value:
                 return value
-        except ValueError:
-            pass
         raise ConvertError()
@@ -22,8 +22,8 @@ setup(
     zip_safe=False,
     keywords='django base models fields forms admin',
     install_requires=[
-        'django',
-        'django[argon2]',
+        'django>=2.2',
+        'django[argon2]>=2.2',
         'django-simple-history',
         'django-js-reverse',
         'django-logentry-admin',
@@ -38,7 +38,11 @@ setup(
         'python-memcached',
         'pymysql',
         'tqdm',
+        'contextvars;python_version<"3.7"',
     ],
+    extras_require={
+        'numpy': ['numpy'],
+    },
     classifiers=[
         'Environment :: Web Environment',
         'Framework :: Django',